@@ -0,0 +1,595 @@
+#!/usr/bin/python3
+
+###########################################################################################
+#                                                                                         #
+#  class_ffDataAccess.py                                                                  #
+#                                                                                         #
+#  Access to external Data Sources with local Cache.                                      #
+#                                                                                         #
+#                                                                                         #
+#  Used Directories:                                                                      #
+#                                                                                         #
+#       <data>/HttpCache/        -> Bodies and Header-Infos of downloaded Files           #
+#                                                                                         #
+#  Snapshot of all external Inputs of one Run (--capture / --replay):                     #
+#                                                                                         #
+#       <snapshot>/Snapshot.json -> Time of Capture, Git Head                             #
+#       <snapshot>/*.json        -> Copy of Databases, Accounts without Secrets           #
+#       <snapshot>/Http/         -> Bodies and Header-Infos of downloaded Files           #
+#       <snapshot>/DnsZone/      -> DNS Zone Transfers                                    #
+#       <snapshot>/DnsQuery/     -> Results of DNS Queries                                #
+#       <snapshot>/Command/      -> Output of batctl Commands                             #
+#                                                                                         #
+###########################################################################################
+#                                                                                         #
+#  Copyright (c) 2017-2018, Roland Volkmann <roland.volkmann@t-online.de>                 #
+#  All rights reserved.                                                                   #
+#                                                                                         #
+#  Redistribution and use in source and binary forms, with or without                     #
+#  modification, are permitted provided that the following conditions are met:            #
+#    1. Redistributions of source code must retain the above copyright notice,            #
+#       this list of conditions and the following disclaimer.                             #
+#    2. Redistributions in binary form must reproduce the above copyright notice,         #
+#       this list of conditions and the following disclaimer in the documentation         #
+#       and/or other materials provided with the distribution.                            #
+#                                                                                         #
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"            #
+#  AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE              #
+#  IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE         #
+#  DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE           #
+#  FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL             #
+#  DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR             #
+#  SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER             #
+#  CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,          #
+#  OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE          #
+#  OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.                   #
+#                                                                                         #
+###########################################################################################
+
+import os
+import zlib
+import shutil
+import subprocess
+import urllib.request
+import urllib.error
+import time
+import calendar
+import json
+import re
+
+import dns.resolver
+import dns.query
+import dns.zone
+
+
+
+#-------------------------------------------------------------
+# Global Constants
+#-------------------------------------------------------------
+
+HttpCacheDir   = 'HttpCache'    # Sub-Directory of DatabasePath
+HttpInfoSuffix = '.info'        # Header-Infos of cached File
+CopyBlockSize  = 65536          # Block Size for copying Body to Cache
+
+AcceptEncoding = 'gzip, deflate'
+
+SnapshotName   = 'Snapshot.json'
+SnapshotDirs   = ['Http','DnsZone','DnsQuery','Command']
+
+SnapshotAccountKeys = ['URL','Server','Server2','ID']    # all other Values of Accounts are replaced
+SnapshotDummyValue  = 'c25hcHNob3Q='                      # valid as Password and as base64 DNS Key
+
+SnapshotNameTemplate = re.compile('[^0-9A-Za-z.-]')
+
+ACCESSMODE_LIVE    = 0
+ACCESSMODE_CAPTURE = 1    # live Access, all external Inputs are stored in Snapshot
+ACCESSMODE_REPLAY  = 2    # no external Access, all Inputs are taken from Snapshot
+
+
+
+
+
+class ffDataAccess:
+
+    #==========================================================================
+    # Constructor
+    #==========================================================================
+    def __init__(self,DatabasePath,SnapshotPath=None,AccessMode=ACCESSMODE_LIVE):
+
+        # public Attributes
+        self.AccessMode = AccessMode
+        self.SnapshotInfo = {}         # Time of Capture, Git Head, ...
+
+        # private Attributes
+        self.__DatabasePath = DatabasePath
+        self.__CachePath    = os.path.join(DatabasePath,HttpCacheDir)
+        self.__SnapshotPath = SnapshotPath
+
+        # Initializations
+        if AccessMode == ACCESSMODE_REPLAY:
+            with open(os.path.join(SnapshotPath,SnapshotName), mode='r') as SnapshotFile:
+                self.SnapshotInfo = json.load(SnapshotFile)
+
+            print('Replay of Snapshot from %s ...\n' % (time.strftime('%Y-%m-%d %H:%M:%S',time.localtime(self.SnapshotInfo['UnixTime']))))
+        else:
+            os.makedirs(self.__CachePath, exist_ok=True)
+
+            if AccessMode == ACCESSMODE_CAPTURE:
+                for SubDir in SnapshotDirs:
+                    os.makedirs(os.path.join(SnapshotPath,SubDir), exist_ok=True)
+
+                self.SetSnapshotInfo('UnixTime',int(time.time()))
+
+        return
+
+
+
+    #-----------------------------------------------------------------------
+    # private function "__SnapshotFileName"
+    #
+    #   Path of File in Snapshot with Name built from Key
+    #
+    #-----------------------------------------------------------------------
+    def __SnapshotFileName(self,SubDir,Key):
+
+        return os.path.join(self.__SnapshotPath,SubDir,SnapshotNameTemplate.sub('_',Key))
+
+
+
+    #-----------------------------------------------------------------------
+    # private function "__WriteSnapshotJson"
+    #
+    #   Store Data as json-File in Snapshot
+    #
+    #-----------------------------------------------------------------------
+    def __WriteSnapshotJson(self,SubDir,Key,Data):
+
+        with open(self.__SnapshotFileName(SubDir,Key), mode='w') as SnapshotFile:
+            json.dump(Data,SnapshotFile)
+
+        return
+
+
+
+    #-----------------------------------------------------------------------
+    # private function "__ReadSnapshotJson"
+    #
+    #   Load json-File from Snapshot, raises LookupError if not captured
+    #
+    #-----------------------------------------------------------------------
+    def __ReadSnapshotJson(self,SubDir,Key):
+
+        try:
+            with open(self.__SnapshotFileName(SubDir,Key), mode='r') as SnapshotFile:
+                Data = json.load(SnapshotFile)
+        except:
+            raise LookupError('Not in Snapshot: %s/%s' % (SubDir,Key))
+
+        return Data
+
+
+
+    #=======================================================================
+    # function "SetSnapshotInfo"
+    #
+    #   Store Info about captured Run (Time, Git Head, ...) in Snapshot
+    #
+    #=======================================================================
+    def SetSnapshotInfo(self,Key,Value):
+
+        if self.AccessMode == ACCESSMODE_CAPTURE:
+            self.SnapshotInfo[Key] = Value
+
+            with open(os.path.join(self.__SnapshotPath,SnapshotName), mode='w') as SnapshotFile:
+                json.dump(self.SnapshotInfo,SnapshotFile)
+
+        return
+
+
+
+    #=======================================================================
+    # function "CaptureDataFile"
+    #
+    #   Copy local Database File to Snapshot (Input of this Run)
+    #
+    #=======================================================================
+    def CaptureDataFile(self,FileName):
+
+        if self.AccessMode == ACCESSMODE_CAPTURE and os.path.exists(os.path.join(self.__DatabasePath,FileName)):
+            shutil.copy2(os.path.join(self.__DatabasePath,FileName),os.path.join(self.__SnapshotPath,FileName))
+
+        return
+
+
+
+    #=======================================================================
+    # function "CaptureAccounts"
+    #
+    #   Store Accounts without Secrets in Snapshot
+    #
+    #=======================================================================
+    def CaptureAccounts(self,FileName,AccountsDict):
+
+        if self.AccessMode == ACCESSMODE_CAPTURE:
+            SnapshotAccounts = {}
+
+            for Account in AccountsDict:
+                SnapshotAccounts[Account] = {}
+
+                for Key in AccountsDict[Account]:
+                    if Key in SnapshotAccountKeys:
+                        SnapshotAccounts[Account][Key] = AccountsDict[Account][Key]
+                    else:
+                        SnapshotAccounts[Account][Key] = SnapshotDummyValue
+
+            with open(os.path.join(self.__SnapshotPath,FileName), mode='w') as AccountsFile:
+                json.dump(SnapshotAccounts,AccountsFile,indent=4)
+
+        return
+
+
+
+    #=======================================================================
+    # function "UnixTime"
+    #
+    #   Current Time, on Replay the Time of Capture
+    #
+    #=======================================================================
+    def UnixTime(self):
+
+        if self.AccessMode == ACCESSMODE_REPLAY:
+            return self.SnapshotInfo['UnixTime']
+
+        return int(time.time())
+
+
+
+    #=======================================================================
+    # function "Sleep"
+    #
+    #   Waiting before Retry, not needed on Replay
+    #
+    #=======================================================================
+    def Sleep(self,Seconds):
+
+        if self.AccessMode != ACCESSMODE_REPLAY:
+            time.sleep(Seconds)
+
+        return
+
+
+
+    #-----------------------------------------------------------------------
+    # private function "__LoadCacheInfo"
+    #
+    #   Load stored Header-Infos of cached File
+    #
+    #   -> { 'URL','Last-Modified','ETag','HttpDate' } or None
+    #-----------------------------------------------------------------------
+    def __LoadCacheInfo(self,FileName,URL):
+
+        CacheInfo = None
+        InfoFileName = os.path.join(self.__CachePath,FileName+HttpInfoSuffix)
+
+        if os.path.exists(InfoFileName) and os.path.exists(os.path.join(self.__CachePath,FileName)):
+            try:
+                with open(InfoFileName, mode='r') as InfoFile:
+                    CacheInfo = json.load(InfoFile)
+            except:
+                print('!! Error on loading Cache-Info:',InfoFileName)
+                CacheInfo = None
+            else:
+                if CacheInfo.get('URL') != URL:
+                    CacheInfo = None
+
+        return CacheInfo
+
+
+
+    #-----------------------------------------------------------------------
+    # private function "__CopyHttpBody"
+    #
+    #   Copy Body of HttpResponse blockwise to File, decompress on the fly
+    #
+    #   Content-Encoding: gzip, deflate (zlib or raw) or identity
+    #-----------------------------------------------------------------------
+    def __CopyHttpBody(self,HttpResponse,BodyFile):
+
+        ContentEncoding = HttpResponse.info()['Content-Encoding']
+
+        if ContentEncoding is None or ContentEncoding.strip().lower() in ['','identity']:
+            Decompressor = None
+        elif ContentEncoding.strip().lower() in ['gzip','x-gzip']:
+            Decompressor = zlib.decompressobj(16+zlib.MAX_WBITS)
+        elif ContentEncoding.strip().lower() == 'deflate':
+            Decompressor = zlib.decompressobj(zlib.MAX_WBITS)
+        else:
+            raise ValueError('Unsupported Content-Encoding: '+ContentEncoding)
+
+        isFirstBlock = True
+
+        while True:
+            DataBlock = HttpResponse.read(CopyBlockSize)
+
+            if not DataBlock:
+                break
+
+            if Decompressor is None:
+                BodyFile.write(DataBlock)
+            else:
+                try:
+                    BodyFile.write(Decompressor.decompress(DataBlock))
+                except zlib.error:
+                    if isFirstBlock and ContentEncoding.strip().lower() == 'deflate':
+                        Decompressor = zlib.decompressobj(-zlib.MAX_WBITS)    # raw deflate without zlib-Header
+                        BodyFile.write(Decompressor.decompress(DataBlock))
+                    else:
+                        raise
+
+            isFirstBlock = False
+
+        if Decompressor is not None:
+            BodyFile.write(Decompressor.flush())
+
+            if not Decompressor.eof:
+                raise ValueError('Incomplete compressed Data')
+
+        return
+
+
+
+    #-----------------------------------------------------------------------
+    # private function "__StoreCacheFile"
+    #
+    #   Store Body (read blockwise from HttpResponse, decompressed) and Header-Infos
+    #
+    #   Info-File is written last, so a cached Body is only used if complete.
+    #-----------------------------------------------------------------------
+    def __StoreCacheFile(self,FileName,HttpResponse,CacheInfo):
+
+        InfoFileName = os.path.join(self.__CachePath,FileName+HttpInfoSuffix)
+        BodyFileName = os.path.join(self.__CachePath,FileName)
+
+        if os.path.exists(InfoFileName):
+            os.remove(InfoFileName)
+
+        with open(BodyFileName+'.tmp', mode='wb') as BodyFile:
+            self.__CopyHttpBody(HttpResponse,BodyFile)
+
+        os.replace(BodyFileName+'.tmp',BodyFileName)
+
+        with open(InfoFileName, mode='w') as InfoFile:
+            json.dump(CacheInfo,InfoFile)
+
+        return
+
+
+
+    #-----------------------------------------------------------------------
+    # private function "__DownloadHttpFile"
+    #
+    #   Conditional Download of File with If-Modified-Since / If-None-Match
+    #   and compressed Transfer (gzip / deflate)
+    #
+    #   -> { 'Body','FileName','HttpDate','Cached','Headers' }
+    #
+    #   Body is always stored in local Cache and taken from there if Webserver
+    #   answers "304 Not Modified".
+    #   If MaxAge is given and Last-Modified is older, FileName is None.
+    #-----------------------------------------------------------------------
+    def __DownloadHttpFile(self,FileName,URL,Opener,Timeout,MaxAge):
+
+        HttpFile = { 'Body':None, 'FileName':None, 'HttpDate':None, 'Cached':False, 'Headers':None }
+        CacheInfo = self.__LoadCacheInfo(FileName,URL)
+        HttpRequest = urllib.request.Request(URL)
+        HttpRequest.add_header('Accept-Encoding',AcceptEncoding)
+
+        if CacheInfo is not None:
+            if CacheInfo['Last-Modified'] is not None:
+                HttpRequest.add_header('If-Modified-Since',CacheInfo['Last-Modified'])
+            if CacheInfo['ETag'] is not None:
+                HttpRequest.add_header('If-None-Match',CacheInfo['ETag'])
+
+        try:
+            HttpResponse = Opener.open(HttpRequest,timeout=Timeout)
+
+        except urllib.error.HTTPError as err:
+            if err.code != 304 or CacheInfo is None:
+                raise
+
+            HttpFile['Headers']  = dict(err.headers)
+            err.close()
+            HttpFile['HttpDate'] = CacheInfo['HttpDate']
+            HttpFile['Cached']   = True
+
+            if MaxAge is None or HttpFile['HttpDate'] is None or int(time.time()) - HttpFile['HttpDate'] <= MaxAge:
+                HttpFile['FileName'] = os.path.join(self.__CachePath,FileName)
+
+        else:
+            HttpFile['Headers'] = dict(HttpResponse.info())
+            LastModified = HttpResponse.info()['Last-Modified']
+
+            if LastModified is not None:
+                HttpFile['HttpDate'] = int(calendar.timegm(time.strptime(LastModified[5:],'%d %b %Y %X %Z')))
+
+            if MaxAge is None or HttpFile['HttpDate'] is None or int(time.time()) - HttpFile['HttpDate'] <= MaxAge:
+                self.__StoreCacheFile(FileName,HttpResponse,{
+                    'URL':URL,
+                    'Last-Modified':LastModified,
+                    'ETag':HttpResponse.info()['ETag'],
+                    'HttpDate':HttpFile['HttpDate']
+                })
+
+                HttpFile['FileName'] = os.path.join(self.__CachePath,FileName)
+
+            HttpResponse.close()
+
+        return HttpFile
+
+
+
+    #=======================================================================
+    # function "GetHttpFile"
+    #
+    #   Download of File from Webserver with local Cache (or from Snapshot)
+    #
+    #   -> { 'Body','FileName','HttpDate','Cached','Headers' }
+    #
+    #   With ReadBody = False only the FileName of the cached Body is
+    #   returned (for streaming of large Files).
+    #   If MaxAge is given and Last-Modified is older, Body is None (not loaded).
+    #   Network Errors are raised to the Caller (handling of Retries).
+    #=======================================================================
+    def GetHttpFile(self,FileName,URL,Opener,Timeout,MaxAge=None,ReadBody=True):
+
+        if self.AccessMode == ACCESSMODE_REPLAY:
+            HttpFile = self.__ReadSnapshotJson('Http',FileName+HttpInfoSuffix)
+
+            if 'Error' in HttpFile:
+                raise IOError('Captured Error: %s' % (HttpFile['Error']))
+
+            if HttpFile['FileName'] is not None:
+                HttpFile['FileName'] = self.__SnapshotFileName('Http',FileName)
+
+        else:
+            try:
+                HttpFile = self.__DownloadHttpFile(FileName,URL,Opener,Timeout,MaxAge)
+            except Exception as err:
+                if self.AccessMode == ACCESSMODE_CAPTURE:
+                    self.__WriteSnapshotJson('Http',FileName+HttpInfoSuffix,{ 'URL':URL, 'Error':str(err) })
+                raise
+
+            if self.AccessMode == ACCESSMODE_CAPTURE:
+                if HttpFile['FileName'] is not None:
+                    shutil.copyfile(HttpFile['FileName'],self.__SnapshotFileName('Http',FileName))
+
+                self.__WriteSnapshotJson('Http',FileName+HttpInfoSuffix,{
+                    'URL':URL,
+                    'FileName':FileName if HttpFile['FileName'] is not None else None,
+                    'HttpDate':HttpFile['HttpDate'],
+                    'Cached':HttpFile['Cached'],
+                    'Headers':HttpFile['Headers'],
+                    'Body':None
+                })
+
+        if ReadBody and HttpFile['FileName'] is not None:
+            with open(HttpFile['FileName'], mode='rb') as BodyFile:
+                HttpFile['Body'] = BodyFile.read()
+
+        return HttpFile
+
+
+
+    #=======================================================================
+    # function "RunCommand"
+    #
+    #   Run local Command (batctl) and return its Output (or from Snapshot)
+    #
+    #   raises subprocess.TimeoutExpired if Command runs longer than Timeout
+    #=======================================================================
+    def RunCommand(self,CmdList,Timeout=None):
+
+        CmdKey = '_'.join(CmdList)+'.json'
+
+        if self.AccessMode == ACCESSMODE_REPLAY:
+            CmdResult = self.__ReadSnapshotJson('Command',CmdKey)
+
+            if 'Error' in CmdResult:
+                raise OSError('Captured Error: %s' % (CmdResult['Error']))
+
+            return CmdResult['Output']
+
+        try:
+            CmdOutput = subprocess.run(CmdList, stdout=subprocess.PIPE, timeout=Timeout).stdout.decode('utf-8')
+        except Exception as err:
+            if self.AccessMode == ACCESSMODE_CAPTURE:
+                self.__WriteSnapshotJson('Command',CmdKey,{ 'Command':CmdList, 'Error':str(err) })
+            raise
+
+        if self.AccessMode == ACCESSMODE_CAPTURE:
+            self.__WriteSnapshotJson('Command',CmdKey,{ 'Command':CmdList, 'Output':CmdOutput })
+
+        return CmdOutput
+
+
+
+    #=======================================================================
+    # function "DnsQuery"
+    #
+    #   DNS Query, returns List of Results as Text (or from Snapshot)
+    #
+    #=======================================================================
+    def DnsQuery(self,DnsName,DnsType,NameServer=None,Timeout=None):
+
+        QueryKey = '%s_%s_%s.json' % (DnsName,DnsType.upper(),NameServer)
+
+        if self.AccessMode == ACCESSMODE_REPLAY:
+            QueryResult = self.__ReadSnapshotJson('DnsQuery',QueryKey)
+
+            if 'Error' in QueryResult:
+                raise LookupError('Captured Error: %s' % (QueryResult['Error']))
+
+            return QueryResult['Result']
+
+        try:
+            DnsResolver = dns.resolver.Resolver()
+
+            if NameServer is not None:
+                DnsResolver.nameservers = [NameServer]
+
+            if Timeout is not None:
+                DnsResolver.timeout  = Timeout
+                DnsResolver.lifetime = Timeout
+
+            DnsResult = [ DnsAnswer.to_text() for DnsAnswer in DnsResolver.query(DnsName,DnsType) ]
+        except Exception as err:
+            if self.AccessMode == ACCESSMODE_CAPTURE:
+                self.__WriteSnapshotJson('DnsQuery',QueryKey,{ 'Error':type(err).__name__ })
+            raise
+
+        if self.AccessMode == ACCESSMODE_CAPTURE:
+            self.__WriteSnapshotJson('DnsQuery',QueryKey,{ 'Result':DnsResult })
+
+        return DnsResult
+
+
+
+    #=======================================================================
+    # function "DnsZoneTransfer"
+    #
+    #   Zone Transfer from DNS-Server (or from Snapshot)
+    #
+    #=======================================================================
+    def DnsZoneTransfer(self,DnsServerIP,DnsDomain):
+
+        ZoneFileName = self.__SnapshotFileName('DnsZone','%s_%s.zone' % (DnsDomain,DnsServerIP))
+
+        if self.AccessMode == ACCESSMODE_REPLAY:
+            if not os.path.exists(ZoneFileName):
+                raise LookupError('Not in Snapshot: %s' % (ZoneFileName))
+
+            return dns.zone.from_file(ZoneFileName,DnsDomain)
+
+        DnsZone = dns.zone.from_xfr(dns.query.xfr(DnsServerIP,DnsDomain))
+
+        if self.AccessMode == ACCESSMODE_CAPTURE:
+            DnsZone.to_file(ZoneFileName)
+
+        return DnsZone
+
+
+
+    #=======================================================================
+    # function "SendDnsUpdate"
+    #
+    #   Send Update to DNS-Server (skipped on Replay)
+    #
+    #=======================================================================
+    def SendDnsUpdate(self,DnsUpdate,DnsServerIP):
+
+        if self.AccessMode == ACCESSMODE_REPLAY:
+            print('... Update skipped on Replay:',DnsUpdate.origin.to_text())
+        else:
+            dns.query.tcp(DnsUpdate,DnsServerIP)
+
+        return
@@ -38,12 +38,9 @@
 ###########################################################################################
 
 import os
-import subprocess
 import socket
 import urllib.request
-import time
 import datetime
-import calendar
 import json
 import re
 import fcntl
@@ -58,6 +55,8 @@ import dns.update
 from dns.rdataclass import *
 from dns.rdatatype import *
 
+from class_ffDataAccess import *
+
 from glob import glob
 
 
@@ -109,7 +108,7 @@ class ffGatewayInfo:
     #==========================================================================
     # Constructor
     #==========================================================================
-    def __init__(self,GitPath,DnsAccDict):
+    def __init__(self,GitPath,DnsAccDict,DataAccess):
 
         # public Attributes
         self.FastdKeyDict = {}           # FastdKeyDic[KeyFileName]  -> SegDir, VpnMAC, PeerMAC, PeerName, PeerKey
@@ -120,6 +119,8 @@ class ffGatewayInfo:
         self.__GitPath     = GitPath
         self.__DnsAccDict  = DnsAccDict  # DNS Account
         self.__DnsServerIP = None
+        self.__DataAccess  = DataAccess  # Access to Webserver with local Cache
+        self.__FastdOpener = urllib.request.build_opener()
 
         self.__GatewayDict = {}          # GatewayDict[GwInstanceName] -> IPs, DnsSegments, BatmanSegments
         self.__SegmentDict = {}          # SegmentDict[SegmentNumber]  -> GwGitNames, GwDnsNames, GwBatNames, GwIPs
@@ -166,6 +167,11 @@ class ffGatewayInfo:
 
         print('Git Pull on Repository \"peers-ffs\" ...')
 
+        if self.__DataAccess.AccessMode == ACCESSMODE_REPLAY:
+            self.__CheckGitHeadOnReplay()
+            print('... skipped on Replay.\n')
+            return
+
         GitLockName = os.path.join('/tmp','.'+os.path.basename(self.__GitPath)+'.lock')
 
         try:
@@ -176,6 +182,7 @@ class ffGatewayInfo:
 
             if not GitRepo.is_dirty():
                 GitOrigin.pull()
+                self.__DataAccess.SetSnapshotInfo('GitHead',GitRepo.head.commit.hexsha)
             else:
                 self.AnalyseOnly = True
                 self.__alert('!! Git Repository is dirty - switched to analyse only mode!')
@@ -193,6 +200,28 @@ class ffGatewayInfo:
         return
 
 
+    #-----------------------------------------------------------------------
+    # private function "__CheckGitHeadOnReplay"
+    #
+    #   Git Repository must be on same Commit as on Capture of Snapshot
+    #
+    #-----------------------------------------------------------------------
+    def __CheckGitHeadOnReplay(self):
+
+        try:
+            GitHead = git.Repo(self.__GitPath).head.commit.hexsha
+        except:
+            GitHead = None
+
+        if 'GitHead' not in self.__DataAccess.SnapshotInfo:
+            print('++ Git Head not stored in Snapshot!')
+        elif GitHead != self.__DataAccess.SnapshotInfo['GitHead']:
+            self.__alert('!! Git Repository is not on Commit of Snapshot: %s <> %s' % (GitHead,self.__DataAccess.SnapshotInfo['GitHead']))
+
+        return
+
+
+
     #=======================================================================
     # private function "__GetGatewaysFromGit"
     #
@@ -238,36 +267,28 @@ class ffGatewayInfo:
     #--------------------------------------------------------------------------
     def __GetIpFromCNAME(self,DnsName):
 
-        DnsResolver = None
         IpList = []
 
-        try:
-            DnsResolver = dns.resolver.Resolver()
-        except:
-            DnsResolver = None
-
-        if DnsResolver is not None:
-            for DnsType in ['A','AAAA']:
-                try:
-                    DnsResult = DnsResolver.query(DnsName,DnsType)
-                except:
-                    DnsResult = None
-
-                if DnsResult is not None:
-                    for GatewayIP in DnsResult:
-#                        print('>>> GwIP:',GatewayIP)  #................................................
-                        IpList.append(GatewayIP.to_text())
-
+        for DnsType in ['A','AAAA']:
             try:
-                DnsResult = DnsResolver.query(DnsName,'CNAME')
+                DnsResult = self.__DataAccess.DnsQuery(DnsName,DnsType)
             except:
                 DnsResult = None
 
             if DnsResult is not None:
-                for Cname in DnsResult:
-                    GwName = Cname.to_text()
-                    print('>>> GwName/Cname:',GwName)  #................................................
-                    IpList.append(self.__GetIpFromCNAME(GwName))
+                for GatewayIP in DnsResult:
+#                    print('>>> GwIP:',GatewayIP)  #................................................
+                    IpList.append(GatewayIP)
+
+        try:
+            DnsResult = self.__DataAccess.DnsQuery(DnsName,'CNAME')
+        except:
+            DnsResult = None
+
+        if DnsResult is not None:
+            for GwName in DnsResult:
+                print('>>> GwName/Cname:',GwName)  #................................................
+                IpList.append(self.__GetIpFromCNAME(GwName))
 
         return IpList
 
@@ -351,9 +372,8 @@ class ffGatewayInfo:
         DnsZone = None
 
         try:
-            DnsResolver = dns.resolver.Resolver()
-            DnsServerIP = DnsResolver.query('%s.' % (self.__DnsAccDict['Server']),'A')[0].to_text()
-            DnsZone     = dns.zone.from_xfr(dns.query.xfr(DnsServerIP,DnsDomain))
+            DnsServerIP = self.__DataAccess.DnsQuery('%s.' % (self.__DnsAccDict['Server']),'A')[0]
+            DnsZone     = self.__DataAccess.DnsZoneTransfer(DnsServerIP,DnsDomain)
         except:
             self.__alert('!! ERROR on fetching DNS Zone from Primary: '+DnsDomain)
             DnsZone = None
@@ -361,8 +381,8 @@ class ffGatewayInfo:
 
         if DnsZone is None:
             try:
-                DnsServerIP = DnsResolver.query('%s.' % (self.__DnsAccDict['Server2']),'A')[0].to_text()
-                DnsZone     = dns.zone.from_xfr(dns.query.xfr(DnsServerIP,DnsDomain))
+                DnsServerIP = self.__DataAccess.DnsQuery('%s.' % (self.__DnsAccDict['Server2']),'A')[0]
+                DnsZone     = self.__DataAccess.DnsZoneTransfer(DnsServerIP,DnsDomain)
             except:
                 self.__alert('!! ERROR on fetching DNS Zone from Secondary: '+DnsDomain)
                 DnsZone = None
@@ -551,8 +571,7 @@ class ffGatewayInfo:
         BatctlCmd = ('/usr/sbin/batctl -m bat%02d gwl' % (Segment)).split()
 
         try:
-            BatctlGwl = subprocess.run(BatctlCmd, stdout=subprocess.PIPE)
-            BatResult = BatctlGwl.stdout.decode('utf-8')
+            BatResult = self.__DataAccess.RunCommand(BatctlCmd)
         except:
             print('++ ERROR accessing batman:',BatctlCmd)
             BatResult = None
@@ -646,43 +665,31 @@ class ffGatewayInfo:
 
         print('\nChecking DNS-Server on Gateways ...')
 
-        DnsResolver = None
-
-        try:
-            DnsResolver = dns.resolver.Resolver()
-            DnsResolver.timeout = 3
-            DnsResolver.lifetime = 3
-        except:
-            DnsResolver = None
-
-        if DnsResolver is not None:
-            for Segment in sorted(self.__SegmentDict.keys()):
-                if Segment > 0:
-                    print('... Segment',Segment)
-
-                    for GwName in sorted(self.__SegmentDict[Segment]['GwBatNames']):
-                        if len(GwName) == 7 and GwName not in GwIgnoreList:
-                            InternalGwIPv4 = '10.%d.%d.%d' % ( 190+int(Segment/32), ((Segment-1)*8)%256, int(GwName[2:4])*10 + int(GwName[6:8]) )
-#                            InternalGwIPv6 = 'fd21:b4dc:4b%02d::a38:%d' % ( Segment, int(GwName[2:4])*100 + int(GwName[6:8]) )
-
-#                            for DnsServer in [InternalGwIPv4,InternalGwIPv6]:
-                            for DnsServer in [InternalGwIPv4]:
-                                DnsResolver.nameservers = [DnsServer]
-
-#                                for DnsType in ['A','AAAA']:
-                                for DnsType in ['A']:
-                                    for i in range(3):
-                                        try:
-                                            DnsResult = DnsResolver.query(DnsTestTarget,DnsType)
-                                        except:
-                                            time.sleep(1)
-                                            DnsResult = None
-                                        else:
-                                            break
-
-                                    if DnsResult is None:
-                                        self.__alert('!! Error on DNS-Server: Seg.%02d -> %s = %s -> %s (%s)' % (Segment,GwName,DnsServer,DnsTestTarget,DnsType) )
-#                                        print('!! Error on DNS-Server: Seg.%02d -> %s = %s -> %s (%s)' % (Segment,GwName,DnsServer,DnsTestTarget,DnsType) )
+        for Segment in sorted(self.__SegmentDict.keys()):
+            if Segment > 0:
+                print('... Segment',Segment)
+
+                for GwName in sorted(self.__SegmentDict[Segment]['GwBatNames']):
+                    if len(GwName) == 7 and GwName not in GwIgnoreList:
+                        InternalGwIPv4 = '10.%d.%d.%d' % ( 190+int(Segment/32), ((Segment-1)*8)%256, int(GwName[2:4])*10 + int(GwName[6:8]) )
+#                        InternalGwIPv6 = 'fd21:b4dc:4b%02d::a38:%d' % ( Segment, int(GwName[2:4])*100 + int(GwName[6:8]) )
+
+#                        for DnsServer in [InternalGwIPv4,InternalGwIPv6]:
+                        for DnsServer in [InternalGwIPv4]:
+#                            for DnsType in ['A','AAAA']:
+                            for DnsType in ['A']:
+                                for i in range(3):
+                                    try:
+                                        DnsResult = self.__DataAccess.DnsQuery(DnsTestTarget,DnsType,DnsServer,3)
+                                    except:
+                                        self.__DataAccess.Sleep(1)
+                                        DnsResult = None
+                                    else:
+                                        break
+
+                                if DnsResult is None:
+                                    self.__alert('!! Error on DNS-Server: Seg.%02d -> %s = %s -> %s (%s)' % (Segment,GwName,DnsServer,DnsTestTarget,DnsType) )
+#                                    print('!! Error on DNS-Server: Seg.%02d -> %s = %s -> %s (%s)' % (Segment,GwName,DnsServer,DnsTestTarget,DnsType) )
 
         print('... done.\n')
         return
@@ -849,15 +856,14 @@ class ffGatewayInfo:
             Retries -= 1
 
             try:
-                FastdJsonHTTP = urllib.request.urlopen(URL,timeout=1)
-                HttpDate = int(calendar.timegm(time.strptime(FastdJsonHTTP.info()['Last-Modified'][5:],'%d %b %Y %X %Z')))
-                StatusAge = int(time.time()) - HttpDate
-                jsonFastdDict = json.loads(FastdJsonHTTP.read().decode('utf-8'))
-                FastdJsonHTTP.close()
+                FastdJsonFile = self.__DataAccess.GetHttpFile(URL.split('/')[2]+'_'+URL.split('/')[-1],URL,self.__FastdOpener,1)
+                HttpDate = FastdJsonFile['HttpDate']
+                StatusAge = self.__DataAccess.UnixTime() - HttpDate
+                jsonFastdDict = json.loads(FastdJsonFile['Body'].decode('utf-8'))
             except:
 #                print('** need retry ...')
                 jsonFastdDict = None
-                time.sleep(2)
+                self.__DataAccess.Sleep(2)
 
         if jsonFastdDict is None:
             print('++ ERROR fastd status connect!',URL)
@@ -1024,7 +1030,7 @@ class ffGatewayInfo:
 
         if DnsUpdate is not None:
             if len(DnsUpdate.index) > 1:
-                dns.query.tcp(DnsUpdate,self.__DnsServerIP)
+                self.__DataAccess.SendDnsUpdate(DnsUpdate,self.__DnsServerIP)
                 print('... Update launched on DNS-Server',self.__DnsServerIP)
 
         return isOK
@@ -1045,9 +1051,8 @@ class ffGatewayInfo:
         print('\nChecking DNS Zone \"segassign\" ...')
 
         try:
-            DnsResolver = dns.resolver.Resolver()
-            self.__DnsServerIP = DnsResolver.query('%s.' % (self.__DnsAccDict['Server']),'a')[0].to_text()
-            DnsZone = dns.zone.from_xfr(dns.query.xfr(self.__DnsServerIP,SegAssignDomain))
+            self.__DnsServerIP = self.__DataAccess.DnsQuery('%s.' % (self.__DnsAccDict['Server']),'a')[0]
+            DnsZone = self.__DataAccess.DnsZoneTransfer(self.__DnsServerIP,SegAssignDomain)
         except:
             self.__alert('!! ERROR on fetching DNS Zone \"segassign\"!')
             self.__DnsServerIP = None
@@ -1184,7 +1189,7 @@ class ffGatewayInfo:
                     GitOrigin.push()
 
                     if len(DnsUpdate.index) > 1:
-                        dns.query.tcp(DnsUpdate,self.__DnsServerIP)
+                        self.__DataAccess.SendDnsUpdate(DnsUpdate,self.__DnsServerIP)
                         print('DNS Update committed.')
                 else:
                     self.__alert('>>> No valid movements available!')
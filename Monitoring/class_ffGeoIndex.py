@@ -0,0 +1,1022 @@
+#!/usr/bin/python3
+
+###########################################################################################
+#                                                                                         #
+#  class_ffGeoIndex.py                                                                    #
+#                                                                                         #
+#  Spatial Index of Areas (Regions, ZIP-Areas) for fast Lookup of GPS Locations.          #
+#                                                                                         #
+#  Only Parts of Areas with Bounding Box containing the Location are tested,              #
+#  the Polygons are prepared for repeated Tests.                                          #
+#                                                                                         #
+#  Batch Lookups of many Locations are vectorised with shapely >= 2.0 (numpy).            #
+#                                                                                         #
+#  Regions are also rastered (Cells of about 350 m), only Locations in Cells on Borders   #
+#  of Regions need Tests of Polygons.                                                     #
+#                                                                                         #
+#  Geo Data (Regions, ZIP-Areas, Region2ZIP.json, ZipLocations.json) is compiled into     #
+#  one binary File, which is mapped into Memory and rebuilt on Changes of the Data:       #
+#                                                                                         #
+#       <data>/GeoIndex.bin      -> Header (json), Bounding Boxes, Raster, Polygons (WKB) #
+#                                                                                         #
+###########################################################################################
+#                                                                                         #
+#  Copyright (c) 2017-2018, Roland Volkmann <roland.volkmann@t-online.de>                 #
+#  All rights reserved.                                                                   #
+#                                                                                         #
+#  Redistribution and use in source and binary forms, with or without                     #
+#  modification, are permitted provided that the following conditions are met:            #
+#    1. Redistributions of source code must retain the above copyright notice,            #
+#       this list of conditions and the following disclaimer.                             #
+#    2. Redistributions in binary form must reproduce the above copyright notice,         #
+#       this list of conditions and the following disclaimer in the documentation         #
+#       and/or other materials provided with the distribution.                            #
+#                                                                                         #
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"            #
+#  AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE              #
+#  IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE         #
+#  DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE           #
+#  FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL             #
+#  DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR             #
+#  SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER             #
+#  CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,          #
+#  OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE          #
+#  OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.                   #
+#                                                                                         #
+###########################################################################################
+
+import os
+import math
+import mmap
+import struct
+import hashlib
+import json
+import re
+import shutil
+import tempfile
+import git
+
+from array import array
+from bisect import bisect_right
+from glob import glob
+
+from shapely.geometry import Point
+from shapely.geometry import box
+from shapely.geometry.polygon import Polygon
+from shapely.strtree import STRtree
+from shapely.prepared import prep
+from shapely import wkb
+
+try:
+    import numpy
+    from shapely import points as ShapelyPoints    # shapely >= 2.0
+except ImportError:
+    ShapelyPoints = None
+
+
+
+#-------------------------------------------------------------
+# Global Constants
+#-------------------------------------------------------------
+
+Region2ZipName = 'Region2ZIP.json'    # Regions with ZIP Codes of Baden-Wuerttemberg
+Zip2GpsName    = 'ZipLocations.json'  # GPS location of ZIP-Areas based on OpenStreetMap and OpenGeoDB
+GeoIndexName   = 'GeoIndex.bin'       # compiled Geo Data
+
+GeoIndexMagic  = b'FFSGEO02'          # Format Version of GeoIndex.bin
+
+ZipCellSize    = 0.1                  # Size of Cells of sorted Grid of ZIP-Locations
+ZipPreCount    = 8                    # nearest ZIP-Areas tested first in GetZipCode
+
+RasterStepLon  = 0.005                # Size of Raster Cells (about 350 m)
+RasterStepLat  = 0.003
+RasterFree     = 0                    # Cell without Region
+RasterBorder   = 0xFFFF               # Cell on Border of Region(s) -> Test of Polygons
+
+SegDirTemplate = re.compile('^vpn[0-9]{2}$')
+
+
+
+
+
+class ffGeoIndex:
+
+    #==========================================================================
+    # Constructor
+    #
+    #   AreaDict = { Area -> [ Polygon, ... ] }
+    #
+    #   Sequence of Areas in AreaDict is used as Priority on multiple Matches.
+    #==========================================================================
+    def __init__(self,AreaDict):
+
+        # public Attributes
+        self.AreaCount = 0             # Number of indexed Areas
+        self.PartCount = 0             # Number of indexed Polygons
+
+        # private Attributes
+        self.__PartList     = []       # Polygons of all Areas
+        self.__PreparedList = []       # prepared Polygons (same Index as __PartList)
+        self.__PartAreaList = []       # Area of Polygon (same Index as __PartList)
+        self.__PartIndexDict = {}      # id(Polygon) -> Index (STRtree of shapely < 2.0 returns Geometries)
+        self.__AreaRankDict = {}       # Area -> Priority
+        self.__AreaList     = []       # Priority -> Area
+        self.__PartRankArray = None    # Priority of Area of Polygon (numpy, for Batch Lookup)
+        self.__AreaTree     = None
+
+        # Initializations
+        for Area in AreaDict:
+            self.__AreaRankDict[Area] = self.AreaCount
+            self.__AreaList.append(Area)
+            self.AreaCount += 1
+
+            for AreaPart in AreaDict[Area]:
+                self.__PartIndexDict[id(AreaPart)] = len(self.__PartList)
+                self.__PartList.append(AreaPart)
+                self.__PreparedList.append(prep(AreaPart))
+                self.__PartAreaList.append(Area)
+
+        self.PartCount = len(self.__PartList)
+
+        if self.PartCount > 0:
+            self.__AreaTree = STRtree(self.__PartList)
+
+            if ShapelyPoints is not None:
+                self.__PartRankArray = numpy.array([ self.__AreaRankDict[Area] for Area in self.__PartAreaList ], dtype=numpy.int64)
+
+        return
+
+
+
+    #-----------------------------------------------------------------------
+    # private function "__GetCandidates"
+    #
+    #   Indices of Polygons with Bounding Box containing the Location
+    #
+    #-----------------------------------------------------------------------
+    def __GetCandidates(self,Location):
+
+        CandidateList = []
+
+        for Candidate in self.__AreaTree.query(Location):
+            if hasattr(Candidate,'geom_type'):    # shapely < 2.0
+                CandidateList.append(self.__PartIndexDict[id(Candidate)])
+            else:
+                CandidateList.append(int(Candidate))
+
+        return CandidateList
+
+
+
+    #==========================================================================
+    # Method "GetArea"
+    #
+    #   Area containing the Location (lon,lat) with exactly one of its Parts
+    #
+    #   -> Area with highest Priority or None if there is no Match
+    #==========================================================================
+    def GetArea(self,lon,lat):
+
+        AreaResult = None
+
+        if self.__AreaTree is not None:
+            NodeLocation = Point(lon,lat)
+            MatchDict = {}
+
+            for PartIndex in self.__GetCandidates(NodeLocation):
+                if self.__PreparedList[PartIndex].intersects(NodeLocation):
+                    Area = self.__PartAreaList[PartIndex]
+
+                    if Area in MatchDict:
+                        MatchDict[Area] += 1
+                    else:
+                        MatchDict[Area] = 1
+
+            for Area in MatchDict:
+                if MatchDict[Area] == 1:
+                    if AreaResult is None or self.__AreaRankDict[Area] < self.__AreaRankDict[AreaResult]:
+                        AreaResult = Area
+
+        return AreaResult
+
+
+
+    #==========================================================================
+    # Method "GetAreaDict"
+    #
+    #   Batch Lookup of many Locations: LocationDict = { Key -> (lon,lat) }
+    #
+    #   -> { Key -> Area or None } with same Result as GetArea for each Key
+    #==========================================================================
+    def GetAreaDict(self,LocationDict):
+
+        AreaDict = { Key:None for Key in LocationDict }
+
+        if self.__AreaTree is None or len(LocationDict) == 0:
+            pass
+
+        elif ShapelyPoints is None:    # shapely < 2.0
+            for Key in LocationDict:
+                AreaDict[Key] = self.GetArea(LocationDict[Key][0],LocationDict[Key][1])
+
+        else:
+            KeyList = list(LocationDict.keys())
+            LocationArray = ShapelyPoints([ LocationDict[Key] for Key in KeyList ])
+
+            (LocationIndices,PartIndices) = self.__AreaTree.query(LocationArray,predicate='intersects')
+
+            #----- count matching Parts per Location and Area -----
+            MatchKeys = LocationIndices.astype(numpy.int64) * self.AreaCount + self.__PartRankArray[PartIndices]
+            (MatchKeys,MatchCounts) = numpy.unique(MatchKeys,return_counts=True)
+            MatchKeys = MatchKeys[MatchCounts == 1]
+
+            #----- MatchKeys are sorted, so first Key of Location has highest Priority -----
+            (ResultLocations,ResultIndices) = numpy.unique(MatchKeys // self.AreaCount,return_index=True)
+
+            for (LocationIndex,AreaRank) in zip(ResultLocations.tolist(),(MatchKeys[ResultIndices] % self.AreaCount).tolist()):
+                AreaDict[KeyList[LocationIndex]] = self.__AreaList[AreaRank]
+
+        return AreaDict
+
+
+
+    #==========================================================================
+    # Method "GetBoxArea"
+    #
+    #   Areas touching the Box (lon_min,lat_min,lon_max,lat_max)
+    #
+    #   -> ( Number of Polygons touching the Box, Area if Box is completely inside
+    #        the only touching Polygon else None )
+    #==========================================================================
+    def GetBoxArea(self,lon_min,lat_min,lon_max,lat_max):
+
+        TouchCount = 0
+        AreaResult = None
+
+        if self.__AreaTree is not None:
+            AreaBox = box(lon_min,lat_min,lon_max,lat_max)
+            PartList = []
+
+            for PartIndex in self.__GetCandidates(AreaBox):
+                if self.__PreparedList[PartIndex].intersects(AreaBox):
+                    PartList.append(PartIndex)
+
+            TouchCount = len(PartList)
+
+            if TouchCount == 1 and self.__PreparedList[PartList[0]].contains_properly(AreaBox):
+                AreaResult = self.__PartAreaList[PartList[0]]
+
+        return (TouchCount,AreaResult)
+
+
+
+
+
+class ffGeoRaster:
+
+    #==========================================================================
+    # Constructor
+    #
+    #   Raster = { 'lon_min','lat_min','lon_cells','lat_cells','Areas' }
+    #   RasterTable = Cells (RasterFree, RasterBorder or Index in Areas + 1)
+    #   GetBorderIndex = Function for ffGeoIndex of Areas (set up on first Border Cell)
+    #
+    #   Same Lookup Methods as ffGeoIndex.
+    #==========================================================================
+    def __init__(self,Raster,RasterTable,GetBorderIndex):
+
+        # public Attributes
+        self.AreaCount   = len(Raster['Areas'])
+        self.BorderCount = 0           # Lookups with Test of Polygons
+
+        # private Attributes
+        self.__lon_min     = Raster['lon_min']
+        self.__lat_min     = Raster['lat_min']
+        self.__lon_cells   = Raster['lon_cells']
+        self.__lat_cells   = Raster['lat_cells']
+        self.__AreaList    = [ None ] + Raster['Areas']    # RasterFree = 0 -> None
+        self.__RasterTable = RasterTable
+        self.__GetBorderIndex = GetBorderIndex
+        self.__BorderIndex = None
+
+        return
+
+
+
+    #-----------------------------------------------------------------------
+    # private function "__GetCell"
+    #
+    #   Value of Raster Cell containing the Location
+    #
+    #-----------------------------------------------------------------------
+    def __GetCell(self,lon,lat):
+
+        x = math.floor((lon - self.__lon_min) / RasterStepLon)
+        y = math.floor((lat - self.__lat_min) / RasterStepLat)
+
+        if x < 0 or x >= self.__lon_cells or y < 0 or y >= self.__lat_cells:
+            return RasterFree    # Raster is covering all Areas
+
+        return self.__RasterTable[y*self.__lon_cells + x]
+
+
+
+    #==========================================================================
+    # Method "GetArea"
+    #
+    #   Area containing the Location (lon,lat) -> Area or None
+    #==========================================================================
+    def GetArea(self,lon,lat):
+
+        return self.GetAreaDict({ 0:(lon,lat) })[0]
+
+
+
+    #==========================================================================
+    # Method "GetAreaDict"
+    #
+    #   Batch Lookup of many Locations: LocationDict = { Key -> (lon,lat) }
+    #
+    #   -> { Key -> Area or None }, Polygons are tested only in Border Cells
+    #==========================================================================
+    def GetAreaDict(self,LocationDict):
+
+        AreaDict = {}
+        BorderDict = {}
+
+        for Key in LocationDict:
+            Cell = self.__GetCell(LocationDict[Key][0],LocationDict[Key][1])
+
+            if Cell == RasterBorder:
+                BorderDict[Key] = LocationDict[Key]
+            else:
+                AreaDict[Key] = self.__AreaList[Cell]
+
+        if len(BorderDict) > 0:
+            self.BorderCount += len(BorderDict)
+
+            if self.__BorderIndex is None:
+                self.__BorderIndex = self.__GetBorderIndex()
+
+            AreaDict.update(self.__BorderIndex.GetAreaDict(BorderDict))
+
+        return AreaDict
+
+
+
+
+
+class ffGeoData:
+
+    #==========================================================================
+    # Constructor
+    #
+    #   Load compiled Geo Data, compile it again if Data in Git or Database
+    #   has changed (IndexKey).
+    #
+    #   ReadOnly: Database is not changed (Replay), a missing or outdated Index
+    #             is compiled into a temporary Directory.
+    #==========================================================================
+    def __init__(self,GitPath,DatabasePath,ReadOnly=False):
+
+        # public Attributes
+        self.isOK           = False    # Geo Data is available
+        self.IndexKey       = None     # Hash of Git Trees and Database Files
+        self.ValidArea      = Polygon([ (0.0,45.0),(0.0,60.0),(20.0,60.0),(20.0,45.0) ])
+        self.RegionSegments = {}       # Region -> Segment
+        self.WithZip        = []       # Regions with ZIP-Areas
+        self.ZipAreaDict    = {}       # ZipCode -> { 'Area','Segment' }
+
+        # private Attributes
+        self.__GitPath      = GitPath
+        self.__DatabasePath = DatabasePath
+        self.__IndexPath    = DatabasePath    # Directory of GeoIndex.bin
+        self.__IndexMap     = None     # GeoIndex.bin mapped into Memory
+        self.__RegionList   = []       # [ Region,Segment,FirstPart,PartCount ]
+        self.__ZipAreaList  = []       # [ ZipCode,Area,Segment,FirstPart,PartCount ] sorted by ZipCode
+        self.__ZipFirstList = []       # FirstPart of __ZipAreaList (for bisect)
+        self.__ZipPosDict   = None     # ZipCode -> Index in __ZipPosTable (set up on first Use)
+        self.__ZipCodeList  = []       # ZIP-Codes of __ZipPosTable
+        self.__ZipCellDict  = None     # (x,y) -> [ Index in __ZipPosTable ] (set up on first Use)
+        self.__ZipCellRange = 0        # max. Distance of Cells (in Cells)
+        self.__ZipAreaIndexDict = None # ZipCode -> Index in __ZipAreaList (set up on first Use)
+        self.__BoxTable     = None     # Bounding Box of Polygons: minx,miny,maxx,maxy
+        self.__WkbOffsets   = None     # Polygon in __WkbBlob: [Offset[i],Offset[i+1]]
+        self.__ZipPosTable  = None     # lon,lat of ZIP-Codes
+        self.__Raster       = None     # Raster of Regions without ZIP-Areas
+        self.__RasterTable  = None     # Cells of Raster
+        self.__WkbBlob      = None
+        self.__PolygonDict  = {}       # decoded Polygons: Part -> Polygon
+
+        # Initializations
+        self.IndexKey = self.__GetIndexKey()
+
+        if not self.__LoadIndex():
+            if ReadOnly:
+                self.__IndexPath = tempfile.mkdtemp(prefix='ffGeoIndex-')
+
+            if self.__CompileIndex():
+                self.__LoadIndex()
+
+            if ReadOnly:
+                shutil.rmtree(self.__IndexPath,ignore_errors=True)    # Index stays mapped into Memory
+
+        return
+
+
+
+    #-----------------------------------------------------------------------
+    # private function "__GetIndexKey"
+    #
+    #   Hash of Git Trees of regions + zip-areas and of Database Files
+    #
+    #-----------------------------------------------------------------------
+    def __GetIndexKey(self):
+
+        KeyHash = hashlib.sha1(GeoIndexMagic)
+
+        try:
+            GitTree = git.Repo(self.__GitPath).head.commit.tree
+
+            for SegTree in sorted(GitTree.trees, key=lambda Tree: Tree.name):
+                if SegDirTemplate.match(SegTree.name):
+                    for GeoTree in sorted(SegTree.trees, key=lambda Tree: Tree.name):
+                        if GeoTree.name in ['regions','zip-areas']:
+                            KeyHash.update(('%s/%s:%s\n' % (SegTree.name,GeoTree.name,GeoTree.hexsha)).encode('utf-8'))
+        except:
+            print('++ No Git Trees of Geo Data, checking Files ...')
+
+            for FileName in sorted(glob(os.path.join(self.__GitPath,'vpn*/regions/*.json')) + glob(os.path.join(self.__GitPath,'vpn*/zip-areas/*.json'))):
+                FileStat = os.stat(FileName)
+                KeyHash.update(('%s:%d:%d\n' % (FileName,FileStat.st_size,FileStat.st_mtime_ns)).encode('utf-8'))
+
+        for FileName in [Region2ZipName,Zip2GpsName]:
+            try:
+                with open(os.path.join(self.__DatabasePath,FileName), mode='rb') as DataFile:
+                    KeyHash.update(hashlib.sha1(DataFile.read()).digest())
+            except:
+                KeyHash.update(b'-')
+
+        return KeyHash.hexdigest()
+
+
+
+    #-----------------------------------------------------------------------
+    # private function "__LoadIndex"
+    #
+    #   Map GeoIndex.bin into Memory -> True if IndexKey is matching
+    #
+    #-----------------------------------------------------------------------
+    def __LoadIndex(self):
+
+        IndexOK = False
+
+        try:
+            with open(os.path.join(self.__IndexPath,GeoIndexName), mode='rb') as IndexFile:
+                IndexMap = mmap.mmap(IndexFile.fileno(), 0, access=mmap.ACCESS_READ)
+
+            if IndexMap[:len(GeoIndexMagic)] != GeoIndexMagic:
+                print('++ Invalid Format of',GeoIndexName)
+            else:
+                HeaderStart = len(GeoIndexMagic) + 4
+                HeaderLen = struct.unpack_from('=I',IndexMap,len(GeoIndexMagic))[0]
+                Header = json.loads(IndexMap[HeaderStart:HeaderStart+HeaderLen].decode('utf-8'))
+
+                if Header['IndexKey'] != self.IndexKey:
+                    print('... Geo Data has changed.')
+                else:
+                    IndexView = memoryview(IndexMap)
+                    PartCount = Header['PartCount']
+
+                    self.__IndexMap    = IndexMap
+                    self.__BoxTable    = IndexView[Header['BoxStart']:Header['BoxStart']+PartCount*4*8].cast('d')
+                    self.__WkbOffsets  = IndexView[Header['OffsetStart']:Header['OffsetStart']+(PartCount+1)*8].cast('Q')
+                    self.__ZipPosTable = IndexView[Header['ZipPosStart']:Header['ZipPosStart']+len(Header['ZipCodes'])*2*8].cast('d')
+                    self.__RasterTable = IndexView[Header['RasterStart']:Header['RasterStart']+Header['Raster']['lon_cells']*Header['Raster']['lat_cells']*2].cast('H')
+                    self.__WkbBlob     = IndexView[Header['WkbStart']:]
+
+                    self.__RegionList   = Header['Regions']
+                    self.__ZipAreaList  = Header['ZipAreas']
+                    self.__ZipFirstList = [ ZipArea[3] for ZipArea in self.__ZipAreaList ]
+                    self.__ZipCodeList  = Header['ZipCodes']
+                    self.__Raster       = Header['Raster']
+
+                    self.WithZip        = Header['WithZip']
+                    self.RegionSegments = { Region[0]:Region[1] for Region in self.__RegionList }
+                    self.ZipAreaDict    = { ZipArea[0]:{ 'Area':ZipArea[1], 'Segment':ZipArea[2] } for ZipArea in self.__ZipAreaList }
+
+                    self.isOK = True
+                    IndexOK = True
+                    print('... Geo Index loaded: %d Regions / %d ZIP-Areas / %d Polygons\n' % (len(self.__RegionList),len(self.__ZipAreaList),PartCount))
+        except:
+            print('... Geo Index not available.')
+
+        return IndexOK
+
+
+
+    #-----------------------------------------------------------------------
+    # private function "__LoadPolygons"
+    #
+    #   Polygons from GeoJson File -> [ Polygon, ... ] or None
+    #
+    #-----------------------------------------------------------------------
+    def __LoadPolygons(self,FileName):
+
+        with open(FileName,'r') as JsonFile:
+            GeoJson = json.load(JsonFile)
+
+        if 'geometries' in GeoJson:
+            TrackBase = GeoJson['geometries'][0]['coordinates']
+        elif 'coordinates' in GeoJson:
+            TrackBase = GeoJson['coordinates']
+        else:
+            print('Problem parsing %s' % FileName)
+            return None
+
+        PolygonList = []
+
+        for Track in TrackBase:
+            Shape = []
+
+            for t in Track[0]:
+                Shape.append( (t[0],t[1]) )    # t[0] = Longitude = x | t[1] = Latitude = y
+
+            PolygonList.append(Polygon(Shape))
+
+        return PolygonList
+
+
+
+    #-----------------------------------------------------------------------
+    # private function "__CompileRaster"
+    #
+    #   Raster of Areas: AreaDict = { Area -> [ Polygon, ... ] }
+    #
+    #   -> ( Raster = { 'lon_min','lat_min','lon_cells','lat_cells','Areas' }, Cells )
+    #
+    #   Boxes of Cells are split into Quarters until they are inside one Area,
+    #   outside of all Areas or single Cells on Borders.
+    #-----------------------------------------------------------------------
+    def __CompileRaster(self,AreaDict):
+
+        Raster = { 'lon_min':0.0, 'lat_min':0.0, 'lon_cells':0, 'lat_cells':0, 'Areas':list(AreaDict.keys()) }
+        PartList = [ AreaPart for Area in AreaDict for AreaPart in AreaDict[Area] ]
+
+        if len(PartList) == 0:
+            return (Raster,array('H'))
+
+        Raster['lon_min'] = math.floor(min([ AreaPart.bounds[0] for AreaPart in PartList ]) / RasterStepLon) * RasterStepLon
+        Raster['lat_min'] = math.floor(min([ AreaPart.bounds[1] for AreaPart in PartList ]) / RasterStepLat) * RasterStepLat
+        Raster['lon_cells'] = math.floor((max([ AreaPart.bounds[2] for AreaPart in PartList ]) - Raster['lon_min']) / RasterStepLon) + 1
+        Raster['lat_cells'] = math.floor((max([ AreaPart.bounds[3] for AreaPart in PartList ]) - Raster['lat_min']) / RasterStepLat) + 1
+
+        AreaIndex = ffGeoIndex(AreaDict)
+        AreaCellDict = { Raster['Areas'][i]:i+1 for i in range(len(Raster['Areas'])) }
+        RasterTable = array('H',[RasterFree]) * (Raster['lon_cells'] * Raster['lat_cells'])
+
+        BoxList = [ (0,0,Raster['lon_cells'],Raster['lat_cells']) ]    # Cells x0 <= x < x1, y0 <= y < y1
+
+        while len(BoxList) > 0:
+            (x0,y0,x1,y1) = BoxList.pop()
+
+            (TouchCount,Area) = AreaIndex.GetBoxArea(Raster['lon_min'] + x0 * RasterStepLon, Raster['lat_min'] + y0 * RasterStepLat,
+                                                     Raster['lon_min'] + x1 * RasterStepLon, Raster['lat_min'] + y1 * RasterStepLat)
+
+            if TouchCount == 0:
+                continue    # Cells are RasterFree
+
+            if Area is not None:
+                Cell = AreaCellDict[Area]
+            elif x1 - x0 == 1 and y1 - y0 == 1:
+                Cell = RasterBorder
+            else:
+                xm = (x0 + x1 + 1) // 2
+                ym = (y0 + y1 + 1) // 2
+
+                for (bx0,by0,bx1,by1) in [ (x0,y0,xm,ym),(xm,y0,x1,ym),(x0,ym,xm,y1),(xm,ym,x1,y1) ]:
+                    if bx0 < bx1 and by0 < by1:
+                        BoxList.append((bx0,by0,bx1,by1))
+                continue
+
+            for y in range(y0,y1):
+                RasterTable[y*Raster['lon_cells']+x0:y*Raster['lon_cells']+x1] = array('H',[Cell]) * (x1 - x0)
+
+        print('... Region Raster compiled: %d x %d Cells, %d on Borders' % (Raster['lon_cells'],Raster['lat_cells'],RasterTable.count(RasterBorder)))
+        return (Raster,RasterTable)
+
+
+
+    #-----------------------------------------------------------------------
+    # private function "__CompileIndex"
+    #
+    #   Compile Geo Data from Git and Database into GeoIndex.bin
+    #
+    #-----------------------------------------------------------------------
+    def __CompileIndex(self):
+
+        print('Compiling Geo Index ...')
+
+        RegionList  = []
+        ZipAreaList = []
+        PolygonList = []
+        WithZip     = []
+
+        #----- Regions -----
+        try:
+            with open(os.path.join(self.__DatabasePath,Region2ZipName), mode='r') as Region2ZipFile:
+                WithZip = list(json.load(Region2ZipFile).keys())
+        except:
+            print('!! ERROR on loading Region-to-ZIP Data')
+            WithZip = []
+
+        try:
+            for FileName in glob(os.path.join(self.__GitPath,'vpn*/regions/*.json')):
+                Region  = os.path.basename(FileName).split('.')[0]
+                Segment = int(os.path.dirname(FileName).split('/')[-2][3:])
+
+                if Region[0] == '_':
+                    print('!! Invalid File: %s' % FileName)
+                    RegionList = []
+                    break
+
+                RegionPolygons = self.__LoadPolygons(FileName)
+
+                if RegionPolygons is not None:
+                    RegionList.append([ Region,Segment,len(PolygonList),len(RegionPolygons) ])
+                    PolygonList += RegionPolygons
+
+        except:
+            RegionList = []
+
+        print('... Region Areas loaded:',len(RegionList))
+
+        if len(RegionList) == 0:
+            return False
+
+        for Region in WithZip:
+            if Region not in [ RegionInfo[0] for RegionInfo in RegionList ]:
+                print('!! Missing Region Polygon:',Region)
+
+        #----- ZIP-Areas -----
+        ZipFileDict = {}
+
+        for FileName in glob(os.path.join(self.__GitPath,'vpn*/zip-areas/?????_*.json')):
+            ZipCode = os.path.basename(FileName)[:5]
+            ZipFileDict[ZipCode] = { 'FileName':FileName, 'Area':os.path.basename(FileName).split(".")[0], 'Segment':int(FileName.split("/")[-3][3:]) }
+
+        if len(ZipFileDict) < 10:
+            print('!! ERROR on registering ZIP-Areas:',len(ZipFileDict))
+            return False
+
+        for ZipCode in sorted(ZipFileDict.keys()):
+            ZipPolygons = self.__LoadPolygons(ZipFileDict[ZipCode]['FileName'])
+
+            if ZipPolygons is None:
+                ZipPolygons = []
+
+            ZipAreaList.append([ ZipCode,ZipFileDict[ZipCode]['Area'],ZipFileDict[ZipCode]['Segment'],len(PolygonList),len(ZipPolygons) ])
+            PolygonList += ZipPolygons
+
+        print('... ZIP-Areas registered:',len(ZipAreaList))
+
+        #----- ZIP-Locations -----
+        try:
+            with open(os.path.join(self.__DatabasePath,Zip2GpsName), mode='r') as Zip2GpsFile:
+                Zip2GpsDict = json.load(Zip2GpsFile)
+        except:
+            print('!! ERROR on setting up ZIP-to GPS Data')
+            return False
+
+        ZipCodeList = sorted(Zip2GpsDict.keys())
+        print('... ZIP-Codes loaded:',len(ZipCodeList))
+
+        #----- Raster of Regions without ZIP-Areas -----
+        (Raster,RasterTable) = self.__CompileRaster({ RegionInfo[0]:PolygonList[RegionInfo[2]:RegionInfo[2]+RegionInfo[3]]
+                                                      for RegionInfo in RegionList if RegionInfo[0] not in WithZip })
+
+        #----- Binary Tables -----
+        BoxTable    = array('d')
+        OffsetTable = array('Q',[0])
+        ZipPosTable = array('d')
+        WkbList     = []
+
+        for AreaPolygon in PolygonList:
+            BoxTable.extend(AreaPolygon.bounds)
+            WkbList.append(AreaPolygon.wkb)
+            OffsetTable.append(OffsetTable[-1] + len(WkbList[-1]))
+
+        for ZipCode in ZipCodeList:
+            ZipPosTable.extend([ float(Zip2GpsDict[ZipCode][0]),float(Zip2GpsDict[ZipCode][1]) ])
+
+        Header = {
+            'IndexKey'   : self.IndexKey,
+            'Regions'    : RegionList,
+            'ZipAreas'   : ZipAreaList,
+            'WithZip'    : WithZip,
+            'ZipCodes'   : ZipCodeList,
+            'Raster'     : Raster,
+            'PartCount'  : len(PolygonList)
+        }
+
+        #----- Positions of Tables are stored in Header -----
+        HeaderStart = len(GeoIndexMagic) + 4
+        HeaderLen = len(json.dumps(Header).encode('utf-8')) + 200    # Space for Positions
+
+        Header['BoxStart']    = (HeaderStart + HeaderLen + 7) // 8 * 8
+        Header['OffsetStart'] = Header['BoxStart'] + len(BoxTable) * 8
+        Header['ZipPosStart'] = Header['OffsetStart'] + len(OffsetTable) * 8
+        Header['RasterStart'] = Header['ZipPosStart'] + len(ZipPosTable) * 8
+        Header['WkbStart']    = Header['RasterStart'] + (len(RasterTable) * 2 + 7) // 8 * 8
+
+        HeaderBytes = json.dumps(Header).encode('utf-8')
+        HeaderBytes += b' ' * (Header['BoxStart'] - HeaderStart - len(HeaderBytes))
+
+        #----- Writing to temporary File, then replace old Index -----
+        IndexFileName = os.path.join(self.__IndexPath,GeoIndexName)
+        TempFileName  = '%s.%d.tmp' % (IndexFileName,os.getpid())
+
+        try:
+            with open(TempFileName, mode='wb') as IndexFile:
+                IndexFile.write(GeoIndexMagic)
+                IndexFile.write(struct.pack('=I',len(HeaderBytes)))
+                IndexFile.write(HeaderBytes)
+                IndexFile.write(BoxTable.tobytes())
+                IndexFile.write(OffsetTable.tobytes())
+                IndexFile.write(ZipPosTable.tobytes())
+                IndexFile.write(RasterTable.tobytes())
+                IndexFile.write(b'\0' * (Header['WkbStart'] - Header['RasterStart'] - len(RasterTable) * 2))
+
+                for WkbData in WkbList:
+                    IndexFile.write(WkbData)
+
+            os.replace(TempFileName,IndexFileName)
+        except:
+            print('!! ERROR on writing',GeoIndexName)
+            return False
+
+        print('... %d Polygons written to %s.' % (len(PolygonList),GeoIndexName))
+        return True
+
+
+
+    #-----------------------------------------------------------------------
+    # private function "__GetPolygon"
+    #
+    #   Polygon of Part (decoded from WKB on first Use)
+    #
+    #-----------------------------------------------------------------------
+    def __GetPolygon(self,Part):
+
+        if Part not in self.__PolygonDict:
+            self.__PolygonDict[Part] = wkb.loads(bytes(self.__WkbBlob[self.__WkbOffsets[Part]:self.__WkbOffsets[Part+1]]))
+
+        return self.__PolygonDict[Part]
+
+
+
+    #-----------------------------------------------------------------------
+    # private function "__GetAreaDict"
+    #
+    #   Area -> [ Polygon, ... ] for ffGeoIndex
+    #
+    #-----------------------------------------------------------------------
+    def __GetAreaDict(self,AreaList):
+
+        AreaDict = {}
+
+        for AreaInfo in AreaList:
+            AreaDict[AreaInfo[0]] = [ self.__GetPolygon(Part) for Part in range(AreaInfo[-2],AreaInfo[-2]+AreaInfo[-1]) ]
+
+        return AreaDict
+
+
+
+    #-----------------------------------------------------------------------
+    # private function "__GetRegionPolygonIndex"
+    #
+    #   Spatial Index of Polygons of Regions without ZIP-Areas
+    #
+    #-----------------------------------------------------------------------
+    def __GetRegionPolygonIndex(self):
+
+        return ffGeoIndex(self.__GetAreaDict([ Region for Region in self.__RegionList if Region[0] not in self.WithZip ]))
+
+
+
+    #==========================================================================
+    # Method "GetRegionIndex"
+    #
+    #   Raster of Regions without ZIP-Areas, Polygons are only used on Borders
+    #==========================================================================
+    def GetRegionIndex(self):
+
+        if self.__Raster['lon_cells'] == 0:
+            return self.__GetRegionPolygonIndex()
+
+        return ffGeoRaster(self.__Raster,self.__RasterTable,self.__GetRegionPolygonIndex)
+
+
+
+    #==========================================================================
+    # Method "GetZipIndex"
+    #
+    #   Spatial Index of ZIP-Areas
+    #==========================================================================
+    def GetZipIndex(self):
+
+        return ffGeoIndex(self.__GetAreaDict(self.__ZipAreaList))
+
+
+
+    #==========================================================================
+    # Method "GetZipPosition"
+    #
+    #   GPS Position of ZIP-Code -> (lon,lat) or None
+    #==========================================================================
+    def GetZipPosition(self,ZipCode):
+
+        if self.__ZipPosDict is None:
+            self.__ZipPosDict = { self.__ZipCodeList[i]:i for i in range(len(self.__ZipCodeList)) }
+
+        if ZipCode not in self.__ZipPosDict:
+            return None
+
+        i = self.__ZipPosDict[ZipCode]
+        return (self.__ZipPosTable[2*i],self.__ZipPosTable[2*i+1])
+
+
+
+    #-----------------------------------------------------------------------
+    # private function "__SetupZipCells"
+    #
+    #   Sorted Grid of ZIP-Locations for Search of nearest ZIP-Codes
+    #
+    #-----------------------------------------------------------------------
+    def __SetupZipCells(self):
+
+        self.__ZipCellDict = {}
+
+        for i in range(len(self.__ZipCodeList)):
+            ZipCell = (math.floor(self.__ZipPosTable[2*i] / ZipCellSize),math.floor(self.__ZipPosTable[2*i+1] / ZipCellSize))
+
+            if ZipCell in self.__ZipCellDict:
+                self.__ZipCellDict[ZipCell].append(i)
+            else:
+                self.__ZipCellDict[ZipCell] = [ i ]
+
+        if len(self.__ZipCellDict) > 0:
+            self.__ZipCellRange = max( max([ ZipCell[0] for ZipCell in self.__ZipCellDict ]) - min([ ZipCell[0] for ZipCell in self.__ZipCellDict ]),
+                                       max([ ZipCell[1] for ZipCell in self.__ZipCellDict ]) - min([ ZipCell[1] for ZipCell in self.__ZipCellDict ]) )
+
+        return
+
+
+
+    #==========================================================================
+    # Method "GetNearestZipCodes"
+    #
+    #   ZIP-Codes with Location nearest to (lon,lat) -> [ ZipCode, ... ]
+    #
+    #   Rings of Cells around the Location are searched until no other Cell
+    #   can contain a nearer ZIP-Location.
+    #==========================================================================
+    def GetNearestZipCodes(self,lon,lat,MaxCount):
+
+        if self.__ZipCellDict is None:
+            self.__SetupZipCells()
+
+        x0 = math.floor(lon / ZipCellSize)
+        y0 = math.floor(lat / ZipCellSize)
+        lon_factor = math.cos(math.radians(lat))    # Distance of Longitudes is shrinking to the North
+
+        DistanceList = []
+        Ring = 0
+
+        while Ring <= self.__ZipCellRange + abs(x0) + abs(y0):
+            if Ring == 0:
+                RingCells = [ (x0,y0) ]
+            else:
+                RingCells  = [ (x,y0-Ring) for x in range(x0-Ring,x0+Ring+1) ] + [ (x,y0+Ring) for x in range(x0-Ring,x0+Ring+1) ]
+                RingCells += [ (x0-Ring,y) for y in range(y0-Ring+1,y0+Ring) ] + [ (x0+Ring,y) for y in range(y0-Ring+1,y0+Ring) ]
+
+            for ZipCell in RingCells:
+                if ZipCell in self.__ZipCellDict:
+                    for i in self.__ZipCellDict[ZipCell]:
+                        dx = (self.__ZipPosTable[2*i] - lon) * lon_factor
+                        dy = self.__ZipPosTable[2*i+1] - lat
+                        DistanceList.append((dx*dx + dy*dy,self.__ZipCodeList[i]))
+
+            if len(DistanceList) >= MaxCount:
+                DistanceList.sort()
+                del DistanceList[MaxCount:]
+                MinDistance = Ring * ZipCellSize * lon_factor    # Cells outside of Ring are not nearer
+
+                if DistanceList[-1][0] <= MinDistance * MinDistance:
+                    break
+
+            if len(DistanceList) >= len(self.__ZipCodeList):
+                break
+
+            Ring += 1
+
+        DistanceList.sort()
+        return [ Distance[1] for Distance in DistanceList[:MaxCount] ]
+
+
+
+    #-----------------------------------------------------------------------
+    # private function "__GetZipMatches"
+    #
+    #   Add Matches of Parts of ZIP-Area to MatchDict = { Index in __ZipAreaList -> Matches }
+    #
+    #-----------------------------------------------------------------------
+    def __GetZipMatches(self,ZipIndex,lon,lat,NodeLocation,MatchDict):
+
+        FirstPart = self.__ZipAreaList[ZipIndex][3]
+
+        for Part in range(FirstPart,FirstPart+self.__ZipAreaList[ZipIndex][4]):
+            if (self.__BoxTable[4*Part]   <= lon and self.__BoxTable[4*Part+2] >= lon and
+                self.__BoxTable[4*Part+1] <= lat and self.__BoxTable[4*Part+3] >= lat):
+
+                if self.__GetPolygon(Part).intersects(NodeLocation):
+                    if ZipIndex in MatchDict:
+                        MatchDict[ZipIndex] += 1
+                    else:
+                        MatchDict[ZipIndex] = 1
+
+        return
+
+
+
+    #==========================================================================
+    # Method "GetZipCode"
+    #
+    #   ZIP-Code of single Location without building a Spatial Index,
+    #   only Polygons with Bounding Box containing the Location are decoded.
+    #
+    #   ZIP-Areas with nearest ZIP-Location are tested first, all other
+    #   ZIP-Areas only if none of them is matching.
+    #==========================================================================
+    def GetZipCode(self,lon,lat):
+
+        ZipCodeResult = None
+        NodeLocation = Point(lon,lat)
+        MatchDict = {}
+
+        if self.__ZipAreaIndexDict is None:
+            self.__ZipAreaIndexDict = { self.__ZipAreaList[i][0]:i for i in range(len(self.__ZipAreaList)) }
+
+        for ZipCode in self.GetNearestZipCodes(lon,lat,ZipPreCount):
+            if ZipCode in self.__ZipAreaIndexDict:
+                self.__GetZipMatches(self.__ZipAreaIndexDict[ZipCode],lon,lat,NodeLocation,MatchDict)
+
+        for ZipIndex in sorted(MatchDict.keys()):
+            if MatchDict[ZipIndex] == 1:
+                return self.__ZipAreaList[ZipIndex][0]
+
+        MatchDict = {}
+        FirstPart = self.__ZipAreaList[0][3]
+        LastPart  = self.__ZipAreaList[-1][3] + self.__ZipAreaList[-1][4]
+
+        for Part in range(FirstPart,LastPart):
+            if (self.__BoxTable[4*Part]   <= lon and self.__BoxTable[4*Part+2] >= lon and
+                self.__BoxTable[4*Part+1] <= lat and self.__BoxTable[4*Part+3] >= lat):
+
+                if self.__GetPolygon(Part).intersects(NodeLocation):
+                    ZipIndex = bisect_right(self.__ZipFirstList,Part) - 1    # Parts of ZIP-Areas are in Sequence
+
+                    if ZipIndex in MatchDict:
+                        MatchDict[ZipIndex] += 1
+                    else:
+                        MatchDict[ZipIndex] = 1
+
+        for ZipIndex in sorted(MatchDict.keys()):
+            if MatchDict[ZipIndex] == 1:
+                ZipCodeResult = self.__ZipAreaList[ZipIndex][0]
+                break
+
+        return ZipCodeResult
+
+
+
+    #==========================================================================
+    # Method "GetLocationSegments"
+    #
+    #   Segments of GPS Location and of ZIP-Code -> ( GpsSegment,ZipSegment )
+    #==========================================================================
+    def GetLocationSegments(self,lon,lat,ZipCode):
+
+        GpsSegment = None
+        ZipSegment = None
+
+        if lon is not None and lat is not None:
+            GpsZipCode = self.GetZipCode(lon,lat)
+
+            if GpsZipCode is not None:
+                GpsSegment = self.ZipAreaDict[GpsZipCode]['Segment']
+
+        if ZipCode in self.ZipAreaDict:
+            ZipSegment = self.ZipAreaDict[ZipCode]['Segment']
+
+        return (GpsSegment,ZipSegment)
@@ -0,0 +1,281 @@
+#!/usr/bin/python3
+
+###########################################################################################
+#                                                                                         #
+#  class_ffMeshGraph.py                                                                   #
+#                                                                                         #
+#  Compact Graph of the Mesh-Network for Analysis of Mesh-Clouds.                         #
+#                                                                                         #
+#  Active Nodes get an Index (Order of ffNodeDict), the Neighbours are resolved to the    #
+#  Main MACs once per Run and stored as CSR (compressed sparse row) Arrays:               #
+#                                                                                         #
+#       Targets[Offsets[Index]:Offsets[Index+1]]  -> Indices of Neighbours of Node        #
+#                                                                                         #
+#  Unknown Neighbours (MAC not in MAC2NodeIDDict) are collected separately.               #
+#  Mesh-Clouds are calculated vectorised with numpy, if available.                        #
+#                                                                                         #
+###########################################################################################
+#                                                                                         #
+#  Copyright (c) 2017-2018, Roland Volkmann <roland.volkmann@t-online.de>                 #
+#  All rights reserved.                                                                   #
+#                                                                                         #
+#  Redistribution and use in source and binary forms, with or without                     #
+#  modification, are permitted provided that the following conditions are met:            #
+#    1. Redistributions of source code must retain the above copyright notice,            #
+#       this list of conditions and the following disclaimer.                             #
+#    2. Redistributions in binary form must reproduce the above copyright notice,         #
+#       this list of conditions and the following disclaimer in the documentation         #
+#       and/or other materials provided with the distribution.                            #
+#                                                                                         #
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"            #
+#  AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE              #
+#  IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE         #
+#  DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE           #
+#  FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL             #
+#  DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR             #
+#  SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER             #
+#  CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,          #
+#  OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE          #
+#  OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.                   #
+#                                                                                         #
+###########################################################################################
+
+import hashlib
+
+from array import array
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+
+class ffMeshGraph:
+
+    #==========================================================================
+    # Constructor
+    #==========================================================================
+    def __init__(self,NodeInfos):
+
+        # public Attributes
+        self.NodeList      = []       # Index -> ffNodeMAC (active Nodes in Order of ffNodeDict)
+        self.NodeIndexDict = {}       # ffNodeMAC -> Index
+        self.Offsets       = None     # CSR: Start of Neighbours of Node in Targets (numpy or array)
+        self.Targets       = None     # CSR: Indices of Neighbours
+        self.UnknownList   = []       # [ ffNodeMAC,MeshMAC ] with MeshMAC not in MAC2NodeIDDict
+
+        # private Attributes
+        self.__NodeInfos   = NodeInfos
+        self.__OffsetList  = [ 0 ]    # Offsets and Targets as Python Lists for Loops
+        self.__TargetList  = []
+
+        # Initializations
+        self.__CreateGraph()
+
+        return
+
+
+
+    #-----------------------------------------------------------------------
+    # private function "__CreateGraph"
+    #
+    #   Resolve Neighbours of active Nodes to Main MACs and build CSR Arrays
+    #
+    #-----------------------------------------------------------------------
+    def __CreateGraph(self):
+
+        for ffNodeMAC in self.__NodeInfos.ffNodeDict.keys():
+            if self.__NodeInfos.ffNodeDict[ffNodeMAC].Status != '?':
+                self.NodeIndexDict[ffNodeMAC] = len(self.NodeList)
+                self.NodeList.append(ffNodeMAC)
+
+        for NodeIndex in range(len(self.NodeList)):
+            ffNodeMAC = self.NodeList[NodeIndex]
+            NeighbourSet = set()
+
+            for MeshMAC in self.__NodeInfos.ffNodeDict[ffNodeMAC].Neighbours:
+                if MeshMAC in self.__NodeInfos.MAC2NodeIDDict:
+                    ffNeighbourMAC = self.__NodeInfos.MAC2NodeIDDict[MeshMAC]
+
+                    if ffNeighbourMAC in self.NodeIndexDict:
+                        NeighbourSet.add(self.NodeIndexDict[ffNeighbourMAC])
+                else:
+                    self.UnknownList.append([ffNodeMAC,MeshMAC])
+
+            NeighbourSet.discard(NodeIndex)
+            self.__TargetList.extend(sorted(NeighbourSet))
+            self.__OffsetList.append(len(self.__TargetList))
+
+        if numpy is not None:
+            self.Offsets = numpy.array(self.__OffsetList,dtype=numpy.int64)
+            self.Targets = numpy.array(self.__TargetList,dtype=numpy.int64)
+        else:
+            self.Offsets = array('q',self.__OffsetList)
+            self.Targets = array('q',self.__TargetList)
+
+        return
+
+
+
+    #-----------------------------------------------------------------------
+    # private function "__GetCloudRoot"
+    #
+    #   Root of Node in Union-Find of Mesh-Clouds (with Path Compression)
+    #
+    # CloudRootDict[NodeIndex] -> Parent of Node
+    #-----------------------------------------------------------------------
+    def __GetCloudRoot(self,CloudRootDict,NodeIndex):
+
+        CloudRoot = NodeIndex
+
+        while CloudRootDict[CloudRoot] != CloudRoot:
+            CloudRoot = CloudRootDict[CloudRoot]
+
+        while CloudRootDict[NodeIndex] != CloudRoot:
+            (CloudRootDict[NodeIndex],NodeIndex) = (CloudRoot,CloudRootDict[NodeIndex])
+
+        return CloudRoot
+
+
+
+    #-----------------------------------------------------------------------
+    # private function "__GetNumpyCloudGroups"
+    #
+    #   Label of every Node is lowered to the smallest Label of its Neighbours
+    #   (on Roots), followed by Pointer Jumping until all Labels are Roots.
+    #
+    # -> CloudGroupArray[NodeIndex] -> smallest Index in Mesh-Cloud
+    #-----------------------------------------------------------------------
+    def __GetNumpyCloudGroups(self):
+
+        CloudGroupArray = numpy.arange(len(self.NodeList),dtype=numpy.int64)
+        Sources = numpy.repeat(CloudGroupArray,numpy.diff(self.Offsets))
+
+        while True:
+            SourceGroups = CloudGroupArray[Sources]
+            TargetGroups = CloudGroupArray[self.Targets]
+            DiffMask = SourceGroups != TargetGroups
+
+            if not DiffMask.any():
+                break
+
+            MinGroups = numpy.minimum(SourceGroups[DiffMask],TargetGroups[DiffMask])
+            numpy.minimum.at(CloudGroupArray,SourceGroups[DiffMask],MinGroups)
+            numpy.minimum.at(CloudGroupArray,TargetGroups[DiffMask],MinGroups)
+
+            while True:
+                NextGroups = CloudGroupArray[CloudGroupArray]
+
+                if numpy.array_equal(NextGroups,CloudGroupArray):
+                    break
+
+                CloudGroupArray = NextGroups
+
+        return CloudGroupArray
+
+
+
+    #==============================================================================
+    # Method "GetNeighbours"
+    #
+    #   Indices of Neighbours of Node
+    #
+    #==============================================================================
+    def GetNeighbours(self,NodeIndex):
+
+        return self.__TargetList[self.__OffsetList[NodeIndex]:self.__OffsetList[NodeIndex+1]]
+
+
+
+    #==============================================================================
+    # Method "GetNeighbourHash"
+    #
+    #   Hash of sorted Main MACs of the Neighbours of Node
+    #
+    #==============================================================================
+    def GetNeighbourHash(self,NodeIndex):
+
+        NeighbourList = sorted([ self.NodeList[NeighbourIndex] for NeighbourIndex in self.GetNeighbours(NodeIndex) ])
+        return hashlib.md5(' '.join(NeighbourList).encode('utf-8')).hexdigest()
+
+
+
+    #==============================================================================
+    # Method "GetTouchedNodes"
+    #
+    #   Changed Nodes and all Nodes connected to them by an Edge (both Directions)
+    #
+    #==============================================================================
+    def GetTouchedNodes(self,ChangedIndexSet):
+
+        TouchedIndexSet = set(ChangedIndexSet)
+
+        if len(ChangedIndexSet) > 0:
+            if numpy is not None:
+                ChangedMask = numpy.zeros(len(self.NodeList),dtype=bool)
+                ChangedMask[list(ChangedIndexSet)] = True
+                Sources = numpy.repeat(numpy.arange(len(self.NodeList),dtype=numpy.int64),numpy.diff(self.Offsets))
+                EdgeMask = ChangedMask[Sources] | ChangedMask[self.Targets]
+
+                TouchedIndexSet.update(Sources[EdgeMask].tolist())
+                TouchedIndexSet.update(self.Targets[EdgeMask].tolist())
+            else:
+                for NodeIndex in range(len(self.NodeList)):
+                    for NeighbourIndex in self.GetNeighbours(NodeIndex):
+                        if NodeIndex in ChangedIndexSet or NeighbourIndex in ChangedIndexSet:
+                            TouchedIndexSet.add(NodeIndex)
+                            TouchedIndexSet.add(NeighbourIndex)
+
+        return TouchedIndexSet
+
+
+
+    #==============================================================================
+    # Method "JoinNodes"
+    #
+    #   Join Nodes with their Neighbours in Union-Find
+    #
+    # -> CloudGroupDict[NodeIndex] -> smallest Index in Mesh-Cloud,
+    #    None if a Neighbour is not in NodeIndexList
+    #==============================================================================
+    def JoinNodes(self,NodeIndexList):
+
+        CloudRootDict = {}    # NodeIndex -> Parent in Union-Find
+
+        for NodeIndex in NodeIndexList:
+            CloudRootDict[NodeIndex] = NodeIndex
+
+        for NodeIndex in NodeIndexList:
+            for NeighbourIndex in self.GetNeighbours(NodeIndex):
+                if NeighbourIndex not in CloudRootDict:
+                    return None    # Neighbour outside of NodeIndexList
+
+                CloudRoot     = self.__GetCloudRoot(CloudRootDict,NodeIndex)
+                NeighbourRoot = self.__GetCloudRoot(CloudRootDict,NeighbourIndex)
+
+                if CloudRoot < NeighbourRoot:
+                    CloudRootDict[NeighbourRoot] = CloudRoot
+                elif NeighbourRoot < CloudRoot:
+                    CloudRootDict[CloudRoot] = NeighbourRoot
+
+        return { NodeIndex:self.__GetCloudRoot(CloudRootDict,NodeIndex) for NodeIndex in NodeIndexList }
+
+
+
+    #==============================================================================
+    # Method "GetCloudGroups"
+    #
+    #   Mesh-Clouds of all Nodes
+    #
+    # -> CloudGroupList[NodeIndex] -> smallest Index in Mesh-Cloud
+    #==============================================================================
+    def GetCloudGroups(self):
+
+        if numpy is not None:
+            CloudGroupList = self.__GetNumpyCloudGroups().tolist()
+        else:
+            CloudGroupDict = self.JoinNodes(range(len(self.NodeList)))
+            CloudGroupList = [ CloudGroupDict[NodeIndex] for NodeIndex in range(len(self.NodeList)) ]
+
+        return CloudGroupList
@@ -10,6 +10,7 @@
 #  Needed Python Classes:                                                                 #
 #                                                                                         #
 #      class_ffNodeInfo     -> Node Names and Information                                 #
+#      class_ffMeshGraph    -> Compact Graph of the Mesh-Network (CSR)                    #
 #      class_ffGatewayInfo  -> Keys and Segment Information                               #
 #                                                                                         #
 ###########################################################################################
@@ -44,9 +45,13 @@ import time
 import datetime
 import fcntl
 import re
+import json
+
+from concurrent.futures import ThreadPoolExecutor
 
 from class_ffNodeInfo import *
 from class_ffGatewayInfo import *
+from class_ffMeshGraph import *
 
 
 
@@ -55,8 +60,10 @@ from class_ffGatewayInfo import *
 #-------------------------------------------------------------
 
 StatFileName   = 'SegStatistics.json'
+CloudStateName = 'MeshCloudState.json'    # Mesh-Clouds of last Run with Hash of Neighbours per Node
 
 MaxStatisticsData  = 12 * 24 * 7    # 1 Week wit Data all 5 Minutes
+MaxCloudWorkers    = 8               # Mesh-Clouds evaluated in parallel (Batman Traceroutes)
 
 NODETYPE_UNKNOWN       = 0
 NODETYPE_LEGACY        = 1
@@ -71,15 +78,21 @@ class ffMeshNet:
     #==========================================================================
     # Constructor
     #==========================================================================
-    def __init__(self,NodeInfos,GwInfos):
+    def __init__(self,NodeInfos,GwInfos,DatabasePath=None):
 
         # public Attributes
         self.Alerts          = []       # List of  Alert-Messages
         self.AnalyseOnly     = False    # Blocking active Actions due to inkonsistent Data
+        self.VerifyClouds    = False    # Check incremental Mesh-Clouds against full Calculation
 
         # private Attributes
         self.__NodeInfos = NodeInfos
         self.__GwInfos   = GwInfos
+        self.__DatabasePath = DatabasePath
+
+        self.__CloudStateDict = None    # Mesh-Clouds of last Run: ffNodeMAC -> [ CloudID,NeighbourHash ]
+        self.__NodeHashDict   = {}      # Hash of Neighbours of active Nodes in this Run
+        self.__MeshGraph      = None    # Compact Graph of active Nodes with their Neighbours
 
         self.__MeshCloudDict  = {}      # Dictionary of Mesh-Clouds with List of Member-Nodes
         self.__SegmentDict    = {}      # Segment Data: { 'Nodes','Clients','Uplinks' }
@@ -87,6 +100,7 @@ class ffMeshNet:
 
         # Initializations
         self.__CheckConsistency()
+        self.__LoadCloudState()
 
         return
 
@@ -107,52 +121,112 @@ class ffMeshNet:
 
 
     #-----------------------------------------------------------------------
-    # private function "__AddNeighbour2Cloud"
+    # private function "__LoadCloudState"
     #
-    #   Add Nodes to Mesh-Cloud-List (recursive)
+    #   Load Mesh-Clouds of last Run
     #
-    # MeshCloudDict[CloudID] -> List of Nodes in Mesh-Cloud
     #-----------------------------------------------------------------------
-    def __AddNeighbour2Cloud(self,CloudID,ffNeighbourMAC):
+    def __LoadCloudState(self):
 
-        if self.__NodeInfos.ffNodeDict[ffNeighbourMAC]['Status'] != '?' and ffNeighbourMAC not in self.__MeshCloudDict[CloudID]['CloudMembers']:
+        if self.__DatabasePath is not None:
+            try:
+                with open(os.path.join(self.__DatabasePath,CloudStateName), mode='r') as CloudStateFile:
+                    self.__CloudStateDict = json.load(CloudStateFile)['Nodes']
+            except:
+                print('++ No Mesh-Clouds of last Run available.')
+                self.__CloudStateDict = None
 
-            if self.__NodeInfos.ffNodeDict[ffNeighbourMAC]['InCloud'] is None:
-                self.__MeshCloudDict[CloudID]['NumClients'] += self.__NodeInfos.ffNodeDict[ffNeighbourMAC]['Clients']
-                self.__MeshCloudDict[CloudID]['CloudMembers'].append(ffNeighbourMAC)
-                self.__NodeInfos.ffNodeDict[ffNeighbourMAC]['InCloud'] = CloudID
+        return
 
-                if self.__NodeInfos.ffNodeDict[ffNeighbourMAC]['GluonType'] < self.__MeshCloudDict[CloudID]['GluonType'] and self.__NodeInfos.ffNodeDict[ffNeighbourMAC]['Status'] == 'V':
-                    self.__MeshCloudDict[CloudID]['GluonType'] = self.__NodeInfos.ffNodeDict[ffNeighbourMAC]['GluonType']
-#                    if self.__NodeInfos.ffNodeDict[ffNeighbourMAC]['GluonType'] < NODETYPE_DNS_SEGASSIGN:
-#                        print('>>> GluonType:',ffNeighbourMAC,'=',self.__NodeInfos.ffNodeDict[ffNeighbourMAC]['Name'])
 
-                for MeshMAC in self.__NodeInfos.ffNodeDict[ffNeighbourMAC]['Neighbours']:
-                    if MeshMAC in self.__NodeInfos.MAC2NodeIDDict:
-#                        print('+',Cloud,MAC2NodeIDDict[MeshMAC])
-                        self.__AddNeighbour2Cloud(CloudID,self.__NodeInfos.MAC2NodeIDDict[MeshMAC])
-                    else:
-                        print('!! Unknown Neighbour:',self.__NodeInfos.ffNodeDict[ffNeighbourMAC]['Segment'],'-',ffNeighbourMAC,'= \''+self.__NodeInfos.ffNodeDict[ffNeighbourMAC]['Name']+'\' ->',MeshMAC)
-            elif self.__NodeInfos.ffNodeDict[ffNeighbourMAC]['InCloud'] == CloudID:
-                print('!! Cloud inconsistent:',CloudID,'-',ffNeighbourMAC,'= \''+self.__NodeInfos.ffNodeDict[ffNeighbourMAC]['Name']+'\' ->',self.__MeshCloudDict[CloudID]['CloudMembers'])
+
+    #-----------------------------------------------------------------------
+    # private function "__UpdateCloudGroups"
+    #
+    #   Mesh-Clouds of last Run are only calculated again if they contain
+    #   Nodes with changed Neighbours or Status or are touched by them.
+    #
+    # -> CloudGroupList[NodeIndex] -> Index of a Node in the Mesh-Cloud,
+    #    None if incremental Update is not possible
+    #-----------------------------------------------------------------------
+    def __UpdateCloudGroups(self):
+
+        OldCloudDict = {}    # CloudID of last Run -> Nodes
+
+        for ffNodeMAC in self.__CloudStateDict:
+            if self.__CloudStateDict[ffNodeMAC][0] is not None:
+                if self.__CloudStateDict[ffNodeMAC][0] not in OldCloudDict:
+                    OldCloudDict[self.__CloudStateDict[ffNodeMAC][0]] = [ ffNodeMAC ]
+                else:
+                    OldCloudDict[self.__CloudStateDict[ffNodeMAC][0]].append(ffNodeMAC)
+
+        #---------- Nodes with changed Neighbours or Status ----------
+        ChangedNodes = set()
+
+        for ffNodeMAC in self.__MeshGraph.NodeList:
+            if ffNodeMAC not in self.__CloudStateDict or self.__CloudStateDict[ffNodeMAC][1] != self.__NodeHashDict[ffNodeMAC]:
+                ChangedNodes.add(ffNodeMAC)
+
+        for ffNodeMAC in self.__CloudStateDict:
+            if ffNodeMAC not in self.__MeshGraph.NodeIndexDict:
+                ChangedNodes.add(ffNodeMAC)
+
+        #---------- touched Nodes and their Mesh-Clouds of last Run ----------
+        ChangedIndexSet = set([ self.__MeshGraph.NodeIndexDict[ffNodeMAC] for ffNodeMAC in ChangedNodes if ffNodeMAC in self.__MeshGraph.NodeIndexDict ])
+        TouchedNodes = set(ChangedNodes)
+
+        for NodeIndex in self.__MeshGraph.GetTouchedNodes(ChangedIndexSet):
+            TouchedNodes.add(self.__MeshGraph.NodeList[NodeIndex])
+
+        UpdateNodes = set()
+
+        for ffNodeMAC in TouchedNodes:
+            if ffNodeMAC in self.__CloudStateDict and self.__CloudStateDict[ffNodeMAC][0] is not None:
+                UpdateNodes.update(OldCloudDict[self.__CloudStateDict[ffNodeMAC][0]])
             else:
-                # Node is already part of another Mesh Cloud -> merge Clouds
-                oldCloudID = self.__NodeInfos.ffNodeDict[ffNeighbourMAC]['InCloud']
-    #            print('++ Merging Clouds:',ffNeighbourMAC,'= \''+ffNodeDict[ffNeighbourMAC]['Name']+'\'',oldCloudID,'->',CloudID)
+                UpdateNodes.add(ffNodeMAC)
 
-                self.__MeshCloudDict[CloudID]['NumClients']   += self.__MeshCloudDict[oldCloudID]['NumClients']
-                self.__MeshCloudDict[CloudID]['CloudMembers'] += self.__MeshCloudDict[oldCloudID]['CloudMembers']
+        UpdateList = sorted([ self.__MeshGraph.NodeIndexDict[ffNodeMAC] for ffNodeMAC in UpdateNodes if ffNodeMAC in self.__MeshGraph.NodeIndexDict ])
+        CloudGroupDict = self.__MeshGraph.JoinNodes(UpdateList)
 
-                if self.__MeshCloudDict[oldCloudID]['GluonType'] < self.__MeshCloudDict[CloudID]['GluonType']:
-                    self.__MeshCloudDict[CloudID]['GluonType'] = self.__MeshCloudDict[oldCloudID]['GluonType']
+        if CloudGroupDict is None:
+            print('++ Incremental Update of Mesh-Clouds not possible.')
+            CloudGroupList = None
+        else:
+            print('... Mesh-Clouds updated: %d changed Nodes / %d of %d Nodes calculated' % (len(ChangedNodes),len(UpdateList),len(self.__MeshGraph.NodeList)))
+            CloudGroupList = []
 
-                for ffNodeMAC in self.__NodeInfos.ffNodeDict.keys():
-                    if self.__NodeInfos.ffNodeDict[ffNodeMAC]['InCloud'] == oldCloudID:
-                        self.__NodeInfos.ffNodeDict[ffNodeMAC]['InCloud'] = CloudID
+            for NodeIndex in range(len(self.__MeshGraph.NodeList)):
+                ffNodeMAC = self.__MeshGraph.NodeList[NodeIndex]
 
-                del self.__MeshCloudDict[oldCloudID]
+                if NodeIndex in CloudGroupDict:
+                    CloudGroupList.append(CloudGroupDict[NodeIndex])
+                elif self.__CloudStateDict[ffNodeMAC][0] is None:
+                    CloudGroupList.append(NodeIndex)
+                else:
+                    CloudGroupList.append(self.__MeshGraph.NodeIndexDict[self.__CloudStateDict[ffNodeMAC][0]])
 
-        return
+        return CloudGroupList
+
+
+
+    #-----------------------------------------------------------------------
+    # private function "__GetCloudPartition"
+    #
+    #   Mesh-Clouds with at least 2 Nodes as Sets of Nodes
+    #
+    #-----------------------------------------------------------------------
+    def __GetCloudPartition(self,CloudGroupList):
+
+        CloudNodesDict = {}
+
+        for NodeIndex in range(len(CloudGroupList)):
+            if CloudGroupList[NodeIndex] not in CloudNodesDict:
+                CloudNodesDict[CloudGroupList[NodeIndex]] = set()
+
+            CloudNodesDict[CloudGroupList[NodeIndex]].add(NodeIndex)
+
+        return set([ frozenset(CloudNodes) for CloudNodes in CloudNodesDict.values() if len(CloudNodes) > 1 ])
 
 
 
@@ -161,6 +235,9 @@ class ffMeshNet:
     #
     #   Create Mesh-Cloud-List
     #
+    # Nodes connected by Neighbours are grouped on the Mesh-Graph, CloudID is
+    # the first Node of the Mesh-Cloud in ffNodeDict.
+    #
     # MeshCloudDict[CloudID] -> List of Nodes in Mesh-Cloud
     #-----------------------------------------------------------------------
     def __CreateMeshCloudList(self):
@@ -169,9 +246,49 @@ class ffMeshNet:
         TotalNodes = 0
         TotalClients = 0
 
-        for ffNodeMAC in self.__NodeInfos.ffNodeDict.keys():
-            if ((self.__NodeInfos.ffNodeDict[ffNodeMAC]['Status'] != '?' and self.__NodeInfos.ffNodeDict[ffNodeMAC]['InCloud'] is None) and
-                (len(self.__NodeInfos.ffNodeDict[ffNodeMAC]['Neighbours']) > 0)):
+        self.__MeshGraph = ffMeshGraph(self.__NodeInfos)
+        self.__NodeHashDict = {}
+
+        for [ffNodeMAC,MeshMAC] in self.__MeshGraph.UnknownList:
+            print('!! Unknown Neighbour:',self.__NodeInfos.ffNodeDict[ffNodeMAC].Segment,'-',ffNodeMAC,'= \''+self.__NodeInfos.ffNodeDict[ffNodeMAC].Name+'\' ->',IntToMac(MeshMAC))
+
+        for NodeIndex in range(len(self.__MeshGraph.NodeList)):
+            self.__NodeHashDict[self.__MeshGraph.NodeList[NodeIndex]] = self.__MeshGraph.GetNeighbourHash(NodeIndex)
+
+        CloudGroupList = None
+
+        if self.__CloudStateDict is not None:
+            CloudGroupList = self.__UpdateCloudGroups()
+
+        if CloudGroupList is None or self.VerifyClouds:
+            FullGroupList = self.__MeshGraph.GetCloudGroups()
+
+            if CloudGroupList is not None:
+                if self.__GetCloudPartition(CloudGroupList) != self.__GetCloudPartition(FullGroupList):
+                    self.__alert('!! Incremental Mesh-Clouds differ from full Calculation !!')
+                else:
+                    print('... Incremental Mesh-Clouds verified.')
+
+            CloudGroupList = FullGroupList
+
+        #---------- collecting Nodes of Mesh-Clouds ----------
+        CloudSizeList  = [ 0 ] * len(CloudGroupList)    # Group -> Number of Nodes
+        GroupCloudDict = {}                             # Group -> CloudID
+
+        for CloudGroup in CloudGroupList:
+            CloudSizeList[CloudGroup] += 1
+
+        for NodeIndex in range(len(self.__MeshGraph.NodeList)):
+            ffNodeMAC  = self.__MeshGraph.NodeList[NodeIndex]
+            CloudGroup = CloudGroupList[NodeIndex]
+
+            if CloudSizeList[CloudGroup] < 2:
+                if len(self.__NodeInfos.ffNodeDict[ffNodeMAC].Neighbours) > 0:
+                    print('++ Single-Node Cloud:',self.__NodeInfos.ffNodeDict[ffNodeMAC].Segment,'-',ffNodeMAC,'= \''+self.__NodeInfos.ffNodeDict[ffNodeMAC].Name+'\'')
+                continue
+
+            if CloudGroup not in GroupCloudDict:
+                GroupCloudDict[CloudGroup] = ffNodeMAC
 
                 self.__MeshCloudDict[ffNodeMAC] = {
                     'NumClients': 0,
@@ -180,15 +297,16 @@ class ffMeshNet:
                     'CloudSegment': None
                 }
 
-                self.__AddNeighbour2Cloud(ffNodeMAC,ffNodeMAC)
+            CloudID = GroupCloudDict[CloudGroup]
+            self.__MeshCloudDict[CloudID]['NumClients'] += self.__NodeInfos.ffNodeDict[ffNodeMAC].Clients
+            self.__MeshCloudDict[CloudID]['CloudMembers'].append(ffNodeMAC)
+            self.__NodeInfos.ffNodeDict[ffNodeMAC].InCloud = CloudID
 
-                if len(self.__MeshCloudDict[ffNodeMAC]['CloudMembers']) < 2:
-                    print('++ Single-Node Cloud:',self.__NodeInfos.ffNodeDict[ffNodeMAC]['Segment'],'-',ffNodeMAC,'= \''+self.__NodeInfos.ffNodeDict[ffNodeMAC]['Name']+'\'')
-                    self.__NodeInfos.ffNodeDict[ffNodeMAC]['InCloud'] = None
-                    del self.__MeshCloudDict[ffNodeMAC]
-                else:
-                    TotalNodes   += len(self.__MeshCloudDict[ffNodeMAC]['CloudMembers'])
-                    TotalClients += self.__MeshCloudDict[ffNodeMAC]['NumClients']
+            if self.__NodeInfos.ffNodeDict[ffNodeMAC].GluonType < self.__MeshCloudDict[CloudID]['GluonType'] and self.__NodeInfos.ffNodeDict[ffNodeMAC].Status == 'V':
+                self.__MeshCloudDict[CloudID]['GluonType'] = self.__NodeInfos.ffNodeDict[ffNodeMAC].GluonType
+
+            TotalNodes   += 1
+            TotalClients += self.__NodeInfos.ffNodeDict[ffNodeMAC].Clients
 
         print('... Number of Clouds / Nodes / Clients:',len(self.__MeshCloudDict),'/',TotalNodes,'/',TotalClients)
         print()
@@ -205,17 +323,17 @@ class ffMeshNet:
     def __MarkNodesInCloudForMove(self,CloudID,TargetSeg):
 
         for ffNodeMAC in self.__MeshCloudDict[CloudID]['CloudMembers']:
-            if self.__NodeInfos.ffNodeDict[ffNodeMAC]['KeyDir'] != '':
-                if int(self.__NodeInfos.ffNodeDict[ffNodeMAC]['KeyDir'][3:]) != TargetSeg:
+            if self.__NodeInfos.ffNodeDict[ffNodeMAC].KeyDir != '':
+                if int(self.__NodeInfos.ffNodeDict[ffNodeMAC].KeyDir[3:]) != TargetSeg:
                     if ffNodeMAC in self.__NodeMoveDict:
                         print('!! Multiple Move:',ffNodeMAC,'->',TargetSeg)
 
                     if TargetSeg == 0:
-                        print('!! No move to Legacy: %s/peers/%s\n' % (self.__NodeInfos.ffNodeDict[ffNodeMAC]['KeyDir'],self.__NodeInfos.ffNodeDict[ffNodeMAC]['KeyFile']) )
+                        print('!! No move to Legacy: %s/peers/%s\n' % (self.__NodeInfos.ffNodeDict[ffNodeMAC].KeyDir,self.__NodeInfos.ffNodeDict[ffNodeMAC].KeyFile) )
                     else:
                         self.__NodeMoveDict[ffNodeMAC] = TargetSeg
-                        print('>> git mv %s/peers/%s vpn%02d/peers/  = \'%s\'\n' % ( self.__NodeInfos.ffNodeDict[ffNodeMAC]['KeyDir'],self.__NodeInfos.ffNodeDict[ffNodeMAC]['KeyFile'],
-                                                                                 TargetSeg,self.__NodeInfos.ffNodeDict[ffNodeMAC]['Name'] ))
+                        print('>> git mv %s/peers/%s vpn%02d/peers/  = \'%s\'\n' % ( self.__NodeInfos.ffNodeDict[ffNodeMAC].KeyDir,self.__NodeInfos.ffNodeDict[ffNodeMAC].KeyFile,
+                                                                                 TargetSeg,self.__NodeInfos.ffNodeDict[ffNodeMAC].Name ))
 
         return
 
@@ -226,8 +344,9 @@ class ffMeshNet:
     #
     #   Get common Segment of Nodes in Mesh Cloud
     #
+    # Alerts and Messages are appended to ActionList of the Mesh-Cloud.
     #-----------------------------------------------------------------------
-    def __GetCloudSegment(self,DesiredSegDict,FixedSegDict):
+    def __GetCloudSegment(self,DesiredSegDict,FixedSegDict,ActionList):
 
         SegUptime = {}
         SegWeightDict = {}
@@ -244,15 +363,15 @@ class ffMeshNet:
                         elif Segment != TargetSeg:
                             MultiFixSegment = True
 
-                            if self.__NodeInfos.ffNodeDict[ffNodeMAC]['Status'] == 'V':
-                                self.__alert('!! SHORTCUT with fixed Nodes in multiple Segments !!')
+                            if self.__NodeInfos.ffNodeDict[ffNodeMAC].Status == 'V':
+                                ActionList.append([ 'alert','!! SHORTCUT with fixed Nodes in multiple Segments !!' ])
                                 TargetSeg = None
 
             if MultiFixSegment:
-                self.__alert('!! ALARM - Multiple Segments with fixed Nodes!')
+                ActionList.append([ 'alert','!! ALARM - Multiple Segments with fixed Nodes!' ])
 
             for Segment in FixedSegDict:
-                print('   Seg.',Segment,'-> ',FixedSegDict[Segment])
+                ActionList.append([ 'print',('   Seg.',Segment,'-> ',FixedSegDict[Segment]) ])
 
         elif TargetSeg is None:
             TargetSeg = 0    # Default = keep current segment
@@ -262,13 +381,13 @@ class ffMeshNet:
                 SegWeightDict[Segment] = 0
 
                 for ffNodeMAC in DesiredSegDict[Segment]:
-                    if Segment <= 8 or self.__NodeInfos.ffNodeDict[ffNodeMAC]['GluonType'] >= NODETYPE_DNS_SEGASSIGN:
-                        if self.__NodeInfos.ffNodeDict[ffNodeMAC]['Uptime'] > SegUptime[Segment]:
-                            SegUptime[Segment] = self.__NodeInfos.ffNodeDict[ffNodeMAC]['Uptime']
+                    if Segment <= 8 or self.__NodeInfos.ffNodeDict[ffNodeMAC].GluonType >= NODETYPE_DNS_SEGASSIGN:
+                        if self.__NodeInfos.ffNodeDict[ffNodeMAC].Uptime > SegUptime[Segment]:
+                            SegUptime[Segment] = self.__NodeInfos.ffNodeDict[ffNodeMAC].Uptime
 
-                        if self.__NodeInfos.ffNodeDict[ffNodeMAC]['SegMode'][:6] == 'manual':
+                        if self.__NodeInfos.ffNodeDict[ffNodeMAC].SegMode[:6] == 'manual':
                             SegWeightDict[Segment] += 10
-                        elif self.__NodeInfos.ffNodeDict[ffNodeMAC]['KeyDir'][:3] == 'vpn':
+                        elif self.__NodeInfos.ffNodeDict[ffNodeMAC].KeyDir[:3] == 'vpn':
                             SegWeightDict[Segment] += 4
                         else:
                             SegWeightDict[Segment] += 1
@@ -283,88 +402,137 @@ class ffMeshNet:
 
 
     #-----------------------------------------------------------------------
-    # private function "__CheckMeshClouds"
+    # private function "__EvaluateMeshCloud"
     #
-    #   Analysing Mesh Clouds for Segment Shortcuts
+    #   Analysing one Mesh Cloud for Segment Shortcuts (runs in Worker Pool)
+    #
+    # Nothing outside of the Mesh-Cloud is changed here, Alerts, Messages and
+    # Moves are returned in ActionList to be merged in fixed Order:
+    #
+    #   [ 'print',(Arguments) ] / [ 'alert',Message ] / [ 'move',TargetSeg ]
     #
+    # -> CloudResult = { 'CloudSegment','AnalyseOnly','ActionList' }
     #-----------------------------------------------------------------------
-    def __CheckMeshClouds(self):
+    def __EvaluateMeshCloud(self,CloudID):
 
-        print('Checking Mesh-Clouds ...')
+        CloudResult = { 'CloudSegment':None, 'AnalyseOnly':False, 'ActionList':[] }
+        ActionList = CloudResult['ActionList']
 
-        for CloudID in self.__MeshCloudDict:
-            DesiredSegDict = {}    # desired segments with number of nodes
-            FixedSegDict   = {}    # segments with fixed nodes
-            UplinkSegList  = []    # segments of uplink-nodes
-            ActiveSegList  = []    # really used segments
-            isOnline       = False
+        DesiredSegDict = {}    # desired segments with number of nodes
+        FixedSegDict   = {}    # segments with fixed nodes
+        UplinkSegList  = []    # segments of uplink-nodes
+        ActiveSegList  = []    # really used segments
+        isOnline       = False
 
-            #---------- Analysing used segments with their nodes ----------
-            for ffNodeMAC in self.__MeshCloudDict[CloudID]['CloudMembers']:
-                VpnSeg = None
+        #---------- Analysing used segments with their nodes ----------
+        for ffNodeMAC in self.__MeshCloudDict[CloudID]['CloudMembers']:
+            VpnSeg = None
 
-                if self.__NodeInfos.IsOnline(ffNodeMAC):
-                    isOnline = True
+            if self.__NodeInfos.IsOnline(ffNodeMAC):
+                isOnline = True
 
-                    if self.__NodeInfos.ffNodeDict[ffNodeMAC]['Segment'] not in ActiveSegList:
-                        ActiveSegList.append(self.__NodeInfos.ffNodeDict[ffNodeMAC]['Segment'])
+                if self.__NodeInfos.ffNodeDict[ffNodeMAC].Segment not in ActiveSegList:
+                    ActiveSegList.append(self.__NodeInfos.ffNodeDict[ffNodeMAC].Segment)
 
-                    if self.__NodeInfos.ffNodeDict[ffNodeMAC]['Status'] == 'V' and self.__NodeInfos.ffNodeDict[ffNodeMAC]['KeyDir'][:3] == 'vpn':
-                        VpnSeg = int(self.__NodeInfos.ffNodeDict[ffNodeMAC]['KeyDir'][3:])
+                if self.__NodeInfos.ffNodeDict[ffNodeMAC].Status == 'V' and self.__NodeInfos.ffNodeDict[ffNodeMAC].KeyDir[:3] == 'vpn':
+                    VpnSeg = int(self.__NodeInfos.ffNodeDict[ffNodeMAC].KeyDir[3:])
 
-                        if VpnSeg not in UplinkSegList:
-                            UplinkSegList.append(VpnSeg)
+                    if VpnSeg not in UplinkSegList:
+                        UplinkSegList.append(VpnSeg)
 
-                if self.__NodeInfos.ffNodeDict[ffNodeMAC]['SegMode'][:6] == 'manual' and self.__NodeInfos.ffNodeDict[ffNodeMAC]['KeyDir'][:3] == 'vpn':
-                    self.__NodeInfos.ffNodeDict[ffNodeMAC]['DestSeg'] = int(self.__NodeInfos.ffNodeDict[ffNodeMAC]['KeyDir'][3:])
+            if self.__NodeInfos.ffNodeDict[ffNodeMAC].SegMode[:6] == 'manual' and self.__NodeInfos.ffNodeDict[ffNodeMAC].KeyDir[:3] == 'vpn':
+                self.__NodeInfos.ffNodeDict[ffNodeMAC].DestSeg = int(self.__NodeInfos.ffNodeDict[ffNodeMAC].KeyDir[3:])
 
-                if self.__NodeInfos.ffNodeDict[ffNodeMAC]['DestSeg'] is not None:
-                    if self.__NodeInfos.ffNodeDict[ffNodeMAC]['DestSeg'] not in DesiredSegDict:
-                        DesiredSegDict[self.__NodeInfos.ffNodeDict[ffNodeMAC]['DestSeg']] = [ffNodeMAC]
-                    else:
-                        DesiredSegDict[self.__NodeInfos.ffNodeDict[ffNodeMAC]['DestSeg']].append(ffNodeMAC)
+            if self.__NodeInfos.ffNodeDict[ffNodeMAC].DestSeg is not None:
+                if self.__NodeInfos.ffNodeDict[ffNodeMAC].DestSeg not in DesiredSegDict:
+                    DesiredSegDict[self.__NodeInfos.ffNodeDict[ffNodeMAC].DestSeg] = [ffNodeMAC]
+                else:
+                    DesiredSegDict[self.__NodeInfos.ffNodeDict[ffNodeMAC].DestSeg].append(ffNodeMAC)
 
-                if self.__NodeInfos.ffNodeDict[ffNodeMAC]['SegMode'][:3] == 'fix':  # Node cannot be moved!
-                    if self.__NodeInfos.ffNodeDict[ffNodeMAC]['Segment'] not in FixedSegDict:
-                        FixedSegDict[self.__NodeInfos.ffNodeDict[ffNodeMAC]['Segment']] = [ffNodeMAC]
-                    else:
-                        FixedSegDict[self.__NodeInfos.ffNodeDict[ffNodeMAC]['Segment']].append(ffNodeMAC)
+            if self.__NodeInfos.ffNodeDict[ffNodeMAC].SegMode[:3] == 'fix':  # Node cannot be moved!
+                if self.__NodeInfos.ffNodeDict[ffNodeMAC].Segment not in FixedSegDict:
+                    FixedSegDict[self.__NodeInfos.ffNodeDict[ffNodeMAC].Segment] = [ffNodeMAC]
+                else:
+                    FixedSegDict[self.__NodeInfos.ffNodeDict[ffNodeMAC].Segment].append(ffNodeMAC)
 
-            #---------- Actions depending of situation in cloud ----------
-            CloudSegment = self.__GetCloudSegment(DesiredSegDict,FixedSegDict)
+        #---------- Actions depending of situation in cloud ----------
+        CloudSegment = self.__GetCloudSegment(DesiredSegDict,FixedSegDict,ActionList)
 
-            if len(UplinkSegList) > 1 or CloudSegment is None:
-                self.__alert('!! Shortcut detected !!!')
+        if len(UplinkSegList) > 1 or CloudSegment is None:
+            ActionList.append([ 'alert','!! Shortcut detected !!!' ])
 
-                if CloudSegment is None:
-                    self.__alert('!! Shortcut cannot be corrected !!')
-                    self.AnalyseOnly = True
-                else:
-                    self.__MarkNodesInCloudForMove(CloudID,CloudSegment)
-                    self.__alert('** Shortcut will be corrected ...')
-                    print(self.__MeshCloudDict[CloudID]['CloudMembers'])
-                    print()
+            if CloudSegment is None:
+                ActionList.append([ 'alert','!! Shortcut cannot be corrected !!' ])
+                CloudResult['AnalyseOnly'] = True
+            else:
+                ActionList.append([ 'move',CloudSegment ])
+                ActionList.append([ 'alert','** Shortcut will be corrected ...' ])
+                ActionList.append([ 'print',(self.__MeshCloudDict[CloudID]['CloudMembers'],) ])
+                ActionList.append([ 'print',() ])
 
-            elif len(UplinkSegList) == 0 and isOnline:
-                print('++ Cloud seems to be w/o VPN Uplink(s):',self.__MeshCloudDict[CloudID]['CloudMembers'])
-                CheckSegList = ActiveSegList
+        elif len(UplinkSegList) == 0 and isOnline:
+            ActionList.append([ 'print',('++ Cloud seems to be w/o VPN Uplink(s):',self.__MeshCloudDict[CloudID]['CloudMembers']) ])
+            CheckSegList = ActiveSegList
 
-                for DestSeg in DesiredSegDict:
-                    if DestSeg not in CheckSegList:
-                        CheckSegList.append(DestSeg)
+            for DestSeg in DesiredSegDict:
+                if DestSeg not in CheckSegList:
+                    CheckSegList.append(DestSeg)
 
-                UplinkList = self.__NodeInfos.GetUplinkList(self.__MeshCloudDict[CloudID]['CloudMembers'],CheckSegList)
-                print('>> Uplink(s) found by Batman:',UplinkList)
+            MessageList = []
+            UplinkList = self.__NodeInfos.GetUplinkList(self.__MeshCloudDict[CloudID]['CloudMembers'],CheckSegList,MessageList)
 
-            else:
-                if len(FixedSegDict) > 0:
-                    print('++ Fixed Cloud:',self.__MeshCloudDict[CloudID]['CloudMembers'])
-                elif CloudSegment == 0:
-                    CloudSegment = UplinkSegList[0]    # keep current segment
+            for Message in MessageList:
+                ActionList.append([ 'print',Message ])
+
+            ActionList.append([ 'print',('>> Uplink(s) found by Batman:',UplinkList) ])
+
+        else:
+            if len(FixedSegDict) > 0:
+                ActionList.append([ 'print',('++ Fixed Cloud:',self.__MeshCloudDict[CloudID]['CloudMembers']) ])
+            elif CloudSegment == 0:
+                CloudSegment = UplinkSegList[0]    # keep current segment
+
+            ActionList.append([ 'move',CloudSegment ])    # ensure all Nodes be in the correct segment
 
-                self.__MarkNodesInCloudForMove(CloudID,CloudSegment)    # ensure all Nodes be in the correct segment
+        CloudResult['CloudSegment'] = CloudSegment
+        return CloudResult
 
-            self.__MeshCloudDict[CloudID]['CloudSegment'] = CloudSegment
+
+
+    #-----------------------------------------------------------------------
+    # private function "__CheckMeshClouds"
+    #
+    #   Analysing Mesh Clouds for Segment Shortcuts
+    #
+    # Mesh-Clouds are evaluated in parallel (Batman Traceroutes of Clouds w/o
+    # Uplink are overlapping), Results are merged in Order of MeshCloudDict.
+    #-----------------------------------------------------------------------
+    def __CheckMeshClouds(self):
+
+        print('Checking Mesh-Clouds ...')
+
+        with ThreadPoolExecutor(max_workers=MaxCloudWorkers) as CloudPool:
+            CloudFutureDict = {}
+
+            for CloudID in self.__MeshCloudDict:
+                CloudFutureDict[CloudID] = CloudPool.submit(self.__EvaluateMeshCloud,CloudID)
+
+            #---------- merging Results of Mesh-Clouds ----------
+            for CloudID in self.__MeshCloudDict:
+                CloudResult = CloudFutureDict[CloudID].result()
+
+                for Action in CloudResult['ActionList']:
+                    if Action[0] == 'alert':
+                        self.__alert(Action[1])
+                    elif Action[0] == 'move':
+                        self.__MarkNodesInCloudForMove(CloudID,Action[1])
+                    else:
+                        print(*Action[1])
+
+                if CloudResult['AnalyseOnly']:
+                    self.AnalyseOnly = True
+
+                self.__MeshCloudDict[CloudID]['CloudSegment'] = CloudResult['CloudSegment']
 
         print('... done.\n')
         return
@@ -382,28 +550,28 @@ class ffMeshNet:
         print('Checking Single Nodes ...')
 
         for ffNodeMAC in self.__NodeInfos.ffNodeDict.keys():
-            if ((self.__NodeInfos.ffNodeDict[ffNodeMAC]['InCloud'] is None and self.__NodeInfos.ffNodeDict[ffNodeMAC]['Status'] != '?') and
-                (self.__NodeInfos.ffNodeDict[ffNodeMAC]['KeyDir'][:3] == 'vpn' and self.__NodeInfos.ffNodeDict[ffNodeMAC]['GluonType'] >= NODETYPE_SEGMENT_LIST) and
-                (int(self.__NodeInfos.ffNodeDict[ffNodeMAC]['KeyDir'][3:]) <= 64)):
+            if ((self.__NodeInfos.ffNodeDict[ffNodeMAC].InCloud is None and self.__NodeInfos.ffNodeDict[ffNodeMAC].Status != '?') and
+                (self.__NodeInfos.ffNodeDict[ffNodeMAC].KeyDir[:3] == 'vpn' and self.__NodeInfos.ffNodeDict[ffNodeMAC].GluonType >= NODETYPE_SEGMENT_LIST) and
+                (int(self.__NodeInfos.ffNodeDict[ffNodeMAC].KeyDir[3:]) <= 64)):
 
-                if self.__NodeInfos.ffNodeDict[ffNodeMAC]['SegMode'][:4] == 'auto' or self.__NodeInfos.ffNodeDict[ffNodeMAC]['SegMode'][:4] == 'fix ':
-                    TargetSeg = self.__NodeInfos.ffNodeDict[ffNodeMAC]['DestSeg']
+                if self.__NodeInfos.ffNodeDict[ffNodeMAC].SegMode[:4] == 'auto' or self.__NodeInfos.ffNodeDict[ffNodeMAC].SegMode[:4] == 'fix ':
+                    TargetSeg = self.__NodeInfos.ffNodeDict[ffNodeMAC].DestSeg
 
                     if TargetSeg is not None:
-                        if TargetSeg <= 8 or self.__NodeInfos.ffNodeDict[ffNodeMAC]['GluonType'] >= NODETYPE_DNS_SEGASSIGN:
-                            if int(self.__NodeInfos.ffNodeDict[ffNodeMAC]['KeyDir'][3:]) != TargetSeg:
+                        if TargetSeg <= 8 or self.__NodeInfos.ffNodeDict[ffNodeMAC].GluonType >= NODETYPE_DNS_SEGASSIGN:
+                            if int(self.__NodeInfos.ffNodeDict[ffNodeMAC].KeyDir[3:]) != TargetSeg:
                                 if ffNodeMAC in self.__NodeMoveDict:
                                     print('!! Multiple Move:',ffNodeMAC,'->',TargetSeg)
 
                                 self.__NodeMoveDict[ffNodeMAC] = TargetSeg
-                                print('>> git mv %s/peers/%s vpn%02d/peers/  = \'%s\'' % (self.__NodeInfos.ffNodeDict[ffNodeMAC]['KeyDir'],self.__NodeInfos.ffNodeDict[ffNodeMAC]['KeyFile'],
-                                                                                      TargetSeg,self.__NodeInfos.ffNodeDict[ffNodeMAC]['Name'] ))
+                                print('>> git mv %s/peers/%s vpn%02d/peers/  = \'%s\'' % (self.__NodeInfos.ffNodeDict[ffNodeMAC].KeyDir,self.__NodeInfos.ffNodeDict[ffNodeMAC].KeyFile,
+                                                                                      TargetSeg,self.__NodeInfos.ffNodeDict[ffNodeMAC].Name ))
 
-                if self.__NodeInfos.ffNodeDict[ffNodeMAC]['Status'] == ' ':
-                    print('++ Node seems to be w/o VPN Uplink:',self.__NodeInfos.ffNodeDict[ffNodeMAC]['KeyDir'],'/',ffNodeMAC,'= \''+self.__NodeInfos.ffNodeDict[ffNodeMAC]['Name']+'\'')
+                if self.__NodeInfos.ffNodeDict[ffNodeMAC].Status == ' ':
+                    print('++ Node seems to be w/o VPN Uplink:',self.__NodeInfos.ffNodeDict[ffNodeMAC].KeyDir,'/',ffNodeMAC,'= \''+self.__NodeInfos.ffNodeDict[ffNodeMAC].Name+'\'')
 
-            elif ((self.__NodeInfos.ffNodeDict[ffNodeMAC]['Status'] == '?' and self.__NodeInfos.ffNodeDict[ffNodeMAC]['DestSeg'] == 999) and
-                  (self.__NodeInfos.ffNodeDict[ffNodeMAC]['KeyDir'] != '' and self.__NodeInfos.ffNodeDict[ffNodeMAC]['KeyFile'] != '')):
+            elif ((self.__NodeInfos.ffNodeDict[ffNodeMAC].Status == '?' and self.__NodeInfos.ffNodeDict[ffNodeMAC].DestSeg == 999) and
+                  (self.__NodeInfos.ffNodeDict[ffNodeMAC].KeyDir != '' and self.__NodeInfos.ffNodeDict[ffNodeMAC].KeyFile != '')):
                 self.__NodeMoveDict[ffNodeMAC] = 999    # kill this Node
 
         print('... done.\n')
@@ -421,49 +589,49 @@ class ffMeshNet:
         print('Checking Consistency of Data ...')
 
         for ffNodeMAC in self.__NodeInfos.ffNodeDict.keys():
-            if self.__NodeInfos.ffNodeDict[ffNodeMAC]['Status'] != '?':
+            if self.__NodeInfos.ffNodeDict[ffNodeMAC].Status != '?':
 
-                if self.__NodeInfos.IsOnline(ffNodeMAC) and self.__NodeInfos.ffNodeDict[ffNodeMAC]['Segment'] is None:
-                    print('!! Segment is None:',self.__NodeInfos.ffNodeDict[ffNodeMAC]['Status'],ffNodeMAC,'= \''+self.__NodeInfos.ffNodeDict[ffNodeMAC]['Name']+'\'')
+                if self.__NodeInfos.IsOnline(ffNodeMAC) and self.__NodeInfos.ffNodeDict[ffNodeMAC].Segment is None:
+                    print('!! Segment is None:',self.__NodeInfos.ffNodeDict[ffNodeMAC].Status,ffNodeMAC,'= \''+self.__NodeInfos.ffNodeDict[ffNodeMAC].Name+'\'')
 
-                if self.__NodeInfos.IsOnline(ffNodeMAC) and self.__NodeInfos.ffNodeDict[ffNodeMAC]['KeyDir'] != '' and int(self.__NodeInfos.ffNodeDict[ffNodeMAC]['KeyDir'][3:]) != self.__NodeInfos.ffNodeDict[ffNodeMAC]['Segment']:
-                    print('!! KeyDir <> Segment:',self.__NodeInfos.ffNodeDict[ffNodeMAC]['Status'],ffNodeMAC,'=',self.__NodeInfos.ffNodeDict[ffNodeMAC]['KeyDir'],'<>',self.__NodeInfos.ffNodeDict[ffNodeMAC]['Segment'])
+                if self.__NodeInfos.IsOnline(ffNodeMAC) and self.__NodeInfos.ffNodeDict[ffNodeMAC].KeyDir != '' and int(self.__NodeInfos.ffNodeDict[ffNodeMAC].KeyDir[3:]) != self.__NodeInfos.ffNodeDict[ffNodeMAC].Segment:
+                    print('!! KeyDir <> Segment:',self.__NodeInfos.ffNodeDict[ffNodeMAC].Status,ffNodeMAC,'=',self.__NodeInfos.ffNodeDict[ffNodeMAC].KeyDir,'<>',self.__NodeInfos.ffNodeDict[ffNodeMAC].Segment)
 
-                if self.__NodeInfos.ffNodeDict[ffNodeMAC]['Status'] == 'V' and self.__NodeInfos.ffNodeDict[ffNodeMAC]['KeyDir'] == '':
-                    print('!! Uplink w/o Key:',self.__NodeInfos.ffNodeDict[ffNodeMAC]['Status'],ffNodeMAC,'= \''+self.__NodeInfos.ffNodeDict[ffNodeMAC]['Name']+'\'')
-                    self.__NodeInfos.ffNodeDict[ffNodeMAC]['Status'] = ' '
+                if self.__NodeInfos.ffNodeDict[ffNodeMAC].Status == 'V' and self.__NodeInfos.ffNodeDict[ffNodeMAC].KeyDir == '':
+                    print('!! Uplink w/o Key:',self.__NodeInfos.ffNodeDict[ffNodeMAC].Status,ffNodeMAC,'= \''+self.__NodeInfos.ffNodeDict[ffNodeMAC].Name+'\'')
+                    self.__NodeInfos.ffNodeDict[ffNodeMAC].Status = ' '
 
-                if ((self.__NodeInfos.ffNodeDict[ffNodeMAC]['DestSeg'] is not None and self.__NodeInfos.ffNodeDict[ffNodeMAC]['KeyDir'] != '') and
-                    (self.__NodeInfos.ffNodeDict[ffNodeMAC]['DestSeg'] != int(self.__NodeInfos.ffNodeDict[ffNodeMAC]['KeyDir'][3:]) and self.__NodeInfos.ffNodeDict[ffNodeMAC]['SegMode'] == 'auto')):
-                    print('++ Wrong Segment:    ',self.__NodeInfos.ffNodeDict[ffNodeMAC]['Status'],ffNodeMAC,'=',int(self.__NodeInfos.ffNodeDict[ffNodeMAC]['KeyDir'][3:]),'->',self.__NodeInfos.ffNodeDict[ffNodeMAC]['DestSeg'],self.__NodeInfos.ffNodeDict[ffNodeMAC]['SegMode'])
+                if ((self.__NodeInfos.ffNodeDict[ffNodeMAC].DestSeg is not None and self.__NodeInfos.ffNodeDict[ffNodeMAC].KeyDir != '') and
+                    (self.__NodeInfos.ffNodeDict[ffNodeMAC].DestSeg != int(self.__NodeInfos.ffNodeDict[ffNodeMAC].KeyDir[3:]) and self.__NodeInfos.ffNodeDict[ffNodeMAC].SegMode == 'auto')):
+                    print('++ Wrong Segment:    ',self.__NodeInfos.ffNodeDict[ffNodeMAC].Status,ffNodeMAC,'=',int(self.__NodeInfos.ffNodeDict[ffNodeMAC].KeyDir[3:]),'->',self.__NodeInfos.ffNodeDict[ffNodeMAC].DestSeg,self.__NodeInfos.ffNodeDict[ffNodeMAC].SegMode)
 
-                if self.__NodeInfos.ffNodeDict[ffNodeMAC]['Segment'] is None and self.__NodeInfos.ffNodeDict[ffNodeMAC]['DestSeg'] is not None:
-                    self.__NodeInfos.ffNodeDict[ffNodeMAC]['Segment'] = self.__NodeInfos.ffNodeDict[ffNodeMAC]['DestSeg']
-                elif self.__NodeInfos.ffNodeDict[ffNodeMAC]['Segment'] is None and self.__NodeInfos.ffNodeDict[ffNodeMAC]['KeyDir'] != '':
-                    self.__NodeInfos.ffNodeDict[ffNodeMAC]['Segment'] = int(self.__NodeInfos.ffNodeDict[ffNodeMAC]['KeyDir'][3:])
+                if self.__NodeInfos.ffNodeDict[ffNodeMAC].Segment is None and self.__NodeInfos.ffNodeDict[ffNodeMAC].DestSeg is not None:
+                    self.__NodeInfos.ffNodeDict[ffNodeMAC].Segment = self.__NodeInfos.ffNodeDict[ffNodeMAC].DestSeg
+                elif self.__NodeInfos.ffNodeDict[ffNodeMAC].Segment is None and self.__NodeInfos.ffNodeDict[ffNodeMAC].KeyDir != '':
+                    self.__NodeInfos.ffNodeDict[ffNodeMAC].Segment = int(self.__NodeInfos.ffNodeDict[ffNodeMAC].KeyDir[3:])
 
 
                 #---------- calculate segment statistics ----------
                 if self.__NodeInfos.IsOnline(ffNodeMAC):
-                    ffSeg = self.__NodeInfos.ffNodeDict[ffNodeMAC]['Segment']
+                    ffSeg = self.__NodeInfos.ffNodeDict[ffNodeMAC].Segment
 
                     if ffSeg in self.__GwInfos.Segments():
                         if not ffSeg in self.__SegmentDict:
                             self.__SegmentDict[ffSeg] = { 'Nodes':0, 'Clients':0, 'Uplinks':0 }
 
                         self.__SegmentDict[ffSeg]['Nodes'] += 1
-                        self.__SegmentDict[ffSeg]['Clients'] += self.__NodeInfos.ffNodeDict[ffNodeMAC]['Clients']
+                        self.__SegmentDict[ffSeg]['Clients'] += self.__NodeInfos.ffNodeDict[ffNodeMAC].Clients
 
-                        if self.__NodeInfos.ffNodeDict[ffNodeMAC]['Status'] == 'V':
+                        if self.__NodeInfos.ffNodeDict[ffNodeMAC].Status == 'V':
                             self.__SegmentDict[ffSeg]['Uplinks'] += 1
                     else:
-                        print('>>> Bad Segment:   ',self.__NodeInfos.ffNodeDict[ffNodeMAC]['Status'],ffNodeMAC,'=',ffSeg)
+                        print('>>> Bad Segment:   ',self.__NodeInfos.ffNodeDict[ffNodeMAC].Status,ffNodeMAC,'=',ffSeg)
 
-                    if self.__NodeInfos.ffNodeDict[ffNodeMAC]['KeyFile'] != '':
-                        if self.__NodeInfos.ffNodeDict[ffNodeMAC]['Name'].strip().lower() != self.__GwInfos.FastdKeyDict[self.__NodeInfos.ffNodeDict[ffNodeMAC]['KeyFile']]['PeerName'].strip().lower():
-                            print('++ Hostname Mismatch:',self.__NodeInfos.ffNodeDict[ffNodeMAC]['KeyFile'],'->','\''+self.__NodeInfos.ffNodeDict[ffNodeMAC]['Name']+'\'',
-                                  '<-','\''+self.__GwInfos.FastdKeyDict[self.__NodeInfos.ffNodeDict[ffNodeMAC]['KeyFile']]['PeerName']+'\'')
-                            self.__GwInfos.FastdKeyDict[self.__NodeInfos.ffNodeDict[ffNodeMAC]['KeyFile']]['PeerName'] = self.__NodeInfos.ffNodeDict[ffNodeMAC]['Name']
+                    if self.__NodeInfos.ffNodeDict[ffNodeMAC].KeyFile != '':
+                        if self.__NodeInfos.ffNodeDict[ffNodeMAC].Name.strip().lower() != self.__GwInfos.FastdKeyDict[self.__NodeInfos.ffNodeDict[ffNodeMAC].KeyFile]['PeerName'].strip().lower():
+                            print('++ Hostname Mismatch:',self.__NodeInfos.ffNodeDict[ffNodeMAC].KeyFile,'->','\''+self.__NodeInfos.ffNodeDict[ffNodeMAC].Name+'\'',
+                                  '<-','\''+self.__GwInfos.FastdKeyDict[self.__NodeInfos.ffNodeDict[ffNodeMAC].KeyFile]['PeerName']+'\'')
+                            self.__GwInfos.FastdKeyDict[self.__NodeInfos.ffNodeDict[ffNodeMAC].KeyFile]['PeerName'] = self.__NodeInfos.ffNodeDict[ffNodeMAC].Name
 
         print('... done.\n')
         return
@@ -486,6 +654,29 @@ class ffMeshNet:
 
 
 
+    #==============================================================================
+    # Method "WriteCloudState"
+    #
+    #   Store Mesh-Clouds for incremental Update in next Run
+    #
+    #==============================================================================
+    def WriteCloudState(self):
+
+        if self.__DatabasePath is not None:
+            print('Writing',CloudStateName,'...')
+            CloudStateDict = {}
+
+            for ffNodeMAC in self.__NodeHashDict:
+                CloudStateDict[ffNodeMAC] = [ self.__NodeInfos.ffNodeDict[ffNodeMAC].InCloud,self.__NodeHashDict[ffNodeMAC] ]
+
+            JsonFile = open(os.path.join(self.__DatabasePath,CloudStateName), mode='w+')
+            json.dump({ 'Nodes':CloudStateDict },JsonFile)
+            JsonFile.close()
+
+        return
+
+
+
     #==============================================================================
     # Method "GetMoveDict"
     #
@@ -537,10 +728,10 @@ class ffMeshNet:
             for ffnb in sorted(self.__MeshCloudDict[CloudID]['CloudMembers']):
                 CurrentError = ' '
 
-                if self.__NodeInfos.ffNodeDict[ffnb]['Segment'] is None:
+                if self.__NodeInfos.ffNodeDict[ffnb].Segment is None:
                     Segment = 99
                 else:
-                    Segment = self.__NodeInfos.ffNodeDict[ffnb]['Segment']
+                    Segment = self.__NodeInfos.ffNodeDict[ffnb].Segment
 
                     if CurrentSeg is None:
                         CurrentSeg = Segment
@@ -549,55 +740,55 @@ class ffMeshNet:
                         CurrentError = '!'
 
                     if CurrentRegion is None or CurrentRegion == '??':
-                        CurrentRegion = self.__NodeInfos.ffNodeDict[ffnb]['Region']
-                    elif self.__NodeInfos.ffNodeDict[ffnb]['Region'] != '??' and self.__NodeInfos.ffNodeDict[ffnb]['Region'] != CurrentRegion:
-                        print('++ ERROR Region:',ffnb,'= \''+self.__NodeInfos.ffNodeDict[ffnb]['Name']+'\' ->',self.__NodeInfos.ffNodeDict[ffnb]['Region'],'<>',CurrentRegion)
+                        CurrentRegion = self.__NodeInfos.ffNodeDict[ffnb].Region
+                    elif self.__NodeInfos.ffNodeDict[ffnb].Region != '??' and self.__NodeInfos.ffNodeDict[ffnb].Region != CurrentRegion:
+                        print('++ ERROR Region:',ffnb,'= \''+self.__NodeInfos.ffNodeDict[ffnb].Name+'\' ->',self.__NodeInfos.ffNodeDict[ffnb].Region,'<>',CurrentRegion)
                         CurrentError = '!'
 
                     if CurrentZIP is None:
-                        CurrentZIP = self.__NodeInfos.ffNodeDict[ffnb]['ZIP']
+                        CurrentZIP = self.__NodeInfos.ffNodeDict[ffnb].ZIP
 
-                if CurrentError == ' ' and self.__NodeInfos.ffNodeDict[ffnb]['SegMode'] != 'auto':
+                if CurrentError == ' ' and self.__NodeInfos.ffNodeDict[ffnb].SegMode != 'auto':
                     CurrentError = '+'
 
-                if CurrentError == ' ' and self.__NodeInfos.ffNodeDict[ffnb]['KeyDir'] != '':
-                    if ((self.__NodeInfos.ffNodeDict[ffnb]['Segment'] is not None and int(self.__NodeInfos.ffNodeDict[ffnb]['KeyDir'][3:]) != self.__NodeInfos.ffNodeDict[ffnb]['Segment']) or
-                        (self.__NodeInfos.ffNodeDict[ffnb]['DestSeg'] is not None and self.__NodeInfos.ffNodeDict[ffnb]['DestSeg'] != self.__NodeInfos.ffNodeDict[ffnb]['Segment'])):
-                        print('++ ERROR Region:',self.__NodeInfos.ffNodeDict[ffnb]['Status'],ffnb,'= \''+self.__NodeInfos.ffNodeDict[ffnb]['Name']+'\' ->',
-                              self.__NodeInfos.ffNodeDict[ffnb]['KeyDir'],self.__NodeInfos.ffNodeDict[ffnb]['Segment'],'->',
-                              self.__NodeInfos.ffNodeDict[ffnb]['DestSeg'],self.__NodeInfos.ffNodeDict[ffnb]['SegMode'])
+                if CurrentError == ' ' and self.__NodeInfos.ffNodeDict[ffnb].KeyDir != '':
+                    if ((self.__NodeInfos.ffNodeDict[ffnb].Segment is not None and int(self.__NodeInfos.ffNodeDict[ffnb].KeyDir[3:]) != self.__NodeInfos.ffNodeDict[ffnb].Segment) or
+                        (self.__NodeInfos.ffNodeDict[ffnb].DestSeg is not None and self.__NodeInfos.ffNodeDict[ffnb].DestSeg != self.__NodeInfos.ffNodeDict[ffnb].Segment)):
+                        print('++ ERROR Region:',self.__NodeInfos.ffNodeDict[ffnb].Status,ffnb,'= \''+self.__NodeInfos.ffNodeDict[ffnb].Name+'\' ->',
+                              self.__NodeInfos.ffNodeDict[ffnb].KeyDir,self.__NodeInfos.ffNodeDict[ffnb].Segment,'->',
+                              self.__NodeInfos.ffNodeDict[ffnb].DestSeg,self.__NodeInfos.ffNodeDict[ffnb].SegMode)
                         CurrentError = '>'
 
-                if CurrentVPN is None and self.__NodeInfos.ffNodeDict[ffnb]['KeyDir'] != '':
-                    CurrentVPN = self.__NodeInfos.ffNodeDict[ffnb]['KeyDir']
-                elif CurrentVPN is not None and self.__NodeInfos.ffNodeDict[ffnb]['KeyDir'] != '' and self.__NodeInfos.ffNodeDict[ffnb]['KeyDir'] != CurrentVPN:
-                    print('++ ERROR KeyDir:',self.__NodeInfos.ffNodeDict[ffnb]['Status'],ffnb,'=',CurrentVPN,'<>',self.__NodeInfos.ffNodeDict[ffnb]['KeyDir'])
+                if CurrentVPN is None and self.__NodeInfos.ffNodeDict[ffnb].KeyDir != '':
+                    CurrentVPN = self.__NodeInfos.ffNodeDict[ffnb].KeyDir
+                elif CurrentVPN is not None and self.__NodeInfos.ffNodeDict[ffnb].KeyDir != '' and self.__NodeInfos.ffNodeDict[ffnb].KeyDir != CurrentVPN:
+                    print('++ ERROR KeyDir:',self.__NodeInfos.ffNodeDict[ffnb].Status,ffnb,'=',CurrentVPN,'<>',self.__NodeInfos.ffNodeDict[ffnb].KeyDir)
                     CurrentError = '*'
 
                 if CurrentError == ' ':
-                    CurrentError = GluonMarker[self.__NodeInfos.ffNodeDict[ffnb]['GluonType']]
+                    CurrentError = GluonMarker[self.__NodeInfos.ffNodeDict[ffnb].GluonType]
 
-                NeighborOutFile.write('%s%s Seg.%02d [%3d] %s = %5s - %16s = \'%s\' (%s = %s) UpT = %d\n' % (CurrentError, self.__NodeInfos.ffNodeDict[ffnb]['Status'], Segment,
-                                                                                                self.__NodeInfos.ffNodeDict[ffnb]['Clients'], ffnb, self.__NodeInfos.ffNodeDict[ffnb]['KeyDir'],
-                                                                                                self.__NodeInfos.ffNodeDict[ffnb]['KeyFile'], self.__NodeInfos.ffNodeDict[ffnb]['Name'],
-                                                                                                self.__NodeInfos.ffNodeDict[ffnb]['DestSeg'], self.__NodeInfos.ffNodeDict[ffnb]['Region'],
-                                                                                                self.__NodeInfos.ffNodeDict[ffnb]['Uptime']))
+                NeighborOutFile.write('%s%s Seg.%02d [%3d] %s = %5s - %16s = \'%s\' (%s = %s) UpT = %d\n' % (CurrentError, self.__NodeInfos.ffNodeDict[ffnb].Status, Segment,
+                                                                                                self.__NodeInfos.ffNodeDict[ffnb].Clients, ffnb, self.__NodeInfos.ffNodeDict[ffnb].KeyDir,
+                                                                                                self.__NodeInfos.ffNodeDict[ffnb].KeyFile, self.__NodeInfos.ffNodeDict[ffnb].Name,
+                                                                                                self.__NodeInfos.ffNodeDict[ffnb].DestSeg, self.__NodeInfos.ffNodeDict[ffnb].Region,
+                                                                                                self.__NodeInfos.ffNodeDict[ffnb].Uptime))
                 if self.__NodeInfos.IsOnline(ffnb):
                     TotalNodes   += 1
-                    TotalClients += self.__NodeInfos.ffNodeDict[ffnb]['Clients']
+                    TotalClients += self.__NodeInfos.ffNodeDict[ffnb].Clients
 
-                if self.__NodeInfos.ffNodeDict[ffnb]['Status'] == 'V':
+                if self.__NodeInfos.ffNodeDict[ffnb].Status == 'V':
                     TotalUplinks += 1
 
-                if self.__NodeInfos.ffNodeDict[ffnb]['GluonType'] < NODETYPE_MTU_1340:
+                if self.__NodeInfos.ffNodeDict[ffnb].GluonType < NODETYPE_MTU_1340:
                     OldGluon += 1
 
             NeighborOutFile.write('\n          Total Online-Nodes / Clients / Uplinks = %3d / %3d / %3d   (Seg. %02d)\n' % (TotalNodes,TotalClients,TotalUplinks,CurrentSeg))
 
             for ffnb in self.__MeshCloudDict[CloudID]['CloudMembers']:
-                self.__NodeInfos.ffNodeDict[ffnb]['Segment'] = CurrentSeg
-                self.__NodeInfos.ffNodeDict[ffnb]['Region']  = CurrentRegion
-                self.__NodeInfos.ffNodeDict[ffnb]['ZIP']     = CurrentZIP
+                self.__NodeInfos.ffNodeDict[ffnb].Segment = CurrentSeg
+                self.__NodeInfos.ffNodeDict[ffnb].Region  = CurrentRegion
+                self.__NodeInfos.ffNodeDict[ffnb].ZIP     = CurrentZIP
 
             if CurrentRegion is None:
                 CurrentRegion = '***'
@@ -618,45 +809,45 @@ class ffMeshNet:
         NeighborOutFile.write('Single Nodes:\n\n')
 
         for ffnb in sorted(self.__NodeInfos.ffNodeDict.keys()):
-            if self.__NodeInfos.ffNodeDict[ffnb]['InCloud'] is None and self.__NodeInfos.IsOnline(ffnb) and self.__NodeInfos.ffNodeDict[ffnb]['KeyDir'] != '':
+            if self.__NodeInfos.ffNodeDict[ffnb].InCloud is None and self.__NodeInfos.IsOnline(ffnb) and self.__NodeInfos.ffNodeDict[ffnb].KeyDir != '':
 
                 CurrentError = ' '
 
-                if self.__NodeInfos.ffNodeDict[ffnb]['SegMode'] != 'auto':
+                if self.__NodeInfos.ffNodeDict[ffnb].SegMode != 'auto':
                     CurrentError = '+'
 
-                elif self.__NodeInfos.ffNodeDict[ffnb]['DestSeg'] is not None and self.__NodeInfos.ffNodeDict[ffnb]['DestSeg'] != int(self.__NodeInfos.ffNodeDict[ffnb]['KeyDir'][3:]):
-                    print('++ ERROR Region:',self.__NodeInfos.ffNodeDict[ffnb]['Status'],ffnb,self.__NodeInfos.ffNodeDict[ffnb]['KeyDir'],
-                          self.__NodeInfos.ffNodeDict[ffnb]['Segment'],'->',self.__NodeInfos.ffNodeDict[ffnb]['DestSeg'],self.__NodeInfos.ffNodeDict[ffnb]['SegMode'])
+                elif self.__NodeInfos.ffNodeDict[ffnb].DestSeg is not None and self.__NodeInfos.ffNodeDict[ffnb].DestSeg != int(self.__NodeInfos.ffNodeDict[ffnb].KeyDir[3:]):
+                    print('++ ERROR Region:',self.__NodeInfos.ffNodeDict[ffnb].Status,ffnb,self.__NodeInfos.ffNodeDict[ffnb].KeyDir,
+                          self.__NodeInfos.ffNodeDict[ffnb].Segment,'->',self.__NodeInfos.ffNodeDict[ffnb].DestSeg,self.__NodeInfos.ffNodeDict[ffnb].SegMode)
 
                     CurrentError = '>'
 
-                if self.__NodeInfos.ffNodeDict[ffnb]['Segment'] is None:
+                if self.__NodeInfos.ffNodeDict[ffnb].Segment is None:
                     Segment = 99
                 else:
-                    Segment = self.__NodeInfos.ffNodeDict[ffnb]['Segment']
+                    Segment = self.__NodeInfos.ffNodeDict[ffnb].Segment
 
                 if CurrentError == ' ':
-                    CurrentError = GluonMarker[self.__NodeInfos.ffNodeDict[ffnb]['GluonType']]
+                    CurrentError = GluonMarker[self.__NodeInfos.ffNodeDict[ffnb].GluonType]
 
-                NeighborOutFile.write('%s%s Seg.%02d [%3d] %s = %5s - %16s = \'%s\' (%s = %s) UpT = %d\n' % (CurrentError, self.__NodeInfos.ffNodeDict[ffnb]['Status'],
-                                                                                                Segment,self.__NodeInfos.ffNodeDict[ffnb]['Clients'], ffnb,
-                                                                                                self.__NodeInfos.ffNodeDict[ffnb]['KeyDir'], self.__NodeInfos.ffNodeDict[ffnb]['KeyFile'],
-                                                                                                self.__NodeInfos.ffNodeDict[ffnb]['Name'], self.__NodeInfos.ffNodeDict[ffnb]['DestSeg'],
-                                                                                                self.__NodeInfos.ffNodeDict[ffnb]['Region'], self.__NodeInfos.ffNodeDict[ffnb]['Uptime']))
+                NeighborOutFile.write('%s%s Seg.%02d [%3d] %s = %5s - %16s = \'%s\' (%s = %s) UpT = %d\n' % (CurrentError, self.__NodeInfos.ffNodeDict[ffnb].Status,
+                                                                                                Segment,self.__NodeInfos.ffNodeDict[ffnb].Clients, ffnb,
+                                                                                                self.__NodeInfos.ffNodeDict[ffnb].KeyDir, self.__NodeInfos.ffNodeDict[ffnb].KeyFile,
+                                                                                                self.__NodeInfos.ffNodeDict[ffnb].Name, self.__NodeInfos.ffNodeDict[ffnb].DestSeg,
+                                                                                                self.__NodeInfos.ffNodeDict[ffnb].Region, self.__NodeInfos.ffNodeDict[ffnb].Uptime))
                 TotalNodes   += 1
-                TotalClients += self.__NodeInfos.ffNodeDict[ffnb]['Clients']
+                TotalClients += self.__NodeInfos.ffNodeDict[ffnb].Clients
 
-                Region = self.__NodeInfos.ffNodeDict[ffnb]['Region']
+                Region = self.__NodeInfos.ffNodeDict[ffnb].Region
 
                 if Region not in RegionDict:
-#                    RegionDict[Region] = { 'Nodes':1, 'Clients':self.__NodeInfos.ffNodeDict[ffnb]['Clients'], 'OldGluon':0, 'Segment':self.__NodeInfos.ffNodeDict[ffnb]['DestSeg'] }
-                    RegionDict[Region] = { 'Nodes':1, 'Clients':self.__NodeInfos.ffNodeDict[ffnb]['Clients'], 'OldGluon':0, 'Segment':self.__NodeInfos.ffNodeDict[ffnb]['Segment'] }
+#                    RegionDict[Region] = { 'Nodes':1, 'Clients':self.__NodeInfos.ffNodeDict[ffnb].Clients, 'OldGluon':0, 'Segment':self.__NodeInfos.ffNodeDict[ffnb].DestSeg }
+                    RegionDict[Region] = { 'Nodes':1, 'Clients':self.__NodeInfos.ffNodeDict[ffnb].Clients, 'OldGluon':0, 'Segment':self.__NodeInfos.ffNodeDict[ffnb].Segment }
                 else:
                     RegionDict[Region]['Nodes']   += 1
-                    RegionDict[Region]['Clients'] += self.__NodeInfos.ffNodeDict[ffnb]['Clients']
+                    RegionDict[Region]['Clients'] += self.__NodeInfos.ffNodeDict[ffnb].Clients
 
-                if self.__NodeInfos.ffNodeDict[ffnb]['GluonType'] < NODETYPE_MTU_1340:
+                if self.__NodeInfos.ffNodeDict[ffnb].GluonType < NODETYPE_MTU_1340:
                     RegionDict[Region]['OldGluon'] += 1
 
         print('\nWrite out Statistics ...')
@@ -17,7 +17,8 @@
 #                                                                                         #
 #       regions/<segment>/*.json   -> Polygons of Regions                                 #
 #       database/ZipLocations.json -> Dict. of ZIP-Codes with related GPS-Positions       #
-#       database/ZipGrid.json      -> Dict. of Grids with ZIP-Codes                       #
+#       database/GeoIndex.bin      -> compiled Regions, ZIP-Areas and ZIP-Positions       #
+#       zip-areas/<segment>/*.json -> Polygons of ZIP-Areas                               #
 #                                                                                         #
 ###########################################################################################
 #                                                                                         #
@@ -46,7 +47,6 @@
 ###########################################################################################
 
 import os
-import subprocess
 import socket
 import urllib.request
 import time
@@ -55,10 +55,13 @@ import calendar
 import json
 import re
 import hashlib
+import threading
 
+from concurrent.futures import ThreadPoolExecutor
 from shapely.geometry import Point
-from shapely.geometry.polygon import Polygon
-from glob import glob
+
+from class_ffDataAccess import *
+from class_ffGeoIndex import *
 
 import dns.resolver
 import dns.query
@@ -78,6 +81,9 @@ MaxInactiveTime    = 10 * 86400     # 10 Days (in Seconds)
 MaxOfflineTime     = 30 * 60        # 30 Minutes (in Seconds)
 MaxStatusAge       = 15 * 60        # 15 Minutes (in Seconds)
 
+BatctlTimeout      = 10             # max. Runtime of one batctl Traceroute (in Seconds)
+MaxBatctlWorkers   = 16             # batctl Traceroutes running in parallel
+
 OnlineStates       = [' ','V']      # online, online with VPN-Uplink
 
 FreifunkNodeDomain = 'nodes.freifunk-stuttgart.de'
@@ -86,11 +92,11 @@ NodesDbName    = 'nodesdb.json'
 Alfred158Name  = 'alfred-json-158.json'
 Alfred159Name  = 'alfred-json-159.json'
 Alfred160Name  = 'alfred-json-160.json'
+RawJsonName    = 'raw.json'
 
 NodeDictName   = 'NodeDict.json'      # Node Database
 MacDictName    = 'MacDict.json'       # MAC Translation Dictionary
-Region2ZipName = 'Region2ZIP.json'    # Regions with ZIP Codes of Baden-Wuerttemberg
-Zip2GpsName    = 'ZipLocations.json'  # GPS location of ZIP-Areas based on OpenStreetMap and OpenGeoDB
+GluonMacName   = 'GluonMacDict.json'  # Cache of Gluon MACs derived from Main MAC (old and new Schema)
 ZipGridName    = 'ZipGrid.json'       # Grid of ZIP Codes from Baden-Wuerttemberg
 
 
@@ -125,16 +131,95 @@ NODETYPE_MTU_1340      = 4
 
 
 
+#-------------------------------------------------------------
+# function "MacToInt"
+#
+#   "aa:bb:cc:dd:ee:ff" -> 48-Bit Integer (internal Format)
+#-------------------------------------------------------------
+def MacToInt(MacAdr):
+
+    return int(MacAdr.replace(':',''),16)
+
+
+
+#-------------------------------------------------------------
+# function "IntToMac"
+#
+#   48-Bit Integer -> "aa:bb:cc:dd:ee:ff" (external Format)
+#-------------------------------------------------------------
+def IntToMac(MacInt):
+
+    MacHex = '%012x' % (MacInt)
+    return MacHex[0:2]+':'+MacHex[2:4]+':'+MacHex[4:6]+':'+MacHex[6:8]+':'+MacHex[8:10]+':'+MacHex[10:12]
+
+
+
+
+
+class ffNodeRecord:
+
+    __slots__ = ('RawKey','Name','Status','last_online','Uptime','Clients','Latitude','Longitude','ZIP','Region','DestSeg',
+                 'GluonType','MeshMACs','IPv6','Segment','SegMode','KeyDir','KeyFile','FastdKey','InCloud','Neighbours','Owner','GeoCache')
+
+    #==========================================================================
+    # Constructor
+    #==========================================================================
+    def __init__(self,Name,Status,last_online,RawKey=None,Latitude=None,Longitude=None,ZIP=None,GluonType=NODETYPE_UNKNOWN,
+                 IPv6=None,Segment=None,SegMode='auto',KeyDir='',KeyFile='',FastdKey='',Owner=None):
+
+        self.RawKey      = RawKey
+        self.Name        = Name
+        self.Status      = Status
+        self.last_online = last_online
+        self.Uptime      = 0.0
+        self.Clients     = 0
+        self.Latitude    = Latitude
+        self.Longitude   = Longitude
+        self.ZIP         = ZIP
+        self.Region      = '??'
+        self.DestSeg     = None
+        self.GluonType   = GluonType
+        self.MeshMACs    = []
+        self.IPv6        = IPv6
+        self.Segment     = Segment
+        self.SegMode     = SegMode
+        self.KeyDir      = KeyDir
+        self.KeyFile     = KeyFile
+        self.FastdKey    = FastdKey
+        self.InCloud     = None
+        self.Neighbours  = set()       # MACs as Integer
+        self.Owner       = Owner
+        self.GeoCache    = None        # [ GeoKey,ZIP,Region,DestSeg ] of last Calculation
+        return
+
+
+
+    #==========================================================================
+    # function "ToJson"
+    #
+    #   Dictionary of all Attributes (Layout of NodeDict.json)
+    #
+    #==========================================================================
+    def ToJson(self):
+
+        JsonDict = { Attribute:getattr(self,Attribute) for Attribute in self.__slots__ }
+        JsonDict['Neighbours'] = [ IntToMac(MacInt) for MacInt in sorted(self.Neighbours) ]
+        return JsonDict
+
+
+
+
+
 class ffNodeInfo:
 
     #==========================================================================
     # Constructor
     #==========================================================================
-    def __init__(self,AlfredURL,RawAccess,GitPath,DatabasePath):
+    def __init__(self,AlfredURL,RawAccess,GitPath,DatabasePath,DataAccess):
 
         # public Attributes
-        self.MAC2NodeIDDict = {}       # Dictionary of all Nodes' MAC-Addresses and related Main Address
-        self.ffNodeDict     = {}       # Dictionary of Nodes [MainMAC] with their Name, VPN-Uplink
+        self.MAC2NodeIDDict = {}       # Dictionary of all Nodes' MAC-Addresses (as Integer) and related Main Address
+        self.ffNodeDict     = {}       # Dictionary of Nodes [MainMAC] -> ffNodeRecord with their Name, VPN-Uplink, ...
         self.Alerts         = []       # List of  Alert-Messages
         self.AnalyseOnly    = False    # Locking automatic Actions due to inconsistent Data
 
@@ -143,21 +228,57 @@ class ffNodeInfo:
         self.__RawAccess    = RawAccess
         self.__GitPath      = GitPath
         self.__DatabasePath = DatabasePath
+        self.__DataAccess   = DataAccess     # Access to Webserver with local Cache
+        self.__HttpFileDict = {}       # Downloads of json-Files running in parallel -> Futures
+        self.__NodeMacsDict = {}       # Reverse of MAC2NodeIDDict: Main MAC -> Set of MACs (as Integer)
+        self.__NeighbourMacDict = {}   # checked Neighbour MACs: MAC -> Integer or None if invalid
+        self.__GluonMacDict = {}       # Gluon MACs derived from Main MAC -> { 'New':[], 'Old':[] }
+
+        self.__BatctlPool   = None     # Worker Pool for batctl Traceroutes (started on first Use)
+        self.__BatctlLock   = threading.Lock()
+        self.__BatctlTraceDict = {}    # Traceroutes of this Run: (Segment,ffNodeMAC) -> Future of TraceResult
+        self.__BatmanOriginDict = {}   # Originator Tables (best Routes): Segment -> { OriginatorMAC:NexthopMAC }
+        self.__BatmanUplinkDict = {}   # Uplinks from Originator Tables: Segment -> { ffNodeMAC:isUplink (None = ambiguous) }
 
         # Initializations
         socket.setdefaulttimeout(5)
+        self.__LoadGluonMacDict()           # derived Gluon MACs of previous Runs
+
+        with ThreadPoolExecutor(max_workers=5) as FetchPool:
+            self.__StartDownloads(FetchPool)    # network waits are overlapping, analysis is done in fixed order
+
+            self.__LoadNodeDict()           # ffNodeDict[ffNodeMAC] -> saved Infos of ffNodes
+            self.__LoadNodesDbJson()        # all combined Alfred-Infos from Alfred-Server
+            self.__LoadAlfred158Json()      # Alfred - basic infos of the Nodes
+            self.__LoadAlfred159Json()      # Alfred - VPN-Uplinks of the Nodes
+            self.__LoadAlfred160Json()      # Alfred - Neighbours of the Nodes
+            self.__LoadRawJson()            # add or update Info with Data from announced / respondd
 
-        self.__LoadNodeDict()           # ffNodeDict[ffNodeMAC] -> saved Infos of ffNodes
-        self.__LoadNodesDbJson()        # all combined Alfred-Infos from Alfred-Server
-        self.__LoadAlfred158Json()      # Alfred - basic infos of the Nodes
-        self.__LoadAlfred159Json()      # Alfred - VPN-Uplinks of the Nodes
-        self.__LoadAlfred160Json()      # Alfred - Neighbours of the Nodes
-        self.__LoadRawJson()            # add or update Info with Data from announced / respondd
+        self.__HttpFileDict = {}
         self.__CheckNodeHostnames()     # Check for invalid letters in hostnames
         return
 
 
 
+    #-----------------------------------------------------------------------
+    # private function "__GetNeighbourMacInt"
+    #
+    #   Check Neighbour MAC (once per Run) and convert it to Integer
+    #
+    #   -> None if MAC is invalid or belongs to a Gateway
+    #-----------------------------------------------------------------------
+    def __GetNeighbourMacInt(self,ffNeighbour):
+
+        if ffNeighbour not in self.__NeighbourMacDict:
+            if MacAdrTemplate.match(ffNeighbour) and not GwAllMacTemplate.match(ffNeighbour):
+                self.__NeighbourMacDict[ffNeighbour] = MacToInt(ffNeighbour)
+            else:
+                self.__NeighbourMacDict[ffNeighbour] = None
+
+        return self.__NeighbourMacDict[ffNeighbour]
+
+
+
     #-----------------------------------------------------------------------
     # private function "__alert"
     #
@@ -172,10 +293,210 @@ class ffNodeInfo:
 
 
 
+    #-----------------------------------------------------------------------
+    # private function "__DownloadJsonFile"
+    #
+    #   Download and decode json-File from Webserver (runs in Thread Pool)
+    #
+    #   -> { 'JsonDict','JsonFile','HttpDate','StatusAge','Cached' }
+    #
+    #   StatusAge is None if Age of File is not checked (raw.json).
+    #   Cached is True if Webserver answered "304 Not Modified".
+    #   JsonDict is None on Errors or if File is too old.
+    #   Unchanged Files are taken from local Cache (HTTP 304).
+    #   Streamed Files are not decoded here, JsonFile is the cached File then.
+    #-----------------------------------------------------------------------
+    def __DownloadJsonFile(self,FileName,URL,Opener,Retries,Timeout,CheckAge,Streamed=False):
+
+        HttpFile = { 'JsonDict':None, 'JsonFile':None, 'HttpDate':None, 'StatusAge':None, 'Cached':False }
+
+        while Retries > 0:
+            Retries -= 1
+
+            try:
+                if CheckAge:
+                    DataFile = self.__DataAccess.GetHttpFile(FileName,URL,Opener,Timeout,MaxStatusAge,not Streamed)
+                    HttpFile['HttpDate']  = DataFile['HttpDate']
+                    HttpFile['StatusAge'] = self.__DataAccess.UnixTime() - HttpFile['HttpDate']
+
+                    if DataFile['FileName'] is None:
+                        break    # no retry on old data
+                else:
+                    DataFile = self.__DataAccess.GetHttpFile(FileName,URL,Opener,Timeout,None,not Streamed)
+
+                HttpFile['Cached'] = DataFile['Cached']
+
+                if Streamed:
+                    HttpFile['JsonFile'] = DataFile['FileName']
+                else:
+                    HttpFile['JsonDict'] = json.loads(DataFile['Body'].decode('utf-8'))
+                break
+
+            except:
+                print('** need retry:',FileName,'...')
+                HttpFile['JsonDict'] = None
+                HttpFile['JsonFile'] = None
+                self.__DataAccess.Sleep(2)
+
+        return HttpFile
+
+
+
+    #-----------------------------------------------------------------------
+    # private function "__StreamJsonDict"
+    #
+    #   Read json-File with Dictionary on top level Item by Item
+    #
+    #   -> Generator of (Key,Value), only one Value is decoded at a Time
+    #
+    #   Raises ValueError on invalid json-Data.
+    #-----------------------------------------------------------------------
+    def __StreamJsonDict(self,JsonFileName):
+
+        JsonDecoder = json.JSONDecoder()
+        BlockSize = 65536
+
+        with open(JsonFileName, mode='r', encoding='utf-8') as JsonFile:
+            Buffer = ''
+            Pos = 0
+            EndOfFile = False
+            State = 0    # 0 = before '{', 1 = before Key or '}', 2 = before ':', 3 = before Value, 4 = before ',' or '}'
+            Key = None
+
+            while True:
+                while Pos < len(Buffer) and Buffer[Pos] in ' \t\r\n':
+                    Pos += 1
+
+                if Pos < len(Buffer):
+                    if State == 0 and Buffer[Pos] == '{':
+                        State = 1
+                        Pos += 1
+                        continue
+
+                    if State in [1,4] and Buffer[Pos] == '}':
+                        break    # End of Dictionary
+
+                    if State == 2 and Buffer[Pos] == ':':
+                        State = 3
+                        Pos += 1
+                        continue
+
+                    if State == 4 and Buffer[Pos] == ',':
+                        State = 1
+                        Pos += 1
+                        continue
+
+                    if State not in [1,3] or (State == 1 and Buffer[Pos] != '"'):
+                        raise ValueError('Invalid json-Data: '+Buffer[Pos:Pos+20])
+
+                    try:
+                        (Item,EndPos) = JsonDecoder.raw_decode(Buffer,Pos)
+                    except json.JSONDecodeError:
+                        if EndOfFile:
+                            raise
+                    else:
+                        if EndPos < len(Buffer) or EndOfFile:
+                            Pos = EndPos
+
+                            if State == 1:
+                                Key = Item
+                                State = 2
+                            else:
+                                yield (Key,Item)
+                                State = 4
+
+                            continue
+
+                elif EndOfFile:
+                    raise ValueError('Unexpected End of json-Data')
+
+                # need more Data for next Item
+                NextBlock = JsonFile.read(BlockSize)
+                EndOfFile = (NextBlock == '')
+                Buffer = Buffer[Pos:] + NextBlock
+                Pos = 0
+
+        return
+
+
+
+    #-----------------------------------------------------------------------
+    # private function "__StartDownloads"
+    #
+    #   Start parallel Download of all json-Files from Alfred-Server
+    #
+    #   self.__HttpFileDict[FileName] -> Future of __DownloadJsonFile
+    #-----------------------------------------------------------------------
+    def __StartDownloads(self,FetchPool):
+
+        print('Starting Download of json-Files ...')
+
+        AlfredOpener = urllib.request.build_opener()
+
+        for FileName in [NodesDbName,Alfred158Name,Alfred159Name,Alfred160Name]:
+            self.__HttpFileDict[FileName] = FetchPool.submit(self.__DownloadJsonFile,FileName,self.__AlfredURL+FileName,AlfredOpener,3,10,True)
+
+        passman = urllib.request.HTTPPasswordMgrWithDefaultRealm()
+        passman.add_password(None, self.__RawAccess['URL'], self.__RawAccess['Username'], self.__RawAccess['Password'])
+        RawOpener = urllib.request.build_opener(urllib.request.HTTPBasicAuthHandler(passman))
+
+        self.__HttpFileDict[RawJsonName] = FetchPool.submit(self.__DownloadJsonFile,RawJsonName,self.__RawAccess['URL'],RawOpener,5,15,False,True)
+
+        print('... done.\n')
+        return
+
+
+
+    #-----------------------------------------------------------------------
+    # private function "__GetHttpFile"
+    #
+    #   Wait for Download of json-File and print its Age
+    #
+    #   Unchanged Files are analysed anyway, because the Results (Status,
+    #   Uptime, Clients, Neighbours) are not stored in NodeDict.json.
+    #-----------------------------------------------------------------------
+    def __GetHttpFile(self,FileName):
+
+        print('Loading',FileName,'...')
+        HttpFile = self.__HttpFileDict[FileName].result()
+
+        if HttpFile['Cached']:
+            print('>>> unchanged since last Run (taken from Cache)')
+
+        if HttpFile['StatusAge'] is not None:
+            print('>>> Age =',HttpFile['StatusAge'],'Sec.')
+
+        return HttpFile
+
+
+
+    #-------------------------------------------------------------
+    # private function "__LoadGluonMacDict"
+    #
+    #   Load Cache of derived Gluon MACs (MainMAC -> MACs)
+    #-------------------------------------------------------------
+    def __LoadGluonMacDict(self):
+
+        print('Loading',GluonMacName,'...')
+
+        try:
+            with open(os.path.join(self.__DatabasePath,GluonMacName), mode='r') as JsonFile:
+                self.__GluonMacDict = json.load(JsonFile)
+
+        except:
+            print('++ No Cache of Gluon MACs available.')
+            self.__GluonMacDict = {}
+
+        print('... %d Nodes done.\n' % (len(self.__GluonMacDict)))
+        return
+
+
+
     #=======================================================================
     # function "GenerateGluonMACsOld(MainMAC)"
     #
     #   Append self.MAC2NodeIDDict for Gluon <= 2016.1.x
+    #   (Result is cached in GluonMacDict.json)
     #
     # reference = Gluon Source:
     #
@@ -195,6 +516,9 @@ class ffNodeInfo:
     #=======================================================================
     def GenerateGluonMACsOld(self,MainMAC):
 
+        if MainMAC in self.__GluonMacDict and 'Old' in self.__GluonMacDict[MainMAC]:
+            return self.__GluonMacDict[MainMAC]['Old']
+
         MacRanges = { 1:1, 2:2, 3:2, 4:0, 5:2 }
 
         m1Main = int(MainMAC[0:2],16)
@@ -212,6 +536,10 @@ class ffNodeInfo:
 
                 GluonMacList.append(m1New + ':' + m2New + ':' + m3New + ':' + MainMAC[9:])
 
+        if MainMAC not in self.__GluonMacDict:
+            self.__GluonMacDict[MainMAC] = {}
+
+        self.__GluonMacDict[MainMAC]['Old'] = GluonMacList
         return GluonMacList
 
 
@@ -220,6 +548,7 @@ class ffNodeInfo:
     # function "GenerateGluonMACsNew(MainMAC)"
     #
     #   Append self.MAC2NodeIDDict for Gluon >= 2016.2.x
+    #   (Result is cached in GluonMacDict.json)
     #
     # reference = Gluon Source:
     #
@@ -251,6 +580,9 @@ class ffNodeInfo:
     #=======================================================================
     def GenerateGluonMACsNew(self,MainMAC):
 
+        if MainMAC in self.__GluonMacDict and 'New' in self.__GluonMacDict[MainMAC]:
+            return self.__GluonMacDict[MainMAC]['New']
+
         mHash = hashlib.md5(MainMAC.encode(encoding='UTF-8'))
         vMAC = mHash.hexdigest()
 
@@ -265,10 +597,34 @@ class ffNodeInfo:
         for i in range(8):
             GluonMacList.append(m1to5New + hex((m6Main & 0xf8) + i)[2:].zfill(2))
 
+        if MainMAC not in self.__GluonMacDict:
+            self.__GluonMacDict[MainMAC] = {}
+
+        self.__GluonMacDict[MainMAC]['New'] = GluonMacList
         return GluonMacList
 
 
 
+    #-------------------------------------------------------------
+    # private function "__SetMainMAC(MacInt,MainMAC)"
+    #
+    #   set Main MAC of MAC in MAC2NodeIDDict and Reverse Index
+    #-------------------------------------------------------------
+    def __SetMainMAC(self,MacInt,MainMAC):
+
+        if MacInt in self.MAC2NodeIDDict:
+            self.__NodeMacsDict[self.MAC2NodeIDDict[MacInt]].discard(MacInt)
+
+        self.MAC2NodeIDDict[MacInt] = MainMAC
+
+        if MainMAC not in self.__NodeMacsDict:
+            self.__NodeMacsDict[MainMAC] = set()
+
+        self.__NodeMacsDict[MainMAC].add(MacInt)
+        return
+
+
+
     #-------------------------------------------------------------
     # private function "__AddGluonMACs(MainMAC,MeshMAC)"
     #
@@ -276,7 +632,7 @@ class ffNodeInfo:
     #-------------------------------------------------------------
     def __AddGluonMACs(self,MainMAC,MeshMAC):
 
-        if self.ffNodeDict[MainMAC]['Status'] == '?' and self.ffNodeDict[MainMAC]['Name'] == '<killme>':
+        if self.ffNodeDict[MainMAC].Status == '?' and self.ffNodeDict[MainMAC].Name == '<killme>':
             return MainMAC   # Node data has to be killed because HW was replaced ...
 
         GluonMacList = self.GenerateGluonMACsNew(MainMAC)
@@ -285,48 +641,51 @@ class ffNodeInfo:
             GluonMacList = self.GenerateGluonMACsOld(MainMAC)
 
             if MeshMAC not in GluonMacList:
-#                print('!! Invalid Mesh-MAC:',MeshMAC,'->',MainMAC,'= \''+self.ffNodeDict[MainMAC]['Name']+'\'')
+#                print('!! Invalid Mesh-MAC:',MeshMAC,'->',MainMAC,'= \''+self.ffNodeDict[MainMAC].Name+'\'')
                 GluonMacList = [ MeshMAC ]    # neither new nor old mac schema
 
+        MainMacInt = MacToInt(MainMAC)
+
         if MainMAC in GluonMacList:
             print('!! MeshMAC identical to MainMAC: %s / %s -> %s' %(MainMAC,MeshMAC,GluonMacList))
         else:
-            if MainMAC in self.MAC2NodeIDDict:
-                if self.MAC2NodeIDDict[MainMAC] != MainMAC:
-                    print('!! MAC-Collision: %s -> %s' % (MainMAC,self.MAC2NodeIDDict[MainMAC]))
+            if MainMacInt in self.MAC2NodeIDDict:
+                if self.MAC2NodeIDDict[MainMacInt] != MainMAC:
+                    print('!! MAC-Collision: %s -> %s' % (MainMAC,self.MAC2NodeIDDict[MainMacInt]))
             else:
-                self.MAC2NodeIDDict[MainMAC] = MainMAC
+                self.__SetMainMAC(MainMacInt,MainMAC)
 
         BadMAC = None
 
         for NewMAC in GluonMacList:
-            if NewMAC in self.MAC2NodeIDDict:
-                if self.MAC2NodeIDDict[NewMAC] != MainMAC:
-                    print('!! MAC-Collision: %s = %s / %s = \'%s\'' % (NewMAC,MainMAC,MeshMAC,self.ffNodeDict[MainMAC]['Name']))
-                    print('  stored Partner: %s = \'%s\'' % (self.MAC2NodeIDDict[NewMAC],self.ffNodeDict[self.MAC2NodeIDDict[NewMAC]]['Name']))
+            NewMacInt = MacToInt(NewMAC)
 
-                    if self.ffNodeDict[MainMAC]['last_online'] > self.ffNodeDict[self.MAC2NodeIDDict[NewMAC]]['last_online']:
-                        BadMAC = self.MAC2NodeIDDict[NewMAC]
-                        self.MAC2NodeIDDict[NewMAC] = MainMAC
+            if NewMacInt in self.MAC2NodeIDDict:
+                if self.MAC2NodeIDDict[NewMacInt] != MainMAC:
+                    print('!! MAC-Collision: %s = %s / %s = \'%s\'' % (NewMAC,MainMAC,MeshMAC,self.ffNodeDict[MainMAC].Name))
+                    print('  stored Partner: %s = \'%s\'' % (self.MAC2NodeIDDict[NewMacInt],self.ffNodeDict[self.MAC2NodeIDDict[NewMacInt]].Name))
 
-                        for MAC in self.MAC2NodeIDDict:
-                            if self.MAC2NodeIDDict[MAC] == BadMAC:
-                                self.MAC2NodeIDDict[MAC] = MainMAC
+                    if self.ffNodeDict[MainMAC].last_online > self.ffNodeDict[self.MAC2NodeIDDict[NewMacInt]].last_online:
+                        BadMAC = self.MAC2NodeIDDict[NewMacInt]
+                        self.__SetMainMAC(NewMacInt,MainMAC)
+
+                        for MacInt in list(self.__NodeMacsDict[BadMAC]):
+                            self.__SetMainMAC(MacInt,MainMAC)
 
                     else:
                         BadMAC = MainMAC
 
-                    print('>>      Bad Node: %s = \'%s\'' % (BadMAC,self.ffNodeDict[BadMAC]['Name']))
-                    self.ffNodeDict[BadMAC]['Status'] = '?'
-#                    self.ffNodeDict[BadMAC]['Name'] = '<killme>'
-#                    self.ffNodeDict[BadMAC]['DestSeg'] = 999    # kill this Node
-                    self.ffNodeDict[BadMAC]['Neighbours'] = []
+                    print('>>      Bad Node: %s = \'%s\'' % (BadMAC,self.ffNodeDict[BadMAC].Name))
+                    self.ffNodeDict[BadMAC].Status = '?'
+#                    self.ffNodeDict[BadMAC].Name = '<killme>'
+#                    self.ffNodeDict[BadMAC].DestSeg = 999    # kill this Node
+                    self.ffNodeDict[BadMAC].Neighbours = set()
                     print()
 #                    break
 
             else:
-                self.MAC2NodeIDDict[NewMAC] = MainMAC
-                self.ffNodeDict[MainMAC]['MeshMACs'].append(NewMAC)
+                self.__SetMainMAC(NewMacInt,MainMAC)
+                self.ffNodeDict[MainMAC].MeshMACs.append(NewMAC)
 
         return BadMAC
 
@@ -347,13 +706,13 @@ class ffNodeInfo:
             if 'release' in NodeSoftwareDict['firmware']:
                 if NodeSoftwareDict['firmware']['release'] is not None:
                     if NodeSoftwareDict['firmware']['release'][:14] >= '1.3+2017-09-13':
-                        self.ffNodeDict[NodeMAC]['GluonType'] = NODETYPE_MTU_1340
+                        self.ffNodeDict[NodeMAC].GluonType = NODETYPE_MTU_1340
                     elif NodeSoftwareDict['firmware']['release'][:14] >= '1.0+2017-02-14':
-                        self.ffNodeDict[NodeMAC]['GluonType'] = NODETYPE_DNS_SEGASSIGN
+                        self.ffNodeDict[NodeMAC].GluonType = NODETYPE_DNS_SEGASSIGN
                     elif NodeSoftwareDict['firmware']['release'][:14] >= '0.7+2016.01.02':
-                        self.ffNodeDict[NodeMAC]['GluonType'] = NODETYPE_SEGMENT_LIST
+                        self.ffNodeDict[NodeMAC].GluonType = NODETYPE_SEGMENT_LIST
                     else:
-                        self.ffNodeDict[NodeMAC]['GluonType'] = NODETYPE_LEGACY
+                        self.ffNodeDict[NodeMAC].GluonType = NODETYPE_LEGACY
 
         return
 
@@ -368,7 +727,7 @@ class ffNodeInfo:
 
         print('Writing',NodeDictName,'...')
         JsonFile = open(os.path.join(self.__DatabasePath,NodeDictName), mode='w+')
-        json.dump(self.ffNodeDict,JsonFile)
+        json.dump(self.ffNodeDict,JsonFile,default=ffNodeRecord.ToJson)
         JsonFile.close()
 
         print('... done.\n')
@@ -384,7 +743,7 @@ class ffNodeInfo:
     def __LoadNodeDict(self):
 
         print('Loading',NodeDictName,'...')
-        UnixTime = int(time.time())
+        UnixTime = self.__DataAccess.UnixTime()
         jsonNodeDict = None
         NodeCount = 0
 
@@ -406,38 +765,25 @@ class ffNodeInfo:
                         if ffsIPv6Template.match(jsonNodeDict[ffNodeMAC]['IPv6']):
                             jsonNodeDict[ffNodeMAC]['Segment'] = int(jsonNodeDict[ffNodeMAC]['IPv6'][12:14])
 
-                    self.ffNodeDict[ffNodeMAC] = {
-                        'RawKey': None,
-                        'Name': jsonNodeDict[ffNodeMAC]['Name'],
-                        'Status': jsonNodeDict[ffNodeMAC]['Status'],
-                        'last_online': jsonNodeDict[ffNodeMAC]['last_online'],
-                        'Uptime': 0.0,
-                        'Clients': 0,
-                        'Latitude': jsonNodeDict[ffNodeMAC]['Latitude'],
-                        'Longitude': jsonNodeDict[ffNodeMAC]['Longitude'],
-                        'ZIP': jsonNodeDict[ffNodeMAC]['ZIP'],
-                        'Region': '??',
-                        'DestSeg': None,
-                        'GluonType': jsonNodeDict[ffNodeMAC]['GluonType'],
-                        'MeshMACs': [],
-                        'IPv6': jsonNodeDict[ffNodeMAC]['IPv6'],
-                        'Segment': jsonNodeDict[ffNodeMAC]['Segment'],
-                        'SegMode': 'auto',
-                        'KeyDir': '',
-                        'KeyFile': '',
-                        'FastdKey': '',
-                        'InCloud': None,
-                        'Neighbours': [],
-                        'Owner': jsonNodeDict[ffNodeMAC]['Owner']
-                    }
+                    self.ffNodeDict[ffNodeMAC] = ffNodeRecord(jsonNodeDict[ffNodeMAC]['Name'],jsonNodeDict[ffNodeMAC]['Status'],jsonNodeDict[ffNodeMAC]['last_online'],
+                                                              Latitude  = jsonNodeDict[ffNodeMAC]['Latitude'],
+                                                              Longitude = jsonNodeDict[ffNodeMAC]['Longitude'],
+                                                              ZIP       = jsonNodeDict[ffNodeMAC]['ZIP'],
+                                                              GluonType = jsonNodeDict[ffNodeMAC]['GluonType'],
+                                                              IPv6      = jsonNodeDict[ffNodeMAC]['IPv6'],
+                                                              Segment   = jsonNodeDict[ffNodeMAC]['Segment'],
+                                                              Owner     = jsonNodeDict[ffNodeMAC]['Owner'])
+
+                    if 'GeoCache' in jsonNodeDict[ffNodeMAC]:
+                        self.ffNodeDict[ffNodeMAC].GeoCache = jsonNodeDict[ffNodeMAC]['GeoCache']
 
                     NodeCount += 1
-                    self.MAC2NodeIDDict[ffNodeMAC] = ffNodeMAC
+                    self.__SetMainMAC(MacToInt(ffNodeMAC),ffNodeMAC)
 
                     if UnixTime - jsonNodeDict[ffNodeMAC]['last_online'] > MaxInactiveTime:
-                        self.ffNodeDict[ffNodeMAC]['Status'] = '?'
+                        self.ffNodeDict[ffNodeMAC].Status = '?'
                     elif UnixTime - jsonNodeDict[ffNodeMAC]['last_online'] > MaxOfflineTime:
-                        self.ffNodeDict[ffNodeMAC]['Status'] = '#'
+                        self.ffNodeDict[ffNodeMAC].Status = '#'
 
                     if len(jsonNodeDict[ffNodeMAC]['MeshMACs']) == 0:
                         jsonNodeDict[ffNodeMAC]['MeshMACs'] = self.GenerateGluonMACsNew(ffNodeMAC)
@@ -465,33 +811,14 @@ class ffNodeInfo:
     #-------------------------------------------------------------
     def __LoadNodesDbJson(self):
 
-        print('Loading nodesdb.json ...')
         NewestTime = 0
-        jsonDbDict = None
-        Retries = 3
-
-        while jsonDbDict is None and Retries > 0:
-            Retries -= 1
-            UnixTime = int(time.time())
-
-            try:
-                NodesDbJsonHTTP = urllib.request.urlopen(self.__AlfredURL+NodesDbName,timeout=10)
-                HttpDate = int(calendar.timegm(time.strptime(NodesDbJsonHTTP.info()['Last-Modified'][5:],'%d %b %Y %X %Z')))
-                StatusAge = UnixTime - HttpDate
-
-                print('>>> Age =',StatusAge,'Sec.')
-
-                if StatusAge > MaxStatusAge:
-                    NodesDbJsonHTTP.close()
-                    self.__alert('++ nodesdb.json is too old !!!\n')
-                    return
+        UnixTime = self.__DataAccess.UnixTime()
+        HttpFile = self.__GetHttpFile(NodesDbName)
+        jsonDbDict = HttpFile['JsonDict']
 
-                jsonDbDict = json.loads(NodesDbJsonHTTP.read().decode('utf-8'))
-                NodesDbJsonHTTP.close()
-            except:
-                print('** need retry ...')
-                jsonDbDict = None
-                time.sleep(2)
+        if HttpFile['StatusAge'] is not None and HttpFile['StatusAge'] > MaxStatusAge:
+            self.__alert('++ nodesdb.json is too old !!!\n')
+            return
 
         if jsonDbDict is None:
 #            self.__alert('++ Error on loading nodesdb.json !!!\n')
@@ -511,53 +838,33 @@ class ffNodeInfo:
                     print('++ GW in nodesdb.json:',DbIndex,'->',ffNodeMAC)
                 else:
                     if ffNodeMAC in self.ffNodeDict:
-#                        print('++ Node already stored:',ffNodeMAC,self.ffNodeDict[ffNodeMAC]['Status'],self.ffNodeDict[ffNodeMAC]['last_online'],'->',DbIndex,jsonDbDict[DbIndex]['status'],jsonDbDict[DbIndex]['last_online'])
+#                        print('++ Node already stored:',ffNodeMAC,self.ffNodeDict[ffNodeMAC].Status,self.ffNodeDict[ffNodeMAC].last_online,'->',DbIndex,jsonDbDict[DbIndex]['status'],jsonDbDict[DbIndex]['last_online'])
 
-                        if jsonDbDict[DbIndex]['last_online'] <= self.ffNodeDict[ffNodeMAC]['last_online']:
+                        if jsonDbDict[DbIndex]['last_online'] <= self.ffNodeDict[ffNodeMAC].last_online:
                             continue    # no newer info available
 
-                        NodeOwner = self.ffNodeDict[ffNodeMAC]['Owner']
+                        NodeOwner = self.ffNodeDict[ffNodeMAC].Owner
+                        NodeGeoCache = self.ffNodeDict[ffNodeMAC].GeoCache
                     else:
                         NodeOwner = None
+                        NodeGeoCache = None
+
+                    self.ffNodeDict[ffNodeMAC] = ffNodeRecord(jsonDbDict[DbIndex]['hostname'],'#',jsonDbDict[DbIndex]['last_online'],Owner = NodeOwner)
+                    self.ffNodeDict[ffNodeMAC].GeoCache = NodeGeoCache
 
-                    self.ffNodeDict[ffNodeMAC] = {
-                        'RawKey': None,
-                        'Name': jsonDbDict[DbIndex]['hostname'],
-                        'Status': '#',
-                        'last_online': jsonDbDict[DbIndex]['last_online'],
-                        'Uptime': 0.0,
-                        'Clients': 0,
-                        'Latitude': None,
-                        'Longitude': None,
-                        'ZIP': None,
-                        'Region': '??',
-                        'DestSeg': None,
-                        'GluonType': NODETYPE_UNKNOWN,
-                        'MeshMACs':[],
-                        'IPv6': None,
-                        'Segment': None,
-                        'SegMode': 'auto',
-                        'KeyDir': '',
-                        'KeyFile': '',
-                        'FastdKey': '',
-                        'InCloud': None,
-                        'Neighbours': [],
-                        'Owner': NodeOwner
-                    }
-
-                    self.MAC2NodeIDDict[ffNodeMAC] = ffNodeMAC
+                    self.__SetMainMAC(MacToInt(ffNodeMAC),ffNodeMAC)
 
                     if UnixTime - jsonDbDict[DbIndex]['last_online'] > MaxInactiveTime:
-                        self.ffNodeDict[ffNodeMAC]['Status'] = '?'
+                        self.ffNodeDict[ffNodeMAC].Status = '?'
                     else:
                         if jsonDbDict[DbIndex]['last_online'] > NewestTime:
                             NewestTime = jsonDbDict[DbIndex]['last_online']
 
                         if jsonDbDict[DbIndex]['status'] == 'online' and (UnixTime - jsonDbDict[DbIndex]['last_online']) < MaxOfflineTime:
-                            self.ffNodeDict[ffNodeMAC]['Status'] = ' '
+                            self.ffNodeDict[ffNodeMAC].Status = ' '
 
                             if 'segment' in jsonDbDict[DbIndex] and jsonDbDict[DbIndex]['segment'] is not None:
-                                self.ffNodeDict[ffNodeMAC]['Segment'] = int(jsonDbDict[DbIndex]['segment'])
+                                self.ffNodeDict[ffNodeMAC].Segment = int(jsonDbDict[DbIndex]['segment'])
 
                             if 'gateway' in jsonDbDict[DbIndex]:
                                 if jsonDbDict[DbIndex]['gateway'][:9] == '02:00:0a:':
@@ -568,30 +875,30 @@ class ffNodeInfo:
                                     GwSeg = None
 
                                 if GwSeg is not None:
-                                    if self.ffNodeDict[ffNodeMAC]['Segment'] is None:
-                                        self.ffNodeDict[ffNodeMAC]['Segment'] = GwSeg
-                                    elif self.ffNodeDict[ffNodeMAC]['Segment'] != GwSeg:
-                                        print('!! Segment mismatch:',self.ffNodeDict[ffNodeMAC]['Status'],ffNodeMAC,self.ffNodeDict[ffNodeMAC]['Segment'],'<>',GwSeg,'=',self.ffNodeDict[ffNodeMAC]['Name'])
+                                    if self.ffNodeDict[ffNodeMAC].Segment is None:
+                                        self.ffNodeDict[ffNodeMAC].Segment = GwSeg
+                                    elif self.ffNodeDict[ffNodeMAC].Segment != GwSeg:
+                                        print('!! Segment mismatch:',self.ffNodeDict[ffNodeMAC].Status,ffNodeMAC,self.ffNodeDict[ffNodeMAC].Segment,'<>',GwSeg,'=',self.ffNodeDict[ffNodeMAC].Name)
 
                             if 'neighbours' in jsonDbDict[DbIndex]:
                                 for ffNeighbour in jsonDbDict[DbIndex]['neighbours']:
-                                    if ((MacAdrTemplate.match(ffNeighbour) and not GwAllMacTemplate.match(ffNeighbour)) and
-                                        (ffNeighbour not in self.ffNodeDict[ffNodeMAC]['Neighbours'])):
+                                    NeighbourMacInt = self.__GetNeighbourMacInt(ffNeighbour)
 
-                                        self.ffNodeDict[ffNodeMAC]['Neighbours'].append(ffNeighbour)
+                                    if NeighbourMacInt is not None:
+                                        self.ffNodeDict[ffNodeMAC].Neighbours.add(NeighbourMacInt)
 
                         if 'addresses' in jsonDbDict[DbIndex]['network']:
                             for NodeAddress in jsonDbDict[DbIndex]['network']['addresses']:
                             	if ffsIPv6Template.match(NodeAddress):
-                            	    self.ffNodeDict[ffNodeMAC]['IPv6'] = NodeAddress
+                            	    self.ffNodeDict[ffNodeMAC].IPv6 = NodeAddress
 
                     if 'location' in jsonDbDict[DbIndex]:
                         if 'latitude' in jsonDbDict[DbIndex]['location'] and 'longitude' in jsonDbDict[DbIndex]['location']:
-                            self.ffNodeDict[ffNodeMAC]['Latitude']  = jsonDbDict[DbIndex]['location']['latitude']
-                            self.ffNodeDict[ffNodeMAC]['Longitude'] = jsonDbDict[DbIndex]['location']['longitude']
+                            self.ffNodeDict[ffNodeMAC].Latitude  = jsonDbDict[DbIndex]['location']['latitude']
+                            self.ffNodeDict[ffNodeMAC].Longitude = jsonDbDict[DbIndex]['location']['longitude']
 
                         if 'zip' in jsonDbDict[DbIndex]['location']:
-                            self.ffNodeDict[ffNodeMAC]['ZIP'] = str(jsonDbDict[DbIndex]['location']['zip'])[:5]
+                            self.ffNodeDict[ffNodeMAC].ZIP = str(jsonDbDict[DbIndex]['location']['zip'])[:5]
 
                     if 'mesh_interfaces' in NodeNets:
                         for MeshMAC in NodeNets['mesh_interfaces']:
@@ -626,32 +933,14 @@ class ffNodeInfo:
     #-------------------------------------------------------------
     def __LoadAlfred158Json(self):
 
-        print('Loading alfred-json-158.json ...')
-        json158Dict = None
-        Retries = 3
+        HttpFile = self.__GetHttpFile(Alfred158Name)
+        json158Dict = HttpFile['JsonDict']
+        HttpDate = HttpFile['HttpDate']
 
-        while json158Dict is None and Retries > 0:
-            Retries -= 1
-
-            try:
-                Afred158HTTP = urllib.request.urlopen(self.__AlfredURL+Alfred158Name,timeout=10)
-                HttpDate = int(calendar.timegm(time.strptime(Afred158HTTP.info()['Last-Modified'][5:],'%d %b %Y %X %Z')))
-                StatusAge = int(time.time()) - HttpDate
-
-                print('>>> Age =',StatusAge,'Sec.')
-
-                if StatusAge > MaxStatusAge:
-                    Afred158HTTP.close()
-                    self.__alert('++ alfred-json-158.json is too old !!!\n')
-                    self.AnalyseOnly = True
-                    return
-
-                json158Dict = json.loads(Afred158HTTP.read().decode('utf-8'))
-                Afred158HTTP.close()
-            except:
-                print('** need retry ...')
-                json158Dict = None
-                time.sleep(2)
+        if HttpFile['StatusAge'] is not None and HttpFile['StatusAge'] > MaxStatusAge:
+            self.__alert('++ alfred-json-158.json is too old !!!\n')
+            self.AnalyseOnly = True
+            return
 
         if json158Dict is None:
             self.__alert('++ Error on loading alfred-json-158.json !!!\n')
@@ -684,51 +973,28 @@ class ffNodeInfo:
                         print('++ MAC Mismatch:',jsonIndex,'->',NodeMAC,'<>',json158Dict[jsonIndex]['network']['mac'].strip())
 
                     if NodeMAC not in self.ffNodeDict:
-                        self.ffNodeDict[NodeMAC] = {
-                            'RawKey': None,
-                            'Name': json158Dict[jsonIndex]['hostname'],
-                            'Status': ' ',
-                            'last_online': HttpDate,
-                            'Uptime': 0.0,
-                            'Clients': 0,
-                            'Latitude': None,
-                            'Longitude': None,
-                            'ZIP': None,
-                            'Region': '??',
-                            'DestSeg': None,
-                            'GluonType': NODETYPE_UNKNOWN,
-                            'MeshMACs':[],
-                            'IPv6': None,
-                            'Segment': None,
-                            'SegMode': 'auto',
-                            'KeyDir': '',
-                            'KeyFile': '',
-                            'FastdKey':'',
-                            'InCloud': None,
-                            'Neighbours': [],
-                            'Owner': None
-                        }
-
-                        self.MAC2NodeIDDict[NodeMAC] = NodeMAC
+                        self.ffNodeDict[NodeMAC] = ffNodeRecord(json158Dict[jsonIndex]['hostname'],' ',HttpDate)
+
+                        self.__SetMainMAC(MacToInt(NodeMAC),NodeMAC)
                         print('++ Node added:    ',NodeMAC,'= \''+json158Dict[jsonIndex]['hostname']+'\'')
 
-                    elif HttpDate > self.ffNodeDict[NodeMAC]['last_online']:
-                        self.ffNodeDict[NodeMAC]['last_online'] = HttpDate
+                    elif HttpDate > self.ffNodeDict[NodeMAC].last_online:
+                        self.ffNodeDict[NodeMAC].last_online = HttpDate
 
                     #---------- updating Node Infos ----------
-                    if self.ffNodeDict[NodeMAC]['Name'] != json158Dict[jsonIndex]['hostname']:
-                        print('++ Hostname mismatch:',NodeMAC,'= \''+json158Dict[jsonIndex]['hostname']+'\' -> \''+self.ffNodeDict[NodeMAC]['Name']+'\'')
-                        self.ffNodeDict[NodeMAC]['Name'] = json158Dict[jsonIndex]['hostname']
+                    if self.ffNodeDict[NodeMAC].Name != json158Dict[jsonIndex]['hostname']:
+                        print('++ Hostname mismatch:',NodeMAC,'= \''+json158Dict[jsonIndex]['hostname']+'\' -> \''+self.ffNodeDict[NodeMAC].Name+'\'')
+                        self.ffNodeDict[NodeMAC].Name = json158Dict[jsonIndex]['hostname']
 
-                    if self.ffNodeDict[NodeMAC]['Status'] not in OnlineStates:
-                        self.ffNodeDict[NodeMAC]['Status'] = ' '
+                    if self.ffNodeDict[NodeMAC].Status not in OnlineStates:
+                        self.ffNodeDict[NodeMAC].Status = ' '
 #                        print('++ Node is online:',NodeMAC,'= \''+json158Dict[jsonIndex]['hostname']+'\'')
 
                     if 'addresses' in json158Dict[jsonIndex]['network']:
                         for NodeAddress in json158Dict[jsonIndex]['network']['addresses']:
                             if ffsIPv6Template.match(NodeAddress):
-                                self.ffNodeDict[NodeMAC]['IPv6'] = NodeAddress
-                                self.ffNodeDict[NodeMAC]['Segment'] = int(NodeAddress[12:14])
+                                self.ffNodeDict[NodeMAC].IPv6 = NodeAddress
+                                self.ffNodeDict[NodeMAC].Segment = int(NodeAddress[12:14])
 
                     if 'mesh' in json158Dict[jsonIndex]['network']:
                         if 'bat0' in json158Dict[jsonIndex]['network']['mesh']:
@@ -740,11 +1006,11 @@ class ffNodeInfo:
 
                     if 'location' in json158Dict[jsonIndex]:
                         if 'latitude' in json158Dict[jsonIndex]['location'] and 'longitude' in json158Dict[jsonIndex]['location']:
-                            self.ffNodeDict[NodeMAC]['Latitude']  = json158Dict[jsonIndex]['location']['latitude']
-                            self.ffNodeDict[NodeMAC]['Longitude'] = json158Dict[jsonIndex]['location']['longitude']
+                            self.ffNodeDict[NodeMAC].Latitude  = json158Dict[jsonIndex]['location']['latitude']
+                            self.ffNodeDict[NodeMAC].Longitude = json158Dict[jsonIndex]['location']['longitude']
 
                         if 'zip' in json158Dict[jsonIndex]['location']:
-                            self.ffNodeDict[NodeMAC]['ZIP'] = str(json158Dict[jsonIndex]['location']['zip'])[:5]
+                            self.ffNodeDict[NodeMAC].ZIP = str(json158Dict[jsonIndex]['location']['zip'])[:5]
 
                     self.__SetSegmentAwareness(NodeMAC,json158Dict[jsonIndex]['software'])
 
@@ -761,36 +1027,17 @@ class ffNodeInfo:
     #
     # Update self.ffNodeDict:
     #
-    #   __ffNodeDict[NodeItem]['Status'] -> Node with VPN-Uplink?
+    #   __ffNodeDict[NodeItem].Status -> Node with VPN-Uplink?
     #-------------------------------------------------------------
     def __LoadAlfred159Json(self):
 
-        print('Loading alfred-json-159.json ...')
-        json159Dict = None
-        Retries = 3
-
-        while json159Dict is None and Retries > 0:
-            Retries -= 1
-
-            try:
-                Afred159HTTP = urllib.request.urlopen(self.__AlfredURL+Alfred159Name,timeout=10)
-                HttpDate = int(calendar.timegm(time.strptime(Afred159HTTP.info()['Last-Modified'][5:],'%d %b %Y %X %Z')))
-                StatusAge = int(time.time()) - HttpDate
+        HttpFile = self.__GetHttpFile(Alfred159Name)
+        json159Dict = HttpFile['JsonDict']
 
-                print('>>> Age =',StatusAge,'Sec.')
-
-                if StatusAge > MaxStatusAge:
-                    Afred159HTTP.close()
-                    self.__alert('++ alfred-json-159.json is too old !!!\n')
-                    self.AnalyseOnly = True
-                    return
-
-                json159Dict = json.loads(Afred159HTTP.read().decode('utf-8'))
-                Afred159HTTP.close()
-            except:
-                print('** need retry ...')
-                json159Dict = None
-                time.sleep(2)
+        if HttpFile['StatusAge'] is not None and HttpFile['StatusAge'] > MaxStatusAge:
+            self.__alert('++ alfred-json-159.json is too old !!!\n')
+            self.AnalyseOnly = True
+            return
 
         if json159Dict is None:
             self.__alert('++ Error on loading alfred-json-159.json !!!\n')
@@ -811,11 +1058,11 @@ class ffNodeInfo:
                     print('+++ Not in self.ffNodeDict:',NodeMAC)
 
                 else:
-                    if self.ffNodeDict[NodeMAC]['Status'] not in OnlineStates:
-                        self.ffNodeDict[NodeMAC]['Status'] = ' '
+                    if self.ffNodeDict[NodeMAC].Status not in OnlineStates:
+                        self.ffNodeDict[NodeMAC].Status = ' '
 
                     if 'uptime' in json159Dict[jsonIndex]:
-                        self.ffNodeDict[NodeMAC]['Uptime'] = json159Dict[jsonIndex]['uptime']
+                        self.ffNodeDict[NodeMAC].Uptime = json159Dict[jsonIndex]['uptime']
 
                     if 'mesh_vpn' in json159Dict[jsonIndex]:
                         if 'groups' in json159Dict[jsonIndex]['mesh_vpn']:
@@ -826,11 +1073,11 @@ class ffNodeInfo:
                                     for Uplink in GWpeers:
                                         if GWpeers[Uplink] is not None:
                                             if 'established' in GWpeers[Uplink]:
-                                                self.ffNodeDict[NodeMAC]['Status'] = 'V'
+                                                self.ffNodeDict[NodeMAC].Status = 'V'
 
                     if 'clients' in json159Dict[jsonIndex]:
                         if 'total' in json159Dict[jsonIndex]['clients']:
-                            self.ffNodeDict[NodeMAC]['Clients'] = int(json159Dict[jsonIndex]['clients']['total'])
+                            self.ffNodeDict[NodeMAC].Clients = int(json159Dict[jsonIndex]['clients']['total'])
 
         print('... done.\n')
         return
@@ -845,32 +1092,13 @@ class ffNodeInfo:
     #-------------------------------------------------------------
     def __LoadAlfred160Json(self):
 
-        print('Loading alfred-json-160.json ...')
-        json160Dict = None
-        Retries = 3
+        HttpFile = self.__GetHttpFile(Alfred160Name)
+        json160Dict = HttpFile['JsonDict']
 
-        while json160Dict is None and Retries > 0:
-            Retries -= 1
-
-            try:
-                Afred160HTTP = urllib.request.urlopen(self.__AlfredURL+Alfred160Name,timeout=10)
-                HttpDate = int(calendar.timegm(time.strptime(Afred160HTTP.info()['Last-Modified'][5:],'%d %b %Y %X %Z')))
-                StatusAge = int(time.time()) - HttpDate
-
-                print('>>> Age =',StatusAge,'Sec.')
-
-                if StatusAge > MaxStatusAge:
-                    Afred160HTTP.close()
-                    self.__alert('++ alfred-json-160.json is too old !!!\n')
-                    self.AnalyseOnly = True
-                    return
-
-                json160Dict = json.loads(Afred160HTTP.read().decode('utf-8'))
-                Afred160HTTP.close()
-            except:
-                print('** need retry ...')
-                json160Dict = None
-                time.sleep(2)
+        if HttpFile['StatusAge'] is not None and HttpFile['StatusAge'] > MaxStatusAge:
+            self.__alert('++ alfred-json-160.json is too old !!!\n')
+            self.AnalyseOnly = True
+            return
 
         if json160Dict is None:
             self.__alert('++ Error on loading alfred-json-160.json !!!\n')
@@ -884,22 +1112,22 @@ class ffNodeInfo:
             ffNodeMAC = ffNodeID[0:2] + ':' + ffNodeID[2:4] + ':' + ffNodeID[4:6] + ':' + ffNodeID[6:8] + ':' + ffNodeID[8:10] + ':' + ffNodeID[10:22]
 
             if ffNodeMAC in self.ffNodeDict:
-                if self.ffNodeDict[ffNodeMAC]['Status'] not in OnlineStates:
-                    self.ffNodeDict[ffNodeMAC]['Status'] = ' '
+                if self.ffNodeDict[ffNodeMAC].Status not in OnlineStates:
+                    self.ffNodeDict[ffNodeMAC].Status = ' '
 
                 for MeshIF in ['batadv','wifi']:
                     if MeshIF in json160Dict[NodeItem]:
                         for batXX in json160Dict[NodeItem][MeshIF]:
-                            if batXX not in self.MAC2NodeIDDict:
+                            if MacAdrTemplate.match(batXX) and MacToInt(batXX) not in self.MAC2NodeIDDict:
                                 print('++ batXX missing:',batXX)
-                                self.MAC2NodeIDDict[batXX] = ffNodeMAC
+                                self.__SetMainMAC(MacToInt(batXX),ffNodeMAC)
 
                             if 'neighbours' in json160Dict[NodeItem][MeshIF][batXX]:
                                 for ffNeighbour in json160Dict[NodeItem][MeshIF][batXX]['neighbours']:
-                                    if ((MacAdrTemplate.match(ffNeighbour) and not GwAllMacTemplate.match(ffNeighbour)) and
-                                        (ffNeighbour not in self.ffNodeDict[ffNodeMAC]['Neighbours'])):
+                                    NeighbourMacInt = self.__GetNeighbourMacInt(ffNeighbour)
 
-                                        self.ffNodeDict[ffNodeMAC]['Neighbours'].append(ffNeighbour)
+                                    if NeighbourMacInt is not None:
+                                        self.ffNodeDict[ffNodeMAC].Neighbours.add(NeighbourMacInt)
 
             else:
                 print('++ Node unknown:',ffNodeMAC)
@@ -914,218 +1142,181 @@ class ffNodeInfo:
     #
     #   Load and analyse raw.json
     #
-    # RawJsonDict <- raw.json
+    # RawNodeDict <- raw.json (streamed Node by Node)
     #
     # self.ffNodeDict[ffNodeMAC] -> all Infos of ffNode
     # self.MAC2NodeIDDict[ffNode] -> Main MAC
     #-----------------------------------------------------------------------
     def __LoadRawJson(self):
 
-        print('Loading raw.json ...')
-        RawJsonDict = None
-        Retries = 5
+        RawJsonFile = self.__GetHttpFile(RawJsonName)['JsonFile']
 
-        while RawJsonDict is None and Retries > 0:
-            Retries -= 1
-
-            try:
-                passman = urllib.request.HTTPPasswordMgrWithDefaultRealm()
-                passman.add_password(None, self.__RawAccess['URL'], self.__RawAccess['Username'], self.__RawAccess['Password'])
-                authhandler = urllib.request.HTTPBasicAuthHandler(passman)
-                opener = urllib.request.build_opener(authhandler)
-                urllib.request.install_opener(opener)
-
-                RawJsonHTTP = urllib.request.urlopen(self.__RawAccess['URL'],timeout=15)
-                print('... is open ...')
-                RawJsonDict = json.loads(RawJsonHTTP.read().decode('utf-8'))
-                RawJsonHTTP.close()
-            except:
-                print('** need retry ...')
-                RawJsonDict = None
-                time.sleep(2)
-
-        if RawJsonDict is None:
+        if RawJsonFile is None:
             self.__alert('++ Error on loading raw.json !!!\n')
 #            self.AnalyseOnly = True
             return
 
         print('Analysing raw.json ...')
 
-        UnixTime = int(time.time())
+        UnixTime = self.__DataAccess.UnixTime()
         NewestTime = 0
         NodeCount = 0
 
-        for ffNodeKey in RawJsonDict.keys():
-            if 'nodeinfo' in RawJsonDict[ffNodeKey] and 'statistics' in RawJsonDict[ffNodeKey] and 'lastseen' in RawJsonDict[ffNodeKey]:
+        StreamOK = True
 
-                if RawJsonDict[ffNodeKey]['nodeinfo']['node_id'] != ffNodeKey or RawJsonDict[ffNodeKey]['statistics']['node_id'] != ffNodeKey:
-                    print('++ NodeID-Mismatch:',RawJsonDict[ffNodeKey]['nodeinfo']['node_id'],ffNodeKey)
-                    continue
+        try:
+            for (ffNodeKey,RawNodeDict) in self.__StreamJsonDict(RawJsonFile):
+                if 'nodeinfo' in RawNodeDict and 'statistics' in RawNodeDict and 'lastseen' in RawNodeDict:
 
-                ffNodeMAC = RawJsonDict[ffNodeKey]['nodeinfo']['network']['mac'].strip().lower()
+                    if RawNodeDict['nodeinfo']['node_id'] != ffNodeKey or RawNodeDict['statistics']['node_id'] != ffNodeKey:
+                        print('++ NodeID-Mismatch:',RawNodeDict['nodeinfo']['node_id'],ffNodeKey)
+                        continue
 
-                if not MacAdrTemplate.match(ffNodeMAC):
-                    print('!! Invalid MAC Format:',ffNodeKey,ffNodeMAC)
-                    continue
+                    ffNodeMAC = RawNodeDict['nodeinfo']['network']['mac'].strip().lower()
 
-                ffNodeID = ffNodeMAC.replace(':','')
+                    if not MacAdrTemplate.match(ffNodeMAC):
+                        print('!! Invalid MAC Format:',ffNodeKey,ffNodeMAC)
+                        continue
 
-                if ffNodeID != ffNodeKey[:12].lower():
-                    print('++ NodeID-MAC-Mismatch:',ffNodeKey,'<->',ffNodeID,'=',ffNodeMAC)
-                    continue
+                    ffNodeID = ffNodeMAC.replace(':','')
 
-                if not GwAllMacTemplate.match(ffNodeMAC):
-                    if (('software' not in RawJsonDict[ffNodeKey]['nodeinfo']) or
-                          ('firmware' not in RawJsonDict[ffNodeKey]['nodeinfo']['software']) or
-                          ('release' not in RawJsonDict[ffNodeKey]['nodeinfo']['software']['firmware']) or
-                          (RawJsonDict[ffNodeKey]['nodeinfo']['software']['firmware']['release'] is None) or
-                          ('hostname' not in RawJsonDict[ffNodeKey]['nodeinfo']) or
-                          ('network' not in RawJsonDict[ffNodeKey]['nodeinfo'])):
-                        print('++ Invalid Record:',ffNodeKey,'=',ffNodeMAC)
+                    if ffNodeID != ffNodeKey[:12].lower():
+                        print('++ NodeID-MAC-Mismatch:',ffNodeKey,'<->',ffNodeID,'=',ffNodeMAC)
                         continue
 
-                    LastSeen = int(calendar.timegm(time.strptime(RawJsonDict[ffNodeKey]['lastseen'], '%Y-%m-%dT%H:%M:%S.%fZ')))
-                    if LastSeen > NewestTime:
-                        NewestTime = LastSeen
+                    if not GwAllMacTemplate.match(ffNodeMAC):
+                        if (('software' not in RawNodeDict['nodeinfo']) or
+                              ('firmware' not in RawNodeDict['nodeinfo']['software']) or
+                              ('release' not in RawNodeDict['nodeinfo']['software']['firmware']) or
+                              (RawNodeDict['nodeinfo']['software']['firmware']['release'] is None) or
+                              ('hostname' not in RawNodeDict['nodeinfo']) or
+                              ('network' not in RawNodeDict['nodeinfo'])):
+                            print('++ Invalid Record:',ffNodeKey,'=',ffNodeMAC)
+                            continue
+
+                        LastSeen = int(calendar.timegm(time.strptime(RawNodeDict['lastseen'], '%Y-%m-%dT%H:%M:%S.%fZ')))
+                        if LastSeen > NewestTime:
+                            NewestTime = LastSeen
+
+                        if ffNodeMAC in self.ffNodeDict:
+                            if self.ffNodeDict[ffNodeMAC].RawKey is None:
+                                self.ffNodeDict[ffNodeMAC].RawKey = ffNodeKey
+                            else:
+                                if self.ffNodeDict[ffNodeMAC].last_online > LastSeen:
+                                    continue    # newer Duplicate already in raw.json
+                                else:
+                                    print('-+ Upd. RAW:',ffNodeKey,'=',ffNodeMAC,'= \''+RawNodeDict['nodeinfo']['hostname']+'\'')
+                                    self.ffNodeDict[ffNodeMAC].RawKey = ffNodeKey
 
-                    if ffNodeMAC in self.ffNodeDict:
-                        if self.ffNodeDict[ffNodeMAC]['RawKey'] is None:
-                            self.ffNodeDict[ffNodeMAC]['RawKey'] = ffNodeKey
                         else:
-                            if self.ffNodeDict[ffNodeMAC]['last_online'] > LastSeen:
-                                continue    # newer Duplicate already in raw.json
-                            else:
-                                print('-+ Upd. RAW:',ffNodeKey,'=',ffNodeMAC,'= \''+RawJsonDict[ffNodeKey]['nodeinfo']['hostname']+'\'')
-                                self.ffNodeDict[ffNodeMAC]['RawKey'] = ffNodeKey
+                            print('++ New Node:',ffNodeKey,'=',ffNodeMAC,'= \''+RawNodeDict['nodeinfo']['hostname']+'\'')
+                            self.__SetMainMAC(MacToInt(ffNodeMAC),ffNodeMAC)
 
-                    else:
-                        print('++ New Node:',ffNodeKey,'=',ffNodeMAC,'= \''+RawJsonDict[ffNodeKey]['nodeinfo']['hostname']+'\'')
-                        self.MAC2NodeIDDict[ffNodeMAC] = ffNodeMAC
-
-                        self.ffNodeDict[ffNodeMAC] = {
-                            'RawKey': ffNodeKey,
-                            'Name': RawJsonDict[ffNodeKey]['nodeinfo']['hostname'],
-                            'Status': '#',
-                            'last_online': 0,
-                            'Uptime': 0.0,
-                            'Clients': 0,
-                            'Latitude': None,
-                            'Longitude': None,
-                            'ZIP': None,
-                            'Region': '??',
-                            'DestSeg': None,
-                            'GluonType': NODETYPE_UNKNOWN,
-                            'MeshMACs':[],
-                            'IPv6': None,
-                            'Segment': None,
-                            'SegMode': 'auto',
-                            'KeyDir': '',
-                            'KeyFile': '',
-                            'FastdKey': '',
-                            'InCloud': None,
-                            'Neighbours': [],
-                            'Owner': None
-                        }
-
-
-                    if LastSeen > self.ffNodeDict[ffNodeMAC]['last_online']:
-                        self.ffNodeDict[ffNodeMAC]['last_online'] = LastSeen
-                        self.ffNodeDict[ffNodeMAC]['Clients'] = 0
-
-                        if 'clients' in RawJsonDict[ffNodeKey]['statistics']:
-                            if RawJsonDict[ffNodeKey]['statistics']['clients'] is not None:
-                                if 'total' in RawJsonDict[ffNodeKey]['statistics']['clients']:
-                                    self.ffNodeDict[ffNodeMAC]['Clients'] = int(RawJsonDict[ffNodeKey]['statistics']['clients']['total'])
-                                else:
-                                    print('!!! total statistics missing:',ffNodeKey)
+                            self.ffNodeDict[ffNodeMAC] = ffNodeRecord(RawNodeDict['nodeinfo']['hostname'],'#',0,RawKey = ffNodeKey)
 
-                        if self.ffNodeDict[ffNodeMAC]['Name'] != RawJsonDict[ffNodeKey]['nodeinfo']['hostname']:
-                            print('++ Hostname mismatch:',ffNodeMAC,'=',self.ffNodeDict[ffNodeMAC]['Name']+'\' -> \''+RawJsonDict[ffNodeKey]['nodeinfo']['hostname']+'\'')
-                            self.ffNodeDict[ffNodeMAC]['Name'] = RawJsonDict[ffNodeKey]['nodeinfo']['hostname']
 
-                        if 'location' in RawJsonDict[ffNodeKey]['nodeinfo']:
-                            if 'latitude' in RawJsonDict[ffNodeKey]['nodeinfo']['location'] and 'longitude' in RawJsonDict[ffNodeKey]['nodeinfo']['location']:
-                                self.ffNodeDict[ffNodeMAC]['Latitude']  = RawJsonDict[ffNodeKey]['nodeinfo']['location']['latitude']
-                                self.ffNodeDict[ffNodeMAC]['Longitude'] = RawJsonDict[ffNodeKey]['nodeinfo']['location']['longitude']
+                        if LastSeen > self.ffNodeDict[ffNodeMAC].last_online:
+                            self.ffNodeDict[ffNodeMAC].last_online = LastSeen
+                            self.ffNodeDict[ffNodeMAC].Clients = 0
 
-                            if 'zip' in RawJsonDict[ffNodeKey]['nodeinfo']['location']:
-                                self.ffNodeDict[ffNodeMAC]['ZIP'] = str(RawJsonDict[ffNodeKey]['nodeinfo']['location']['zip'])[:5]
+                            if 'clients' in RawNodeDict['statistics']:
+                                if RawNodeDict['statistics']['clients'] is not None:
+                                    if 'total' in RawNodeDict['statistics']['clients']:
+                                        self.ffNodeDict[ffNodeMAC].Clients = int(RawNodeDict['statistics']['clients']['total'])
+                                    else:
+                                        print('!!! total statistics missing:',ffNodeKey)
+
+                            if self.ffNodeDict[ffNodeMAC].Name != RawNodeDict['nodeinfo']['hostname']:
+                                print('++ Hostname mismatch:',ffNodeMAC,'=',self.ffNodeDict[ffNodeMAC].Name+'\' -> \''+RawNodeDict['nodeinfo']['hostname']+'\'')
+                                self.ffNodeDict[ffNodeMAC].Name = RawNodeDict['nodeinfo']['hostname']
+
+                            if 'location' in RawNodeDict['nodeinfo']:
+                                if 'latitude' in RawNodeDict['nodeinfo']['location'] and 'longitude' in RawNodeDict['nodeinfo']['location']:
+                                    self.ffNodeDict[ffNodeMAC].Latitude  = RawNodeDict['nodeinfo']['location']['latitude']
+                                    self.ffNodeDict[ffNodeMAC].Longitude = RawNodeDict['nodeinfo']['location']['longitude']
 
-                        if 'owner' in RawJsonDict[ffNodeKey]['nodeinfo']:
-                            if 'contact' in RawJsonDict[ffNodeKey]['nodeinfo']['owner']:
-                                self.ffNodeDict[ffNodeMAC]['Owner'] = RawJsonDict[ffNodeKey]['nodeinfo']['owner']['contact']
+                                if 'zip' in RawNodeDict['nodeinfo']['location']:
+                                    self.ffNodeDict[ffNodeMAC].ZIP = str(RawNodeDict['nodeinfo']['location']['zip'])[:5]
 
-                        if 'mesh' in RawJsonDict[ffNodeKey]['nodeinfo']['network']:
-                            for InterfaceType in RawJsonDict[ffNodeKey]['nodeinfo']['network']['mesh']['bat0']['interfaces']:
-                                for MeshMAC in RawJsonDict[ffNodeKey]['nodeinfo']['network']['mesh']['bat0']['interfaces'][InterfaceType]:
+                            if 'owner' in RawNodeDict['nodeinfo']:
+                                if 'contact' in RawNodeDict['nodeinfo']['owner']:
+                                    self.ffNodeDict[ffNodeMAC].Owner = RawNodeDict['nodeinfo']['owner']['contact']
+
+                            if 'mesh' in RawNodeDict['nodeinfo']['network']:
+                                for InterfaceType in RawNodeDict['nodeinfo']['network']['mesh']['bat0']['interfaces']:
+                                    for MeshMAC in RawNodeDict['nodeinfo']['network']['mesh']['bat0']['interfaces'][InterfaceType]:
+                                        if self.__AddGluonMACs(ffNodeMAC,MeshMAC) is not None:
+                                            LastSeen = 0
+                                            break
+
+                            elif 'mesh_interfaces' in RawNodeDict['nodeinfo']['network']:
+                                for MeshMAC in RawNodeDict['nodeinfo']['network']['mesh_interfaces']:
                                     if self.__AddGluonMACs(ffNodeMAC,MeshMAC) is not None:
                                         LastSeen = 0
                                         break
 
-                        elif 'mesh_interfaces' in RawJsonDict[ffNodeKey]['nodeinfo']['network']:
-                            for MeshMAC in RawJsonDict[ffNodeKey]['nodeinfo']['network']['mesh_interfaces']:
-                                if self.__AddGluonMACs(ffNodeMAC,MeshMAC) is not None:
-                                    LastSeen = 0
-                                    break
+                        if UnixTime - LastSeen < MaxOfflineTime:
+                            NodeCount += 1
 
-                    if UnixTime - LastSeen < MaxOfflineTime:
-                        NodeCount += 1
+                            if self.ffNodeDict[ffNodeMAC].Status not in OnlineStates:
+                                self.ffNodeDict[ffNodeMAC].Status = ' '   # -> online
+#                                print('>>> Node is online:',ffNodeKey,'=',ffNodeMAC,'= \''+RawNodeDict['nodeinfo']['hostname']+'\'')
 
-                        if self.ffNodeDict[ffNodeMAC]['Status'] not in OnlineStates:
-                            self.ffNodeDict[ffNodeMAC]['Status'] = ' '   # -> online
-#                            print('>>> Node is online:',ffNodeKey,'=',ffNodeMAC,'= \''+RawJsonDict[ffNodeKey]['nodeinfo']['hostname']+'\'')
+                            if 'neighbours' in RawNodeDict:
+                                for InterfaceType in ['batadv','wifi']:
+                                    if InterfaceType in RawNodeDict['neighbours']:
+                                        for MeshMAC in RawNodeDict['neighbours'][InterfaceType]:
 
-                        if 'neighbours' in RawJsonDict[ffNodeKey]:
-                            for InterfaceType in ['batadv','wifi']:
-                                if InterfaceType in RawJsonDict[ffNodeKey]['neighbours']:
-                                    for MeshMAC in RawJsonDict[ffNodeKey]['neighbours'][InterfaceType]:
+                                            if 'neighbours' in RawNodeDict['neighbours'][InterfaceType][MeshMAC]:
+                                                for ffNeighbour in RawNodeDict['neighbours'][InterfaceType][MeshMAC]['neighbours']:
+                                                    NeighbourMacInt = self.__GetNeighbourMacInt(ffNeighbour)
 
-                                        if 'neighbours' in RawJsonDict[ffNodeKey]['neighbours'][InterfaceType][MeshMAC]:
-                                            for ffNeighbour in RawJsonDict[ffNodeKey]['neighbours'][InterfaceType][MeshMAC]['neighbours']:
-                                                if ((MacAdrTemplate.match(ffNeighbour) and not GwAllMacTemplate.match(ffNeighbour)) and
-                                                    (ffNeighbour not in self.ffNodeDict[ffNodeMAC]['Neighbours'])):
+                                                    if NeighbourMacInt is not None:
+                                                        self.ffNodeDict[ffNodeMAC].Neighbours.add(NeighbourMacInt)
 
-                                                    self.ffNodeDict[ffNodeMAC]['Neighbours'].append(ffNeighbour)
+                            if 'addresses' in RawNodeDict['nodeinfo']['network']:
+                                for NodeAddress in RawNodeDict['nodeinfo']['network']['addresses']:
+                                    if ffsIPv6Template.match(NodeAddress):
+                                        self.ffNodeDict[ffNodeMAC].IPv6 = NodeAddress
+                                        self.ffNodeDict[ffNodeMAC].Segment = int(NodeAddress[12:14])
 
-                        if 'addresses' in RawJsonDict[ffNodeKey]['nodeinfo']['network']:
-                            for NodeAddress in RawJsonDict[ffNodeKey]['nodeinfo']['network']['addresses']:
-                                if ffsIPv6Template.match(NodeAddress):
-                                    self.ffNodeDict[ffNodeMAC]['IPv6'] = NodeAddress
-                                    self.ffNodeDict[ffNodeMAC]['Segment'] = int(NodeAddress[12:14])
+                            if 'gateway' in RawNodeDict['statistics']:
+                                if RawNodeDict['statistics']['gateway'][:9] == '02:00:0a:':
+                                    self.ffNodeDict[ffNodeMAC].Segment = int(RawNodeDict['statistics']['gateway'][12:14])
+                                elif GwNewMacTemplate.match(RawNodeDict['statistics']['gateway']):
+                                    self.ffNodeDict[ffNodeMAC].Segment = int(RawNodeDict['statistics']['gateway'][9:11])
 
-                        if 'gateway' in RawJsonDict[ffNodeKey]['statistics']:
-                            if RawJsonDict[ffNodeKey]['statistics']['gateway'][:9] == '02:00:0a:':
-                                self.ffNodeDict[ffNodeMAC]['Segment'] = int(RawJsonDict[ffNodeKey]['statistics']['gateway'][12:14])
-                            elif GwNewMacTemplate.match(RawJsonDict[ffNodeKey]['statistics']['gateway']):
-                                self.ffNodeDict[ffNodeMAC]['Segment'] = int(RawJsonDict[ffNodeKey]['statistics']['gateway'][9:11])
+                            if 'mesh_vpn' in RawNodeDict['statistics']:
+                                if 'groups' in RawNodeDict['statistics']['mesh_vpn']:
+                                    if 'backbone' in RawNodeDict['statistics']['mesh_vpn']['groups']:
+                                        if 'peers' in RawNodeDict['statistics']['mesh_vpn']['groups']['backbone']:
+                                            GWpeers = RawNodeDict['statistics']['mesh_vpn']['groups']['backbone']['peers']
 
-                        if 'mesh_vpn' in RawJsonDict[ffNodeKey]['statistics']:
-                            if 'groups' in RawJsonDict[ffNodeKey]['statistics']['mesh_vpn']:
-                                if 'backbone' in RawJsonDict[ffNodeKey]['statistics']['mesh_vpn']['groups']:
-                                    if 'peers' in RawJsonDict[ffNodeKey]['statistics']['mesh_vpn']['groups']['backbone']:
-                                        GWpeers = RawJsonDict[ffNodeKey]['statistics']['mesh_vpn']['groups']['backbone']['peers']
+                                            for Uplink in GWpeers:
+                                                if GWpeers[Uplink] is not None:
+                                                    if 'established' in GWpeers[Uplink]:
+                                                        self.ffNodeDict[ffNodeMAC].Status = 'V'
 
-                                        for Uplink in GWpeers:
-                                            if GWpeers[Uplink] is not None:
-                                                if 'established' in GWpeers[Uplink]:
-                                                    self.ffNodeDict[ffNodeMAC]['Status'] = 'V'
+                            if 'statistics' in RawNodeDict:
+                                if 'uptime' in RawNodeDict['statistics']:
+                                    self.ffNodeDict[ffNodeMAC].Uptime = RawNodeDict['statistics']['uptime']
 
-                        if 'statistics' in RawJsonDict[ffNodeKey]:
-                            if 'uptime' in RawJsonDict[ffNodeKey]['statistics']:
-                                self.ffNodeDict[ffNodeMAC]['Uptime'] = RawJsonDict[ffNodeKey]['statistics']['uptime']
+                        elif UnixTime - LastSeen > MaxInactiveTime:
+#                            print('>>> Old RAW:',ffNodeKey,'=',ffNodeMAC,'= \''+RawNodeDict['nodeinfo']['hostname']+'\''))
+                            self.ffNodeDict[ffNodeMAC].Status = '?'   # -> inactive
 
-                    elif UnixTime - LastSeen > MaxInactiveTime:
-#                        print('>>> Old RAW:',ffNodeKey,'=',ffNodeMAC,'= \''+RawJsonDict[ffNodeKey]['nodeinfo']['hostname']+'\''))
-                        self.ffNodeDict[ffNodeMAC]['Status'] = '?'   # -> inactive
+                        self.__SetSegmentAwareness(ffNodeMAC,RawNodeDict['nodeinfo']['software'])
 
-                    self.__SetSegmentAwareness(ffNodeMAC,RawJsonDict[ffNodeKey]['nodeinfo']['software'])
+                else:
+                    print('** Invalid Record:',ffNodeKey)
 
-            else:
-                print('** Invalid Record:',ffNodeKey)
+        except ValueError as err:
+            self.__alert('!! Error in raw.json: '+str(err))
+            StreamOK = False
 
         print('... %d Nodes done, Age = %d sec.\n' % (NodeCount,UnixTime-NewestTime))
 
-        if (NodeCount > 1000) and ((UnixTime-NewestTime) < 60):
+        if StreamOK and (NodeCount > 1000) and ((UnixTime-NewestTime) < 60):
             self.AnalyseOnly = False
 
         return
@@ -1143,8 +1334,8 @@ class ffNodeInfo:
         print('Checking Hostnames of Nodes ...')
 
         for ffNodeMAC in self.ffNodeDict:
-            if BadNameTemplate.match(self.ffNodeDict[ffNodeMAC]['Name']):
-                print('!! Invalid ffNode Hostname:',self.ffNodeDict[ffNodeMAC]['Status'],ffNodeMAC,'->','\''+self.ffNodeDict[ffNodeMAC]['Name']+'\'')
+            if BadNameTemplate.match(self.ffNodeDict[ffNodeMAC].Name):
+                print('!! Invalid ffNode Hostname:',self.ffNodeDict[ffNodeMAC].Status,ffNodeMAC,'->','\''+self.ffNodeDict[ffNodeMAC].Name+'\'')
 
         print('... done.\n')
         return
@@ -1168,32 +1359,14 @@ class ffNodeInfo:
         else:
             if ffNodeMAC not in self.ffNodeDict:
 
-                self.ffNodeDict[ffNodeMAC] = {
-                    'RawKey': None,
-                    'Name': FastdKeyInfo['PeerName'],
-                    'Status': '?',
-                    'last_online': 0,
-                    'Uptime': 0.0,
-                    'Clients': 0,
-                    'Latitude': None,
-                    'Longitude': None,
-                    'ZIP': None,
-                    'Region': '??',
-                    'DestSeg': None,
-                    'GluonType': NODETYPE_UNKNOWN,
-                    'MeshMACs':[],
-                    'IPv6': None,
-                    'Segment': int(FastdKeyInfo['SegDir'][3:]),
-                    'SegMode': FastdKeyInfo['SegMode'],
-                    'KeyDir': FastdKeyInfo['SegDir'],
-                    'KeyFile': KeyIndex,
-                    'FastdKey': FastdKeyInfo['PeerKey'],
-                    'InCloud': None,
-                    'Neighbours': [],
-                    'Owner': None
-                }
-
-#                self.MAC2NodeIDDict[ffNodeMAC] = ffNodeMAC
+                self.ffNodeDict[ffNodeMAC] = ffNodeRecord(FastdKeyInfo['PeerName'],'?',0,
+                                                          Segment  = int(FastdKeyInfo['SegDir'][3:]),
+                                                          SegMode  = FastdKeyInfo['SegMode'],
+                                                          KeyDir   = FastdKeyInfo['SegDir'],
+                                                          KeyFile  = KeyIndex,
+                                                          FastdKey = FastdKeyInfo['PeerKey'])
+
+#                self.__SetMainMAC(MacToInt(ffNodeMAC),ffNodeMAC)
                 self.__AddGluonMACs(ffNodeMAC,FastdKeyInfo['VpnMAC'])
                 newNode = True
 
@@ -1201,27 +1374,27 @@ class ffNodeInfo:
                     print('!! New VPN-Node:   %s / %s = \'%s\'' % (FastdKeyInfo['SegDir'],ffNodeMAC,FastdKeyInfo['PeerName']))
 
                     if FastdKeyInfo['SegDir'] > 'vpn08':
-                        self.ffNodeDict[ffNodeMAC]['GluonType'] = NODETYPE_DNS_SEGASSIGN
+                        self.ffNodeDict[ffNodeMAC].GluonType = NODETYPE_DNS_SEGASSIGN
                     else:
-                        self.ffNodeDict[ffNodeMAC]['GluonType'] = NODETYPE_SEGMENT_LIST
+                        self.ffNodeDict[ffNodeMAC].GluonType = NODETYPE_SEGMENT_LIST
 
             else:   # updating existing node
-                self.ffNodeDict[ffNodeMAC]['SegMode']  = FastdKeyInfo['SegMode']
-                self.ffNodeDict[ffNodeMAC]['KeyDir']   = FastdKeyInfo['SegDir']
-                self.ffNodeDict[ffNodeMAC]['KeyFile']  = KeyIndex
-                self.ffNodeDict[ffNodeMAC]['FastdKey'] = FastdKeyInfo['PeerKey']
+                self.ffNodeDict[ffNodeMAC].SegMode  = FastdKeyInfo['SegMode']
+                self.ffNodeDict[ffNodeMAC].KeyDir   = FastdKeyInfo['SegDir']
+                self.ffNodeDict[ffNodeMAC].KeyFile  = KeyIndex
+                self.ffNodeDict[ffNodeMAC].FastdKey = FastdKeyInfo['PeerKey']
 
             if FastdKeyInfo['VpnMAC'] != '':
-                if self.ffNodeDict[ffNodeMAC]['Status'] == '?':
-                    print('!! Node is alive:  %s / %s -> %s = \'%s\'' % (FastdKeyInfo['SegDir'],FastdKeyInfo['VpnMAC'],ffNodeMAC,self.ffNodeDict[ffNodeMAC]['Name']))
-                elif self.ffNodeDict[ffNodeMAC]['Status'] != 'V':
-                    print('!! Node is online: %s / %s -> %s = \'%s\'' % (FastdKeyInfo['SegDir'],FastdKeyInfo['VpnMAC'],ffNodeMAC,self.ffNodeDict[ffNodeMAC]['Name']))
+                if self.ffNodeDict[ffNodeMAC].Status == '?':
+                    print('!! Node is alive:  %s / %s -> %s = \'%s\'' % (FastdKeyInfo['SegDir'],FastdKeyInfo['VpnMAC'],ffNodeMAC,self.ffNodeDict[ffNodeMAC].Name))
+                elif self.ffNodeDict[ffNodeMAC].Status != 'V':
+                    print('!! Node is online: %s / %s -> %s = \'%s\'' % (FastdKeyInfo['SegDir'],FastdKeyInfo['VpnMAC'],ffNodeMAC,self.ffNodeDict[ffNodeMAC].Name))
 
-                self.ffNodeDict[ffNodeMAC]['Segment'] = int(FastdKeyInfo['SegDir'][3:])
-                self.ffNodeDict[ffNodeMAC]['Status'] = 'V'
+                self.ffNodeDict[ffNodeMAC].Segment = int(FastdKeyInfo['SegDir'][3:])
+                self.ffNodeDict[ffNodeMAC].Status = 'V'
 
-                if FastdKeyInfo['LastConn'] > self.ffNodeDict[ffNodeMAC]['last_online']:
-                    self.ffNodeDict[ffNodeMAC]['last_online'] = FastdKeyInfo['LastConn']
+                if FastdKeyInfo['LastConn'] > self.ffNodeDict[ffNodeMAC].last_online:
+                    self.ffNodeDict[ffNodeMAC].last_online = FastdKeyInfo['LastConn']
 
         return newNode
 
@@ -1237,7 +1410,7 @@ class ffNodeInfo:
         if not ffNodeMAC in self.ffNodeDict:
             return False
 
-        return (self.ffNodeDict[ffNodeMAC]['Status'] in OnlineStates)
+        return (self.ffNodeDict[ffNodeMAC].Status in OnlineStates)
 
 
 
@@ -1246,11 +1419,12 @@ class ffNodeInfo:
     #
     #   Verify Tunnel-MAC / Main-MAC with batman Debug Tables TG and O
     #
+    #   Originator Tables are kept for Detection of Uplinks in GetUplinkList.
     #==============================================================================
     def GetBatmanNodeMACs(self,SegmentList):
 
         print('\nAnalysing Batman Tables ...')
-        UnixTime = int(time.time())
+        UnixTime = self.__DataAccess.UnixTime()
         TotalNodes = 0
         TotalClients = 0
 
@@ -1262,8 +1436,7 @@ class ffNodeInfo:
             BatctlCmd = ('/usr/sbin/batctl -m bat%02d tg' % (ffSeg)).split()
 
             try:
-                BatctlTg = subprocess.run(BatctlCmd, stdout=subprocess.PIPE)
-                BatctlResult = BatctlTg.stdout.decode('utf-8')
+                BatctlResult = self.__DataAccess.RunCommand(BatctlCmd)
             except:
                 print('++ ERROR accessing batman:',BatctlCmd)
                 BatmanTransTable = None
@@ -1290,15 +1463,15 @@ class ffNodeInfo:
                                     self.__AddGluonMACs(ffNodeMAC,ffMeshMAC)
 
                                     if ffNodeMAC in self.ffNodeDict:
-                                        if ffMeshMAC in self.MAC2NodeIDDict and self.MAC2NodeIDDict[ffMeshMAC] != ffNodeMAC:
-                                            print('!! MAC mismatch Mesh -> Client: Batman <> NodeDict:',ffMeshMAC,'->',ffNodeMAC,'<>',self.MAC2NodeIDDict[ffMeshMAC])
+                                        if MacToInt(ffMeshMAC) in self.MAC2NodeIDDict and self.MAC2NodeIDDict[MacToInt(ffMeshMAC)] != ffNodeMAC:
+                                            print('!! MAC mismatch Mesh -> Client: Batman <> NodeDict:',ffMeshMAC,'->',ffNodeMAC,'<>',self.MAC2NodeIDDict[MacToInt(ffMeshMAC)])
 
-                                        self.ffNodeDict[ffNodeMAC]['Segment'] = ffSeg
-                                        self.ffNodeDict[ffNodeMAC]['last_online'] = UnixTime
+                                        self.ffNodeDict[ffNodeMAC].Segment = ffSeg
+                                        self.ffNodeDict[ffNodeMAC].last_online = UnixTime
 
-                                        if self.ffNodeDict[ffNodeMAC]['Status'] not in OnlineStates:
-                                            self.ffNodeDict[ffNodeMAC]['Status'] = ' '
-                                            print('    >> Node is online:',ffNodeMAC,'= \''+self.ffNodeDict[ffNodeMAC]['Name']+'\'')
+                                        if self.ffNodeDict[ffNodeMAC].Status not in OnlineStates:
+                                            self.ffNodeDict[ffNodeMAC].Status = ' '
+                                            print('    >> Node is online:',ffNodeMAC,'= \''+self.ffNodeDict[ffNodeMAC].Name+'\'')
                                     else:
                                         print('++ New Node in Batman Translation Table:',ffSeg,'/',ffNodeMAC)
 
@@ -1314,356 +1487,330 @@ class ffNodeInfo:
             BatctlCmd = ('/usr/sbin/batctl -m bat%02d o' % (ffSeg)).split()
 
             try:
-                BatctlO = subprocess.run(BatctlCmd, stdout=subprocess.PIPE)
-                BatctlResult = BatctlO.stdout.decode('utf-8')
+                BatctlResult = self.__DataAccess.RunCommand(BatctlCmd)
             except:
                 print('++ ERROR accessing batman:',BatctlCmd)
                 BatmanOriginTable = None
             else:
+                OriginDict = {}
+
                 for OriginItem in BatctlResult.split('\n'):
                     BatctlInfo = OriginItem.split()
 
                     for InfoColumn in BatctlInfo:
                         if MacAdrTemplate.match(InfoColumn) and not GwAllMacTemplate.match(InfoColumn):
-                            if InfoColumn not in self.MAC2NodeIDDict:
+                            if MacToInt(InfoColumn) not in self.MAC2NodeIDDict:
                                 print('++ Unknown Node in Batman Originator Table:',ffSeg,'/',InfoColumn)
 
                             break   # not neccessary to parse rest of line
 
+                    #---------- Originator -> Nexthop of best Route ('*') ----------
+                    OriginMacList = [ InfoColumn for InfoColumn in BatctlInfo if MacAdrTemplate.match(InfoColumn) ]
+
+                    if len(OriginMacList) > 1 and ('*' in BatctlInfo or OriginMacList[0] not in OriginDict):
+                        OriginDict[OriginMacList[0]] = OriginMacList[1]
+
+                self.__BatmanOriginDict[ffSeg] = OriginDict
+
         print('\nTotalNodes / TotalClients =',TotalNodes,'/',TotalClients)
         print('... done.\n')
         return
 
 
 
-    #==============================================================================
-    # Method "GetUplinkList"
+    #-----------------------------------------------------------------------
+    # private function "__GetBatmanNodeMAC"
     #
-    #   returns UplinkList from NodeList verified by batman traceroute
+    #   Main MAC of Node with MAC from Batman Table, None if unknown
     #
-    #==============================================================================
-    def GetUplinkList(self,NodeList,SegmentList):
+    #-----------------------------------------------------------------------
+    def __GetBatmanNodeMAC(self,BatmanMAC):
 
-        print('... Analysing Batman Traceroute:',NodeList,'->',SegmentList,'...')
-        UplinkList = []
+        ffNodeMAC = None
 
-        for ffNodeMAC in NodeList:
-            for ffSeg in SegmentList:
-                BatctlCmd = ('/usr/sbin/batctl -m bat%02d tr %s' % (ffSeg,ffNodeMAC)).split()
+        if not GwAllMacTemplate.match(BatmanMAC):
+            if MacToInt(BatmanMAC) in self.MAC2NodeIDDict:
+                ffNodeMAC = self.MAC2NodeIDDict[MacToInt(BatmanMAC)]
+            elif BatmanMAC in self.ffNodeDict:
+                ffNodeMAC = BatmanMAC
 
-                try:
-                    BatctlTr = subprocess.run(BatctlCmd, stdout=subprocess.PIPE)
-                    BatctlResult = BatctlTr.stdout.decode('utf-8')
-                except:
-                    print('++ ERROR accessing batman:',BatctlCmd)
-                else:
-                    MeshMAC = None
-
-                    for BatctlLine in BatctlResult.split('\n'):
-                        BatctlInfo = BatctlLine.replace('(',' ').replace(')',' ').split()
-#                        print(MeshMAC,BatctlInfo)
-
-                        if len(BatctlInfo) > 3:
-                            if BatctlInfo[0] == 'traceroute':
-                                MeshMAC = BatctlInfo[3]
-                            elif MeshMAC is not None:
-                                if MacAdrTemplate.match(BatctlInfo[1]) and not GwAllMacTemplate.match(BatctlInfo[1]):
-                                    if BatctlInfo[1] == MeshMAC:
-                                        UplinkList.append(ffNodeMAC)
-                                        self.ffNodeDict[ffNodeMAC]['Status'] = 'V'
-                                    break
+        return ffNodeMAC
 
-        if len(UplinkList) < 1:
-            UplinkList = None
 
-        return UplinkList
 
+    #-----------------------------------------------------------------------
+    # private function "__GetBatmanUplinkDict"
+    #
+    #   Uplinks of Segment from Originator Table (once per Run):
+    #
+    #     Nexthop is MAC of Node itself      -> True  (reached directly over VPN)
+    #     Nexthop is other Node              -> False (meshing)
+    #     Nexthop is Gateway or unknown MAC  -> None  (ambiguous, Traceroute needed)
+    #
+    # -> UplinkDict[ffNodeMAC] -> isUplink, None if no Originator Table
+    #-----------------------------------------------------------------------
+    def __GetBatmanUplinkDict(self,ffSeg):
 
+        with self.__BatctlLock:
+            if ffSeg not in self.__BatmanUplinkDict:
+                UplinkDict = None
 
-    #==============================================================================
-    # Method "DumpMacTable"
-    #
-    #   Dump out MAC-Table
-    #==============================================================================
-    def DumpMacTable(self,FileName):
+                if ffSeg in self.__BatmanOriginDict:
+                    UplinkDict = {}
 
-        print('Write MAC-Table ...')
-        JsonFile = open(os.path.join(self.__DatabasePath,MacDictName), mode='w+')
-        json.dump(self.MAC2NodeIDDict,JsonFile)
-        JsonFile.close()
+                    for OriginMAC in self.__BatmanOriginDict[ffSeg]:
+                        ffNodeMAC = self.__GetBatmanNodeMAC(OriginMAC)
 
-        print('Dump MAC-Table ...')
-        MacTableFile = open(FileName, mode='w')
-        MacTableFile.write('--------------------------------------------\n')
-        MacTableFile.write('%-20s -> %-20s\n' % ('FF-MAC', 'Main-MAC'))
-        MacTableFile.write('--------------------------------------------\n')
+                        if ffNodeMAC is not None:
+                            NexthopMAC = self.__BatmanOriginDict[ffSeg][OriginMAC]
+                            ffNexthopMAC = self.__GetBatmanNodeMAC(NexthopMAC)
 
-        for ffNodeMAC in sorted(self.MAC2NodeIDDict):
-            MacTableFile.write('%-20s -> %-20s\n' % (ffNodeMAC, self.MAC2NodeIDDict[ffNodeMAC]))
+                            if NexthopMAC == OriginMAC or ffNexthopMAC == ffNodeMAC:
+                                isUplink = True
+                            elif ffNexthopMAC is not None:
+                                isUplink = False
+                            else:
+                                isUplink = None
 
-        MacTableFile.close()
-        print('... done.\n')
-        return
+                            if ffNodeMAC in UplinkDict and UplinkDict[ffNodeMAC] != isUplink:
+                                UplinkDict[ffNodeMAC] = None    # several Originators of Node with different Routes
+                            else:
+                                UplinkDict[ffNodeMAC] = isUplink
 
+                self.__BatmanUplinkDict[ffSeg] = UplinkDict
 
+        return self.__BatmanUplinkDict[ffSeg]
 
-    #-------------------------------------------------------------
-    # private function "__SetupZip2GpsData"
+
+
+    #-----------------------------------------------------------------------
+    # private function "__RunBatctlTrace"
     #
-    #     Load ZIP File of OpenGeoDB Project
+    #   Batman Traceroute to Node in Segment (runs in Worker Pool)
     #
-    #-------------------------------------------------------------
-    def __SetupZip2GpsData(self):
-
-        print('Setting up ZIP-to-GPS Data ...')
+    # -> TraceResult = { 'Command','Error','MeshMAC','HopMAC' }
+    #    HopMAC = first Hop which is not a Gateway (None if no Answer)
+    #-----------------------------------------------------------------------
+    def __RunBatctlTrace(self,ffSeg,ffNodeMAC):
 
-        Zip2GpsDict = None
-        ZipCount = 0
+        BatctlCmd = ('/usr/sbin/batctl -m bat%02d tr %s' % (ffSeg,ffNodeMAC)).split()
+        TraceResult = { 'Command':BatctlCmd, 'Error':False, 'MeshMAC':None, 'HopMAC':None }
 
         try:
-            with open(os.path.join(self.__DatabasePath,Zip2GpsName), mode='r') as Zip2GpsFile:
-                Zip2GpsDict = json.load(Zip2GpsFile)
+            BatctlResult = self.__DataAccess.RunCommand(BatctlCmd,BatctlTimeout)
         except:
-            print('!! ERROR on setting up ZIP-to GPS Data')
-            Zip2GpsDict = None
+            TraceResult['Error'] = True
         else:
-            ZipCount = len(Zip2GpsDict)
+            for BatctlLine in BatctlResult.split('\n'):
+                BatctlInfo = BatctlLine.replace('(',' ').replace(')',' ').split()
+
+                if len(BatctlInfo) > 3:
+                    if BatctlInfo[0] == 'traceroute':
+                        TraceResult['MeshMAC'] = BatctlInfo[3]
+                    elif TraceResult['MeshMAC'] is not None:
+                        if MacAdrTemplate.match(BatctlInfo[1]) and not GwAllMacTemplate.match(BatctlInfo[1]):
+                            TraceResult['HopMAC'] = BatctlInfo[1]
+                            break
 
-        print('... ZIP-Codes loaded:',ZipCount,'\n')
-        return Zip2GpsDict
+        return TraceResult
 
 
 
-    #-------------------------------------------------------------
-    # private function "__SetupZipAreaData"
+    #-----------------------------------------------------------------------
+    # private function "__GetBatctlTrace"
     #
-    #     ZipFileDict -> Dictionary of ZIP-Area Files
+    #   Start Batman Traceroute to Node in Segment once per Run
     #
-    #-------------------------------------------------------------
-    def __SetupZipAreaData(self):
-
-        print('Setting up ZIP-Area Data ...')
+    # -> Future of TraceResult
+    #-----------------------------------------------------------------------
+    def __GetBatctlTrace(self,ffSeg,ffNodeMAC):
 
-        ZipAreaFiles = glob(os.path.join(self.__GitPath,'vpn*/zip-areas/?????_*.json'))
-        ZipFileDict  = {}
+        with self.__BatctlLock:
+            if self.__BatctlPool is None:
+                self.__BatctlPool = ThreadPoolExecutor(max_workers=MaxBatctlWorkers)
 
-        for FileName in ZipAreaFiles:
-            ZipCode = os.path.basename(FileName)[:5]
-            ZipFileDict[ZipCode] = { 'FileName':FileName, 'Area':os.path.basename(FileName).split(".")[0], 'Segment':int(FileName.split("/")[-3][3:]) }
+            if (ffSeg,ffNodeMAC) not in self.__BatctlTraceDict:
+                self.__BatctlTraceDict[(ffSeg,ffNodeMAC)] = self.__BatctlPool.submit(self.__RunBatctlTrace,ffSeg,ffNodeMAC)
 
-        if len(ZipFileDict) < 10:
-            print('!! ERROR on registering ZIP-Areas:',len(ZipFileDict),'\n')
-            ZipFileDict = None
-        else:
-            print('... ZIP-Areas registered:',len(ZipFileDict),'\n')
+            TraceFuture = self.__BatctlTraceDict[(ffSeg,ffNodeMAC)]
 
-        return ZipFileDict
+        return TraceFuture
 
 
 
-    #-------------------------------------------------------------
-    # private function "__SetupZipGridData"
+    #==============================================================================
+    # Method "GetUplinkList"
     #
-    #     ZipGridDict -> Grid with ZIP-Codes
+    #   returns UplinkList from NodeList verified by batman originator table,
+    #   batman traceroute is only used for ambiguous Nodes or if the Originator
+    #   Table of the Segment is not available
     #
-    #-------------------------------------------------------------
-    def __SetupZipGridData(self):
-
-        print('Setting up ZIP-Grid Data ...')
-
-        ZipGridDict = None
-        FieldCount  = 0
-
-        try:
-            with open(os.path.join(self.__DatabasePath,ZipGridName), mode='r') as ZipGridFile:
-                ZipGridDict = json.load(ZipGridFile)
-        except:
-            print('!! ERROR on setting up ZIP-Grid Data')
-            ZipGridDict = None
-        else:
-            FieldCount = len(ZipGridDict['Fields'])
+    #   Traceroutes of these Nodes are running in parallel per Segment, Segments
+    #   after the first one answered by a Node are skipped (Nodes of a Mesh-Cloud
+    #   are in the same Batman Segment). Results are kept for the rest of the Run.
+    #
+    #   Messages are appended to MessageList (as Arguments of print) if given,
+    #   so they can be printed later in fixed Order by parallel Callers.
+    #==============================================================================
+    def GetUplinkList(self,NodeList,SegmentList,MessageList=None):
 
-            lon_min = float(ZipGridDict['Meta']['lon_min'])
-            lon_max = float(ZipGridDict['Meta']['lon_max'])
-            lat_min = float(ZipGridDict['Meta']['lat_min'])
-            lat_max = float(ZipGridDict['Meta']['lat_max'])
+        Messages = [ ('... Analysing Batman Traceroute:',NodeList,'->',SegmentList,'...') ]
+        UplinkList = []
 
-            ZipGridDict['Meta']['lon_scale'] = float(ZipGridDict['Meta']['lon_fields']) / (lon_max - lon_min)
-            ZipGridDict['Meta']['lat_scale'] = float(ZipGridDict['Meta']['lat_fields']) / (lat_max - lat_min)
+        for ffSeg in SegmentList:
+            UplinkDict = self.__GetBatmanUplinkDict(ffSeg)
+            TraceFutureDict = {}
+            isAnswered = False
 
-        print('... ZIP-Fields loaded:',FieldCount,'\n')
-        return ZipGridDict
+            for ffNodeMAC in NodeList:
+                if UplinkDict is None or (ffNodeMAC in UplinkDict and UplinkDict[ffNodeMAC] is None):
+                    TraceFutureDict[ffNodeMAC] = self.__GetBatctlTrace(ffSeg,ffNodeMAC)
 
+            for ffNodeMAC in NodeList:
+                isUplink = None
 
+                if ffNodeMAC in TraceFutureDict:
+                    TraceResult = TraceFutureDict[ffNodeMAC].result()
 
-    #-------------------------------------------------------------
-    # private function "__GetZipCodeFromGPS"
-    #
-    #     Get ZIP-Code from GPS using ZIP polygons
-    #
-    #-------------------------------------------------------------
-    def __GetZipCodeFromGPS(self,lon,lat,ZipAreaDict,ZipGridDict):
+                    if TraceResult['Error']:
+                        Messages.append(('++ ERROR accessing batman:',TraceResult['Command']))
+                    elif TraceResult['HopMAC'] is not None:
+                        isUplink = (TraceResult['HopMAC'] == TraceResult['MeshMAC'])
 
-        ZipCodeResult = None
+                elif ffNodeMAC in UplinkDict:
+                    isUplink = UplinkDict[ffNodeMAC]
 
-        if lat is not None and lon is not None:
-            x = int((lon - float(ZipGridDict['Meta']['lon_min'])) * ZipGridDict['Meta']['lon_scale'])
-            y = int((lat - float(ZipGridDict['Meta']['lat_min'])) * ZipGridDict['Meta']['lat_scale'])
+                if isUplink is not None:
+                    isAnswered = True
 
-            if ((x >= 0 and x < ZipGridDict['Meta']['lon_fields']) and
-                (y >= 0 and y < ZipGridDict['Meta']['lat_fields'])):
+                    if isUplink and ffNodeMAC not in UplinkList:
+                        UplinkList.append(ffNodeMAC)
+                        self.ffNodeDict[ffNodeMAC].Status = 'V'
 
-                NodeLocation = Point(lon,lat)
-                FieldIndex = str(y*ZipGridDict['Meta']['lon_fields'] + x)
+            if isAnswered:
+                break
 
-                for ZipCode in ZipGridDict['Fields'][FieldIndex]:
-                    ZipFileName = ZipAreaDict[ZipCode]['FileName']
-                    ZipAreaJson = None
+        if len(UplinkList) < 1:
+            UplinkList = None
 
-                    with open(ZipFileName,"r") as fp:
-                        ZipAreaJson = json.load(fp)
+        if MessageList is None:
+            for Message in Messages:
+                print(*Message)
+        else:
+            MessageList.extend(Messages)
 
-                    if "geometries" in ZipAreaJson:
-                        TrackBase = ZipAreaJson["geometries"][0]["coordinates"]
-                    elif "coordinates" in ZipAreaJson:
-                        TrackBase = ZipJson["coordinates"]
-                    else:
-                        TrackBase = None
-                        print('Problem parsing %s' % ZipFileName)
-                        continue
+        return UplinkList
 
-                    AreaMatch = 0
 
-                    for Track in TrackBase:
-                        Shape = []
 
-                        for t in Track[0]:
-                            Shape.append( (t[0],t[1]) )
+    #==============================================================================
+    # Method "WriteMacDicts"
+    #
+    #   Write MAC-Table and Gluon-MAC Cache to Database
+    #==============================================================================
+    def WriteMacDicts(self):
 
-                        ZipPolygon = Polygon(Shape)
+        print('Write MAC-Table ...')
+        JsonFile = open(os.path.join(self.__DatabasePath,MacDictName), mode='w+')
+        json.dump({ IntToMac(MacInt):self.MAC2NodeIDDict[MacInt] for MacInt in self.MAC2NodeIDDict },JsonFile)
+        JsonFile.close()
 
-                        if ZipPolygon.intersects(NodeLocation):
-                            AreaMatch += 1
+        print('Write Gluon-MAC Cache ...')    # only known Nodes, MACs of Clients are not needed
+        GluonMacFileName = os.path.join(self.__DatabasePath,GluonMacName)
+        TempFileName = '%s.%d.tmp' % (GluonMacFileName,os.getpid())
 
-                    if AreaMatch == 1:
-                        ZipCodeResult = ZipCode
-                        break
+        try:
+            with open(TempFileName, mode='w') as JsonFile:
+                json.dump({ MainMAC:self.__GluonMacDict[MainMAC] for MainMAC in self.__GluonMacDict if MainMAC in self.ffNodeDict },JsonFile)
 
-        return ZipCodeResult
+            os.replace(TempFileName,GluonMacFileName)    # Readers never see a partly written File
+        except:
+            print('!! ERROR on writing',GluonMacName)
+        return
 
 
 
-    #-------------------------------------------------------------
-    # private function "__SetupRegionData"
-    #
-    #     Load Region Json Files and setup polygons
+    #==============================================================================
+    # Method "DumpMacTable"
     #
-    #-------------------------------------------------------------
-    def __SetupRegionData(self):
-
-        print('Setting up Region Data ...')
-
-        RegionDict = {
-            'ValidArea': Polygon([ (0.0,45.0),(0.0,60.0),(20.0,60.0),(20.0,45.0) ]),
-            'Polygons' : {},
-            'Segments' : {},
-            'WithZip'  : []
-        }
+    #   Dump out MAC-Table
+    #==============================================================================
+    def DumpMacTable(self,FileName):
 
+        print('Dump MAC-Table ...')
+        MacTableFile = open(FileName, mode='w')
+        MacTableFile.write('--------------------------------------------\n')
+        MacTableFile.write('%-20s -> %-20s\n' % ('FF-MAC', 'Main-MAC'))
+        MacTableFile.write('--------------------------------------------\n')
 
-        try:
-            with open(os.path.join(self.__DatabasePath,Region2ZipName), mode='r') as Region2ZipFile:
-                Region2ZipDict = json.load(Region2ZipFile)
-        except:
-            print('!! ERROR on loading Region-to-ZIP Data')
-        else:
-            for Region in Region2ZipDict:
-                RegionDict['WithZip'].append(Region)
+        for MacInt in sorted(self.MAC2NodeIDDict):
+            MacTableFile.write('%-20s -> %-20s\n' % (IntToMac(MacInt), self.MAC2NodeIDDict[MacInt]))
 
-        JsonFileList = glob(os.path.join(self.__GitPath,'vpn*/regions/*.json'))
-        RegionCount = 0
+        MacTableFile.close()
+        print('... done.\n')
+        return
 
-        try:
-            for FileName in JsonFileList:
-                Region  = os.path.basename(FileName).split('.')[0]
-                Segment = int(os.path.dirname(FileName).split('/')[-2][3:])
 
-                if Region[0] == '_':
-                    print('!! Invalid File: %s' % FileName)
-                    RegionCount = 0
-                    break
 
-                else:
-                    with open(FileName,'r') as JsonFile:
-                        GeoJson = json.load(JsonFile)
+    #-------------------------------------------------------------
+    # private function "__GetGpsLocation"
+    #
+    #     GPS Location of Node with fixed Errors -> (lon,lat)
+    #
+    #-------------------------------------------------------------
+    def __GetGpsLocation(self,ffNodeMAC):
 
-                    if 'type' in GeoJson and 'geometries' in GeoJson:
-                        TrackBase = GeoJson['geometries'][0]['coordinates']
-                    elif 'coordinates' in GeoJson:
-                        TrackBase = GeoJson['coordinates']
-                    else:
-                        TrackBase = None
-                        print('Problem parsing %s' % FileName)
-                        continue
+        NodeLocation = None
 
-                    RegionDict['Polygons'][Region] = []
-                    RegionDict['Segments'][Region] = Segment
-                    RegionCount += 1
+        if LocationTemplate.match(str(self.ffNodeDict[ffNodeMAC].Latitude)) and LocationTemplate.match(str(self.ffNodeDict[ffNodeMAC].Longitude)):
 
-                    for Track in TrackBase:
-                        Shape = []
+            lat = self.ffNodeDict[ffNodeMAC].Latitude
+            lon = self.ffNodeDict[ffNodeMAC].Longitude
 
-                        for t in Track[0]:
-                            Shape.append( (t[0],t[1]) )    # t[0] = Longitude = x | t[1] = Latitude = y
+            if lat < lon:
+                lat = self.ffNodeDict[ffNodeMAC].Longitude
+                lon = self.ffNodeDict[ffNodeMAC].Latitude
 
-                        RegionDict['Polygons'][Region].append(Polygon(Shape))
+            while lat > 90.0:    # missing decimal separator
+                lat /= 10.0
 
-        except:
-            RegionCount = 0
+            while lon > 70.0:    # missing decimal separator
+                lon /= 10.0
 
-        if RegionCount == 0:
-            RegionDict = None
-        else:
-            for Region in RegionDict['WithZip']:
-                if Region not in RegionDict['Polygons']:
-                    print('!! Missing Region Polygon:',Region)
+            NodeLocation = (lon,lat)
 
-        print('... Region Areas loaded:',RegionCount,'\n')
-        return RegionDict
+        return NodeLocation
 
 
 
     #-------------------------------------------------------------
-    # private function "__GetRegionFromGPS"
+    # private function "__GetGeoKey"
     #
-    #     Get Region from GPS using area polygons
+    #     Fingerprint of all Inputs for Segment from Location
     #
     #-------------------------------------------------------------
-    def __GetRegionFromGPS(self,lon,lat,ffNodeMAC,RegionDict):
+    def __GetGeoKey(self,ffNodeMAC,GeoData):
 
-        GpsRegion = None
+        GeoInput = '%s|%s|%s|%s|%s|%s' % (self.ffNodeDict[ffNodeMAC].Latitude,self.ffNodeDict[ffNodeMAC].Longitude,self.ffNodeDict[ffNodeMAC].ZIP,
+                                          self.ffNodeDict[ffNodeMAC].GluonType,self.ffNodeDict[ffNodeMAC].SegMode,GeoData.IndexKey)
 
-        if lat is not None and lon is not None:
-            NodeLocation = Point(lon,lat)
+        return hashlib.md5(GeoInput.encode('utf-8')).hexdigest()
 
-            if RegionDict['ValidArea'].intersects(NodeLocation):
 
-                for Region in RegionDict['Polygons'].keys():
-                    if Region not in RegionDict['WithZip']:
-                        MatchCount = 0
 
-                        for RegionPart in RegionDict['Polygons'][Region]:
-                            if RegionPart.intersects(NodeLocation):
-                                MatchCount += 1
-
-                        if MatchCount == 1:
-                            GpsRegion = Region
-                            break
+    #-------------------------------------------------------------
+    # private function "__IsValidLocation"
+    #
+    #     Check GPS Location against valid Area of Regions
+    #
+    #-------------------------------------------------------------
+    def __IsValidLocation(self,lon,lat,ffNodeMAC,GeoData):
 
-            else:
-                print('!! Invalid Location:',ffNodeMAC,'= \''+self.ffNodeDict[ffNodeMAC]['Name']+'\' ->',lon,'|',lat)
+        if GeoData.ValidArea.intersects(Point(lon,lat)):
+            return True
 
-        return GpsRegion
+        print('!! Invalid Location:',ffNodeMAC,'= \''+self.ffNodeDict[ffNodeMAC].Name+'\' ->',lon,'|',lat)
+        return False
 
 
 
@@ -1677,23 +1824,69 @@ class ffNodeInfo:
         print('Setting up Desired Segments from GPS Data or ZIP-Code ...')
 
         isOK = True
-        RegionDict  = self.__SetupRegionData()
-        Zip2PosDict = self.__SetupZip2GpsData()
-        ZipAreaDict = self.__SetupZipAreaData()
-        ZipGridDict = self.__SetupZipGridData()
+        GeoData = ffGeoData(self.__GitPath,self.__DatabasePath,self.__DataAccess.AccessMode == ACCESSMODE_REPLAY)    # compiled Geo Data, rebuilt on Changes
 
-        if RegionDict is None or Zip2PosDict is None or ZipAreaDict is None or ZipGridDict is None:
+        if not GeoData.isOK:
             self.__alert('!! No Region Data available !!!')
             self.AnalyseOnly = True
             isOK = False
         else:
+            ZipAreaDict = GeoData.ZipAreaDict
+
+            #----- Locations of all Nodes are classified as Batch -----
+            GeoKeyDict      = {}    # ffNodeMAC -> Fingerprint of Location and Geo Data
+            GpsLocationDict = {}    # ffNodeMAC -> (lon,lat) from GPS Data
+            ZipLocationDict = {}    # ZipCode -> (lon,lat) from ZIP-Code without ZIP-Area
+            UnchangedCount  = 0
+
+            for ffNodeMAC in self.ffNodeDict.keys():
+                if (self.ffNodeDict[ffNodeMAC].Status != '?' and self.ffNodeDict[ffNodeMAC].SegMode[:5] != 'mobil' and
+                    self.ffNodeDict[ffNodeMAC].GluonType >= NODETYPE_SEGMENT_LIST):
+
+                    GeoKeyDict[ffNodeMAC] = self.__GetGeoKey(ffNodeMAC,GeoData)
+
+                    if self.ffNodeDict[ffNodeMAC].GeoCache is not None and self.ffNodeDict[ffNodeMAC].GeoCache[0] == GeoKeyDict[ffNodeMAC]:
+                        UnchangedCount += 1
+                        continue    # Result of last Calculation is still valid
+
+                    NodeLocation = self.__GetGpsLocation(ffNodeMAC)
+
+                    if NodeLocation is not None:
+                        GpsLocationDict[ffNodeMAC] = NodeLocation
+
+                    if self.ffNodeDict[ffNodeMAC].ZIP is not None:
+                        ZipCode = self.ffNodeDict[ffNodeMAC].ZIP[:5]
+
+                        if ZipTemplate.match(ZipCode) and ZipCode not in ZipAreaDict and GeoData.GetZipPosition(ZipCode) is not None:
+                            ZipLocationDict[ZipCode] = GeoData.GetZipPosition(ZipCode)
+
+            print('... Nodes with unchanged Location:',UnchangedCount)
+
+            if len(GpsLocationDict) > 0 or len(ZipLocationDict) > 0:
+                ZipIndex    = GeoData.GetZipIndex()
+                RegionIndex = GeoData.GetRegionIndex()    # Regions with ZIP-Areas are not indexed
+
+                GpsZipDict    = ZipIndex.GetAreaDict(GpsLocationDict)
+                GpsRegionDict = RegionIndex.GetAreaDict({ ffNodeMAC:GpsLocationDict[ffNodeMAC] for ffNodeMAC in GpsLocationDict if GpsZipDict[ffNodeMAC] is None })
+                ZipRegionDict = RegionIndex.GetAreaDict(ZipLocationDict)
+            else:
+                GpsZipDict    = {}
+                GpsRegionDict = {}
+                ZipRegionDict = {}
+
+            #----- Results are checked and stored per Node -----
             for ffNodeMAC in self.ffNodeDict.keys():
-                if self.ffNodeDict[ffNodeMAC]['Status'] == '?': continue
+                if self.ffNodeDict[ffNodeMAC].Status == '?': continue
+
+                if self.ffNodeDict[ffNodeMAC].SegMode[:5] == 'mobil':    # No specific Segment for mobile Nodes
+                    self.ffNodeDict[ffNodeMAC].DestSeg = None
 
-                if self.ffNodeDict[ffNodeMAC]['SegMode'][:5] == 'mobil':    # No specific Segment for mobile Nodes
-                    self.ffNodeDict[ffNodeMAC]['DestSeg'] = None
+                elif self.ffNodeDict[ffNodeMAC].GluonType >= NODETYPE_SEGMENT_LIST and self.ffNodeDict[ffNodeMAC].GeoCache is not None and self.ffNodeDict[ffNodeMAC].GeoCache[0] == GeoKeyDict[ffNodeMAC]:
+                    self.ffNodeDict[ffNodeMAC].ZIP     = self.ffNodeDict[ffNodeMAC].GeoCache[1]
+                    self.ffNodeDict[ffNodeMAC].Region  = self.ffNodeDict[ffNodeMAC].GeoCache[2]
+                    self.ffNodeDict[ffNodeMAC].DestSeg = self.ffNodeDict[ffNodeMAC].GeoCache[3]
 
-                elif self.ffNodeDict[ffNodeMAC]['GluonType'] >= NODETYPE_SEGMENT_LIST:    # Segment aware Gluon
+                elif self.ffNodeDict[ffNodeMAC].GluonType >= NODETYPE_SEGMENT_LIST:    # Segment aware Gluon
                     lat = None
                     lon = None
 
@@ -1706,35 +1899,22 @@ class ffNodeInfo:
                     ZipCode    = None
 
 
-                    if LocationTemplate.match(str(self.ffNodeDict[ffNodeMAC]['Latitude'])) and LocationTemplate.match(str(self.ffNodeDict[ffNodeMAC]['Longitude'])):
-
-                        lat = self.ffNodeDict[ffNodeMAC]['Latitude']
-                        lon = self.ffNodeDict[ffNodeMAC]['Longitude']
-
-                        if lat < lon:
-                            lat = self.ffNodeDict[ffNodeMAC]['Longitude']
-                            lon = self.ffNodeDict[ffNodeMAC]['Latitude']
-
-                        while lat > 90.0:    # missing decimal separator
-                            lat /= 10.0
-
-                        while lon > 70.0:    # missing decimal separator
-                            lon /= 10.0
-
-                        GpsZipCode = self.__GetZipCodeFromGPS(lon,lat,ZipAreaDict,ZipGridDict)
+                    if ffNodeMAC in GpsLocationDict:
+                        (lon,lat)  = GpsLocationDict[ffNodeMAC]
+                        GpsZipCode = GpsZipDict[ffNodeMAC]
 
                         if GpsZipCode is not None:
                             GpsRegion  = ZipAreaDict[GpsZipCode]['Area']
                             GpsSegment = ZipAreaDict[GpsZipCode]['Segment']
-                        else:
-                            GpsRegion = self.__GetRegionFromGPS(lon,lat,ffNodeMAC,RegionDict)
+                        elif self.__IsValidLocation(lon,lat,ffNodeMAC,GeoData):
+                            GpsRegion = GpsRegionDict[ffNodeMAC]
 
                             if GpsRegion is not None:
-                                GpsSegment = RegionDict['Segments'][GpsRegion]
+                                GpsSegment = GeoData.RegionSegments[GpsRegion]
 
 
-                    if self.ffNodeDict[ffNodeMAC]['ZIP'] is not None:
-                        ZipCode = self.ffNodeDict[ffNodeMAC]['ZIP'][:5]
+                    if self.ffNodeDict[ffNodeMAC].ZIP is not None:
+                        ZipCode = self.ffNodeDict[ffNodeMAC].ZIP[:5]
 
                         if ZipTemplate.match(ZipCode):
 
@@ -1742,51 +1922,54 @@ class ffNodeInfo:
                                 ZipRegion  = ZipAreaDict[ZipCode]['Area']
                                 ZipSegment = ZipAreaDict[ZipCode]['Segment']
 
-                            elif ZipCode in Zip2PosDict:
-                                lon = Zip2PosDict[ZipCode][0]
-                                lat = Zip2PosDict[ZipCode][1]
-                                ZipRegion = self.__GetRegionFromGPS(lon,lat,ffNodeMAC,RegionDict)
+                            elif ZipCode in ZipLocationDict:
+                                (lon,lat) = ZipLocationDict[ZipCode]
+
+                                if self.__IsValidLocation(lon,lat,ffNodeMAC,GeoData):
+                                    ZipRegion = ZipRegionDict[ZipCode]
 
                                 if ZipRegion is None:
-                                    print('>>> Unknown ZIP-Region:',ffNodeMAC,'= \''+self.ffNodeDict[ffNodeMAC]['Name']+'\' ->',ZipCode)
+                                    print('>>> Unknown ZIP-Region:',ffNodeMAC,'= \''+self.ffNodeDict[ffNodeMAC].Name+'\' ->',ZipCode)
                                 else:
-                                    ZipSegment = RegionDict['Segments'][ZipRegion]
+                                    ZipSegment = GeoData.RegionSegments[ZipRegion]
                             else:
-                                print('*** Invalid ZIP-Code:  ',ffNodeMAC,'= \''+self.ffNodeDict[ffNodeMAC]['Name']+'\' ->',ZipCode)
+                                print('*** Invalid ZIP-Code:  ',ffNodeMAC,'= \''+self.ffNodeDict[ffNodeMAC].Name+'\' ->',ZipCode)
 
                             if ZipRegion is not None:
                                 if GpsRegion is None:
                                     GpsRegion  = ZipRegion
                                     GpsSegment = ZipSegment
-#                                    print('>>> Segment set by ZIP-Code:',ffNodeMAC,'= \''+self.ffNodeDict[ffNodeMAC]['Name']+'\' ->',ZipCode,'->',lon,'|',lat,'->',GpsSegment)
+#                                    print('>>> Segment set by ZIP-Code:',ffNodeMAC,'= \''+self.ffNodeDict[ffNodeMAC].Name+'\' ->',ZipCode,'->',lon,'|',lat,'->',GpsSegment)
 
                                 elif ZipSegment != GpsSegment:
-                                    print('!! Segment Mismatch GPS <> ZIP:',ffNodeMAC,'= \''+self.ffNodeDict[ffNodeMAC]['Name']+'\' ->',GpsSegment,'<>',ZipSegment)
+                                    print('!! Segment Mismatch GPS <> ZIP:',ffNodeMAC,'= \''+self.ffNodeDict[ffNodeMAC].Name+'\' ->',GpsSegment,'<>',ZipSegment)
 
                         else:
-                            print('!! Invalid ZIP-Code:',ffNodeMAC,'= \''+self.ffNodeDict[ffNodeMAC]['Name']+'\' ->',ZipCode)
+                            print('!! Invalid ZIP-Code:',ffNodeMAC,'= \''+self.ffNodeDict[ffNodeMAC].Name+'\' ->',ZipCode)
 
 
                     if ZipCode is None or ZipSegment is None:
-                        self.ffNodeDict[ffNodeMAC]['ZIP'] = GpsZipCode
+                        self.ffNodeDict[ffNodeMAC].ZIP = GpsZipCode
                     elif GpsZipCode is not None and ZipCode != GpsZipCode:
-                        print('>>> ZIP-Code Mismatch GPS <> ZIP:',ffNodeMAC,'= \''+self.ffNodeDict[ffNodeMAC]['Name']+'\' ->',GpsZipCode,'<>',ZipCode)
-                        self.ffNodeDict[ffNodeMAC]['ZIP'] = GpsZipCode
+                        print('>>> ZIP-Code Mismatch GPS <> ZIP:',ffNodeMAC,'= \''+self.ffNodeDict[ffNodeMAC].Name+'\' ->',GpsZipCode,'<>',ZipCode)
+                        self.ffNodeDict[ffNodeMAC].ZIP = GpsZipCode
 
                     if GpsRegion is not None:
-                        self.ffNodeDict[ffNodeMAC]['Region']  = GpsRegion
-                        self.ffNodeDict[ffNodeMAC]['DestSeg'] = GpsSegment
+                        self.ffNodeDict[ffNodeMAC].Region  = GpsRegion
+                        self.ffNodeDict[ffNodeMAC].DestSeg = GpsSegment
+
+                        if GpsSegment > 8 and self.ffNodeDict[ffNodeMAC].GluonType < NODETYPE_DNS_SEGASSIGN:
+                            print('!! Invalid Segment for Gluon-Version:',ffNodeMAC,'= \''+self.ffNodeDict[ffNodeMAC].Name+'\' ->',GpsSegment)
 
-                        if GpsSegment > 8 and self.ffNodeDict[ffNodeMAC]['GluonType'] < NODETYPE_DNS_SEGASSIGN:
-                            print('!! Invalid Segment for Gluon-Version:',ffNodeMAC,'= \''+self.ffNodeDict[ffNodeMAC]['Name']+'\' ->',GpsSegment)
+                    if self.ffNodeDict[ffNodeMAC].SegMode[:4] == 'fix ':
+                        GpsSegment = int(self.ffNodeDict[ffNodeMAC].SegMode[4:])
+                        self.ffNodeDict[ffNodeMAC].DestSeg = GpsSegment
+#                        print('+++ Segment is fix:',ffNodeMAC,'= \''+self.ffNodeDict[ffNodeMAC].Name+'\' ->',GpsSegment)
 
-                    if self.ffNodeDict[ffNodeMAC]['SegMode'][:4] == 'fix ':
-                        GpsSegment = int(self.ffNodeDict[ffNodeMAC]['SegMode'][4:])
-                        self.ffNodeDict[ffNodeMAC]['DestSeg'] = GpsSegment
-#                        print('+++ Segment is fix:',ffNodeMAC,'= \''+self.ffNodeDict[ffNodeMAC]['Name']+'\' ->',GpsSegment)
+                    self.ffNodeDict[ffNodeMAC].GeoCache = [ GeoKeyDict[ffNodeMAC],self.ffNodeDict[ffNodeMAC].ZIP,self.ffNodeDict[ffNodeMAC].Region,self.ffNodeDict[ffNodeMAC].DestSeg ]
 
                 else:  # old Gluon without Segment Support
-                    self.ffNodeDict[ffNodeMAC]['DestSeg'] = 0
+                    self.ffNodeDict[ffNodeMAC].DestSeg = 0
 
         print('... done.\n')
         return isOK
@@ -1808,9 +1991,8 @@ class ffNodeInfo:
         print('\nChecking DNS Zone \"nodes\" ...')
 
         try:
-            DnsResolver = dns.resolver.Resolver()
-            DnsServerIP = DnsResolver.query('%s.' % (DnsAccDict['Server']),'a')[0].to_text()
-            DnsZone     = dns.zone.from_xfr(dns.query.xfr(DnsServerIP,FreifunkNodeDomain))
+            DnsServerIP = self.__DataAccess.DnsQuery('%s.' % (DnsAccDict['Server']),'a')[0]
+            DnsZone     = self.__DataAccess.DnsZoneTransfer(DnsServerIP,FreifunkNodeDomain)
             DnsKeyRing  = dns.tsigkeyring.from_text( {DnsAccDict['ID'] : DnsAccDict['Key']} )
             DnsUpdate   = dns.update.Update(FreifunkNodeDomain, keyring = DnsKeyRing, keyname = DnsAccDict['ID'], keyalgorithm = 'hmac-sha512')
         except:
@@ -1843,17 +2025,17 @@ class ffNodeInfo:
             print('Checking ffNodeDict against DNS ...')
 
             for ffNodeMAC in self.ffNodeDict.keys():
-                if self.ffNodeDict[ffNodeMAC]['IPv6'] is not None:
+                if self.ffNodeDict[ffNodeMAC].IPv6 is not None:
                     DnsNodeID = 'ffs-' + ffNodeMAC.replace(':','')
 
                     if DnsNodeID in NodeDnsDict:
-                        if NodeDnsDict[DnsNodeID] != self.ffNodeDict[ffNodeMAC]['IPv6']:
-                            DnsUpdate.replace(DnsNodeID, 120, 'AAAA',self.ffNodeDict[ffNodeMAC]['IPv6'])
+                        if NodeDnsDict[DnsNodeID] != self.ffNodeDict[ffNodeMAC].IPv6:
+                            DnsUpdate.replace(DnsNodeID, 120, 'AAAA',self.ffNodeDict[ffNodeMAC].IPv6)
                     else:
-                        DnsUpdate.add(DnsNodeID, 120, 'AAAA',self.ffNodeDict[ffNodeMAC]['IPv6'])
+                        DnsUpdate.add(DnsNodeID, 120, 'AAAA',self.ffNodeDict[ffNodeMAC].IPv6)
 
             if len(DnsUpdate.index) > 1:
-                dns.query.tcp(DnsUpdate,DnsServerIP)
+                self.__DataAccess.SendDnsUpdate(DnsUpdate,DnsServerIP)
 
         print('... done.\n')
         return
@@ -0,0 +1,310 @@
+#!/usr/bin/python3
+
+###########################################################################################
+#                                                                                         #
+#  create_ZipGrid.py                                                                      #
+#                                                                                         #
+#  Creating ZipGrid.json from ZIP-Areas in Git Repository (vpn*/zip-areas/*.json).        #
+#                                                                                         #
+#  Each Field of the Grid contains the ZIP-Codes with Areas touching the Field.           #
+#  Fields covered completely by one ZIP-Area are marked as direct Hits, so no Test        #
+#  of Polygons is needed for Locations in these Fields.                                   #
+#                                                                                         #
+#  In adaptive Mode Fields with too many ZIP-Codes are split recursively into four        #
+#  Quarters (Quadtree) until the Limit of ZIP-Codes or Depth is reached.                  #
+#                                                                                         #
+#  Parameter:                                                                             #
+#                                                                                         #
+#      --gitrepo  = Path to Git Repository with ZIP-Areas                                 #
+#      --zipgrid  = Path+Filename to ZipGrid.json                                         #
+#      --fields   = Number of Fields per Axis (default = 100)                             #
+#      --adaptive = split Fields with more than --maxzip ZIP-Codes                        #
+#      --maxzip   = max. ZIP-Codes per Field in adaptive Mode (default = 2)               #
+#      --maxdepth = max. Levels of Splitting in adaptive Mode (default = 4)               #
+#                                                                                         #
+###########################################################################################
+#                                                                                         #
+#  Copyright (c) 2017-2018, Roland Volkmann <roland.volkmann@t-online.de>                 #
+#  All rights reserved.                                                                   #
+#                                                                                         #
+#  Redistribution and use in source and binary forms, with or without                     #
+#  modification, are permitted provided that the following conditions are met:            #
+#    1. Redistributions of source code must retain the above copyright notice,            #
+#       this list of conditions and the following disclaimer.                             #
+#    2. Redistributions in binary form must reproduce the above copyright notice,         #
+#       this list of conditions and the following disclaimer in the documentation         #
+#       and/or other materials provided with the distribution.                            #
+#                                                                                         #
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"            #
+#  AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE              #
+#  IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE         #
+#  DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE           #
+#  FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL             #
+#  DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR             #
+#  SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER             #
+#  CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,          #
+#  OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE          #
+#  OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.                   #
+#                                                                                         #
+###########################################################################################
+
+import os
+import math
+import json
+import re
+import argparse
+
+from glob import glob
+
+from shapely.geometry import box
+from shapely.geometry.polygon import Polygon
+from shapely.strtree import STRtree
+from shapely.prepared import prep
+
+
+ZipTemplate = re.compile('^[0-9]{5}$')
+
+ZipGridName = 'ZipGrid.json'
+
+DefaultFields   = 100      # Fields per Axis
+DefaultMaxZip   = 2        # max. ZIP-Codes per Field in adaptive Mode
+DefaultMaxDepth = 4        # max. Levels of Splitting in adaptive Mode
+
+
+
+#-----------------------------------------------------------------------
+# Function "LoadZipAreas"
+#
+#   Load Polygons of ZIP-Areas -> [ (ZipCode,Polygon), ... ] sorted by ZipCode
+#
+#-----------------------------------------------------------------------
+def LoadZipAreas(GitRepoPath):
+
+    print('Loading ZIP-Areas ...')
+    ZipPartList = []
+    ZipCount = 0
+
+    for ZipFileName in sorted(glob(os.path.join(GitRepoPath,'vpn*/zip-areas/*.json'))):
+        ZipCode = os.path.basename(ZipFileName)[:5]
+
+        if not ZipTemplate.match(ZipCode):
+            print('!! Invalid ZIP-Area:',ZipFileName)
+            continue
+
+        try:
+            with open(ZipFileName,"r") as fp:
+                ZipAreaJson = json.load(fp)
+        except:
+            print('!! ERROR on loading ZIP-Area:',ZipFileName)
+            continue
+
+        if "geometries" in ZipAreaJson:
+            TrackBase = ZipAreaJson["geometries"][0]["coordinates"]
+        elif "coordinates" in ZipAreaJson:
+            TrackBase = ZipAreaJson["coordinates"]
+        else:
+            print('Problem parsing %s' % ZipFileName)
+            continue
+
+        for Track in TrackBase:
+            Shape = []
+
+            for t in Track[0]:
+                Shape.append( (t[0],t[1]) )
+
+            ZipPartList.append( (ZipCode,Polygon(Shape)) )
+
+        ZipCount += 1
+
+    ZipPartList.sort(key=lambda ZipPart: ZipPart[0])
+
+    print('... ZIP-Areas loaded: %d (%d Polygons)\n' % (ZipCount,len(ZipPartList)))
+    return ZipPartList
+
+
+
+class ZipGridBuilder:
+
+    #==========================================================================
+    # Constructor
+    #
+    #   ZipPartList = [ (ZipCode,Polygon), ... ]
+    #==========================================================================
+    def __init__(self,ZipPartList,MaxZip,MaxDepth):
+
+        # public Attributes
+        self.DirectCount = 0           # Fields / Quarters with direct Hit
+        self.SplitCount  = 0           # split Fields / Quarters
+        self.MaxCandidates = 0         # max. ZIP-Codes of final Fields / Quarters
+
+        # private Attributes
+        self.__ZipCodeList  = [ ZipPart[0] for ZipPart in ZipPartList ]
+        self.__PartList     = [ ZipPart[1] for ZipPart in ZipPartList ]
+        self.__PreparedList = [ prep(ZipPart[1]) for ZipPart in ZipPartList ]
+        self.__PartIndexDict = { id(self.__PartList[i]):i for i in range(len(self.__PartList)) }
+        self.__AreaTree     = STRtree(self.__PartList)
+        self.__MaxZip       = MaxZip
+        self.__MaxDepth     = MaxDepth
+
+        return
+
+
+
+    #-----------------------------------------------------------------------
+    # private function "__GetCellParts"
+    #
+    #   Indices of Polygons touching the Cell
+    #
+    #-----------------------------------------------------------------------
+    def __GetCellParts(self,CellBox):
+
+        PartList = []
+
+        for Candidate in self.__AreaTree.query(CellBox):
+            if hasattr(Candidate,'geom_type'):    # shapely < 2.0
+                PartIndex = self.__PartIndexDict[id(Candidate)]
+            else:
+                PartIndex = int(Candidate)
+
+            if self.__PreparedList[PartIndex].intersects(CellBox):
+                PartList.append(PartIndex)
+
+        return sorted(PartList)
+
+
+
+    #==========================================================================
+    # Method "GetBounds"
+    #
+    #   Bounding Box of all ZIP-Areas (4 Decimals) -> (lon_min,lat_min,lon_max,lat_max)
+    #==========================================================================
+    def GetBounds(self):
+
+        lon_min = min([ Part.bounds[0] for Part in self.__PartList ])
+        lat_min = min([ Part.bounds[1] for Part in self.__PartList ])
+        lon_max = max([ Part.bounds[2] for Part in self.__PartList ])
+        lat_max = max([ Part.bounds[3] for Part in self.__PartList ])
+
+        return ( math.floor(lon_min * 10000.0) / 10000.0, math.floor(lat_min * 10000.0) / 10000.0,
+                 math.ceil(lon_max * 10000.0) / 10000.0, math.ceil(lat_max * 10000.0) / 10000.0 )
+
+
+
+    #==========================================================================
+    # Method "GetCell"
+    #
+    #   Content of Cell (Field or Quarter):
+    #
+    #       [ ZipCode, ... ]              -> Candidates for Test of Polygons
+    #       { 'Zip':ZipCode }             -> direct Hit, Cell is inside one ZIP-Area
+    #       { 'Quad':[ SW,SE,NW,NE ] }    -> split into Quarters (adaptive Mode)
+    #
+    #   -> ( Cell, [ ZipCode, ... ] )
+    #==========================================================================
+    def GetCell(self,lon_min,lat_min,lon_max,lat_max,Depth):
+
+        CellBox = box(lon_min,lat_min,lon_max,lat_max)
+        PartList = self.__GetCellParts(CellBox)
+        ZipList = sorted(set([ self.__ZipCodeList[PartIndex] for PartIndex in PartList ]))
+
+        if len(PartList) == 1 and self.__PreparedList[PartList[0]].contains(CellBox):
+            self.DirectCount += 1
+            Cell = { 'Zip':ZipList[0] }
+
+        elif len(ZipList) > self.__MaxZip and Depth < self.__MaxDepth:
+            self.SplitCount += 1
+            lon_mid = (lon_min + lon_max) / 2.0
+            lat_mid = (lat_min + lat_max) / 2.0
+
+            Cell = { 'Quad':[ self.GetCell(lon_min,lat_min,lon_mid,lat_mid,Depth+1)[0],
+                              self.GetCell(lon_mid,lat_min,lon_max,lat_mid,Depth+1)[0],
+                              self.GetCell(lon_min,lat_mid,lon_mid,lat_max,Depth+1)[0],
+                              self.GetCell(lon_mid,lat_mid,lon_max,lat_max,Depth+1)[0] ] }
+
+        else:
+            Cell = ZipList
+
+            if len(ZipList) > self.MaxCandidates:
+                self.MaxCandidates = len(ZipList)
+
+        return (Cell,ZipList)
+
+
+
+#=======================================================================
+#
+#  M a i n   P r o g r a m
+#
+#=======================================================================
+print('\nCreating ZIP-Grid\n')
+
+parser = argparse.ArgumentParser(description='Create ZipGrid.json from ZIP-Areas')
+parser.add_argument('--gitrepo', dest='GitRepo', action='store', help='Path to Git Repository')
+parser.add_argument('--zipgrid', dest='ZipGridFile', action='store', help='Output = ZipGridFile Name')
+parser.add_argument('--fields', dest='Fields', action='store', type=int, default=DefaultFields, help='Fields per Axis')
+parser.add_argument('--adaptive', dest='Adaptive', action='store_true', help='Split Fields with many ZIP-Codes (Quadtree)')
+parser.add_argument('--maxzip', dest='MaxZip', action='store', type=int, default=DefaultMaxZip, help='max. ZIP-Codes per Field in adaptive Mode')
+parser.add_argument('--maxdepth', dest='MaxDepth', action='store', type=int, default=DefaultMaxDepth, help='max. Levels of Splitting in adaptive Mode')
+
+args = parser.parse_args()
+
+
+if args.GitRepo is None:
+    GitRepoPath = 'Y:/Git-Repository/peers-ffs/'
+else:
+    GitRepoPath = args.GitRepo
+
+ZipPartList = LoadZipAreas(GitRepoPath)
+
+if len(ZipPartList) == 0:
+    print('++ ERROR: ZIP-Areas not available!')
+    exit(1)
+
+
+if args.ZipGridFile is None:
+    ZipGridFileName = ZipGridName
+else:
+    ZipGridFileName = args.ZipGridFile
+
+if args.Adaptive:
+    GridBuilder = ZipGridBuilder(ZipPartList,args.MaxZip,args.MaxDepth)
+else:
+    GridBuilder = ZipGridBuilder(ZipPartList,0,0)
+
+(lon_min,lat_min,lon_max,lat_max) = GridBuilder.GetBounds()
+
+ZipGridDict = {
+    'Meta': {
+        'lon_min': lon_min,
+        'lon_max': lon_max,
+        'lon_fields': args.Fields,
+        'lat_min': lat_min,
+        'lat_max': lat_max,
+        'lat_fields': args.Fields
+    },
+    'Fields': {},
+    'Cells': {}
+}
+
+lon_step = (lon_max - lon_min) / args.Fields
+lat_step = (lat_max - lat_min) / args.Fields
+
+for y in range(args.Fields):
+    for x in range(args.Fields):
+        FieldIndex = str(y*args.Fields + x)
+
+        (Cell,ZipList) = GridBuilder.GetCell(lon_min + x*lon_step, lat_min + y*lat_step,
+                                             lon_min + (x+1)*lon_step, lat_min + (y+1)*lat_step, 0)
+
+        ZipGridDict['Fields'][FieldIndex] = ZipList    # Candidates of whole Field for simple Lookup
+
+        if isinstance(Cell,dict):
+            ZipGridDict['Cells'][FieldIndex] = Cell
+
+print('Fields = %d, direct Hits = %d, split Cells = %d, max. Candidates = %d\n' % (len(ZipGridDict['Fields']),GridBuilder.DirectCount,GridBuilder.SplitCount,GridBuilder.MaxCandidates))
+
+JsonFile = open(ZipGridFileName, mode='w+')
+json.dump(ZipGridDict,JsonFile)
+JsonFile.close()
+
+exit(0)
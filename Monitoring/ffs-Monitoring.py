@@ -13,6 +13,11 @@
 #       --alfred   = URL with alfred-json-???.json                                        #
 #       --logs     = Path to LogFiles                                                     #
 #                                                                                         #
+#       --capture  = Path to Snapshot for storing all external Inputs of this Run         #
+#       --replay   = Path to Snapshot with Inputs instead of live Access (no Actions)     #
+#                                                                                         #
+#       --verifyclouds = check incremental Mesh-Clouds against full Calculation           #
+#                                                                                         #
 #  Needed json-Files from Webserver:                                                      #
 #                                                                                         #
 #       raw.json             -> Node Names and Information                                #
@@ -56,6 +61,7 @@ import smtplib
 
 from email.mime.text import MIMEText
 
+from class_ffDataAccess import *
 from class_ffGatewayInfo import *
 from class_ffNodeInfo import *
 from class_ffMeshNet import *
@@ -135,27 +141,57 @@ def __SendEmail(Subject,MailBody,Account):
 #=======================================================================
 parser = argparse.ArgumentParser(description='Check Freifunk Segments')
 parser.add_argument('--gitrepo', dest='GITREPO', action='store', required=True, help='Git Repository with KeyFiles')
-parser.add_argument('--data', dest='DATAPATH', action='store', required=True, help='Path to Databases')
-parser.add_argument('--alfred', dest='ALFREDURL', action='store', required=True, help='URL with alfred-json-???.json')
+parser.add_argument('--data', dest='DATAPATH', action='store', required=False, help='Path to Databases')
+parser.add_argument('--alfred', dest='ALFREDURL', action='store', required=False, help='URL with alfred-json-???.json')
 parser.add_argument('--logs', dest='LOGPATH', action='store', required=True, help='Path to LogFiles')
+parser.add_argument('--capture', dest='CAPTUREPATH', action='store', required=False, help='Path to Snapshot for storing external Inputs')
+parser.add_argument('--replay', dest='REPLAYPATH', action='store', required=False, help='Path to Snapshot to be replayed')
+parser.add_argument('--verifyclouds', dest='VERIFYCLOUDS', action='store_true', help='Check incremental Mesh-Clouds against full Calculation')
 args = parser.parse_args()
 
-AccountsDict = __LoadAccounts(os.path.join(args.DATAPATH,AccountsFileName))  # All needed Accounts for Accessing resricted Data
+if args.REPLAYPATH is not None:
+    if args.CAPTUREPATH is not None:
+        parser.error('--capture and --replay cannot be combined')
+
+    DatabasePath = args.REPLAYPATH    # Databases as of Capture
+    ffsData = ffDataAccess(DatabasePath,args.REPLAYPATH,ACCESSMODE_REPLAY)
+    AlfredURL = ffsData.SnapshotInfo['AlfredURL']
+
+else:
+    if args.DATAPATH is None or args.ALFREDURL is None:
+        parser.error('--data and --alfred are required')
+
+    DatabasePath = args.DATAPATH
+    AlfredURL = args.ALFREDURL
+
+    if args.CAPTUREPATH is not None:
+        ffsData = ffDataAccess(DatabasePath,args.CAPTUREPATH,ACCESSMODE_CAPTURE)
+    else:
+        ffsData = ffDataAccess(DatabasePath)    # Access to external Data with local Cache
+
+AccountsDict = __LoadAccounts(os.path.join(DatabasePath,AccountsFileName))  # All needed Accounts for Accessing resricted Data
 
 if AccountsDict is None:
     print('!! FATAL ERROR: Accounts not available!')
     exit(1)
 
+if ffsData.AccessMode == ACCESSMODE_CAPTURE:
+    print('Capturing Snapshot to',args.CAPTUREPATH,'...\n')
+    ffsData.SetSnapshotInfo('AlfredURL',AlfredURL)
+    ffsData.CaptureAccounts(AccountsFileName,AccountsDict)
+
+    for DataFileName in [NodeDictName,GluonMacName,Zip2GpsName,Region2ZipName,GeoIndexName,CloudStateName]:
+        ffsData.CaptureDataFile(DataFileName)
 
 
 print('====================================================================================\n\nSetting up Gateway Data ...\n')
-ffsGWs = ffGatewayInfo(args.GITREPO,AccountsDict['DNS'])
+ffsGWs = ffGatewayInfo(args.GITREPO,AccountsDict['DNS'],ffsData)
 
 isOK = ffsGWs.CheckNodesInSegassignDNS()    # Check DNS entries of Nodes against keys from Git
 
 
 print('====================================================================================\n\nSetting up Node Data ...\n')
-ffsNodes = ffNodeInfo(args.ALFREDURL,AccountsDict['raw.json'],args.GITREPO,args.DATAPATH)
+ffsNodes = ffNodeInfo(AlfredURL,AccountsDict['raw.json'],args.GITREPO,DatabasePath,ffsData)
 
 print('Merging fastd-Infos to Nodes ...')
 NewNodeCount = 0
@@ -169,6 +205,9 @@ print('... %d Nodes added.\n' % (NewNodeCount))
 
 ffsNodes.GetBatmanNodeMACs(ffsGWs.Segments())
 
+if ffsData.AccessMode != ACCESSMODE_REPLAY:
+    ffsNodes.WriteMacDicts()    # no Database Updates on Replay
+
 ffsNodes.DumpMacTable(os.path.join(args.LOGPATH,MacTableFile))
 
 if not ffsNodes.SetDesiredSegments():
@@ -178,18 +217,25 @@ if not ffsNodes.SetDesiredSegments():
 
 print('====================================================================================\n\nSetting up Mesh Net Info ...\n')
 
-ffsNet = ffMeshNet(ffsNodes,ffsGWs)
+ffsNet = ffMeshNet(ffsNodes,ffsGWs,DatabasePath)
+ffsNet.VerifyClouds = args.VERIFYCLOUDS
 
 ffsNet.CheckSegments()    # Find Mesh-Clouds with analysing for shortcuts
 
 ffsNet.WriteMeshCloudList(os.path.join(args.LOGPATH,MeshCloudListFile))
 
+if ffsData.AccessMode != ACCESSMODE_REPLAY:
+    ffsNet.WriteCloudState()
+
 
 #---------- Actions ----------
 NodeMoveDict = ffsNet.GetMoveDict()
 MailBody = ''
 
-if NodeMoveDict is None:
+if ffsData.AccessMode == ACCESSMODE_REPLAY:
+    print('\nNo Actions on Replay, Nodes to be moved:',len(NodeMoveDict) if NodeMoveDict is not None else 0)
+
+elif NodeMoveDict is None:
     ffsNodes.CheckNodesInNodesDNS(AccountsDict['DNS'])
 
     if not ffsNodes.AnalyseOnly and not ffsGWs.AnalyseOnly and not ffsNet.AnalyseOnly:
@@ -215,7 +261,9 @@ for Alert in ffsNodes.Alerts:
 for Alert in ffsNet.Alerts:
     MailBody += Alert+'\n'
 
-if MailBody != '':
+if ffsData.AccessMode == ACCESSMODE_REPLAY:
+    print('\nNo Email on Replay.')
+elif MailBody != '':
     print('\nSending Email to inform Admins on Errors ...')
     __SendEmail('Alert from ffs-Monitor',MailBody,AccountsDict['StatusMail'])
 else:
@@ -0,0 +1,194 @@
+#!/usr/bin/python3
+
+###########################################################################################
+#                                                                                         #
+#  ffs-GeoLookup.py                                                                       #
+#                                                                                         #
+#  Resident Service for Lookup of Segments from Locations (GPS / ZIP-Code) used by        #
+#  ffs-Onboarding.py. The compiled Geo Data (GeoIndex.bin) of ffs-Monitoring is kept      #
+#  in Memory and reloaded in Background when it has been changed.                         #
+#                                                                                         #
+#  Protocol on Unix Socket (one json Line per Request and Response):                      #
+#                                                                                         #
+#      Request  = { "lon":<Longitude>, "lat":<Latitude>, "zip":<ZIP-Code> }               #
+#      Response = { "isOK":<true|false>, "GpsSegment":<Segment>, "ZipSegment":<Segment> } #
+#                                                                                         #
+#  Parameter:                                                                             #
+#                                                                                         #
+#      --gitrepo = Git Repository with Regions and ZIP-Areas                              #
+#      --data    = Path to Databases                                                      #
+#      --socket  = Unix Socket of Service (default = /var/run/ffs-GeoLookup.sock)         #
+#                                                                                         #
+###########################################################################################
+#                                                                                         #
+#  Copyright (c) 2017-2018, Roland Volkmann <roland.volkmann@t-online.de>                 #
+#  All rights reserved.                                                                   #
+#                                                                                         #
+#  Redistribution and use in source and binary forms, with or without                     #
+#  modification, are permitted provided that the following conditions are met:            #
+#    1. Redistributions of source code must retain the above copyright notice,            #
+#       this list of conditions and the following disclaimer.                             #
+#    2. Redistributions in binary form must reproduce the above copyright notice,         #
+#       this list of conditions and the following disclaimer in the documentation         #
+#       and/or other materials provided with the distribution.                            #
+#                                                                                         #
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"            #
+#  AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE              #
+#  IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE         #
+#  DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE           #
+#  FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL             #
+#  DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR             #
+#  SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER             #
+#  CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,          #
+#  OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE          #
+#  OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.                   #
+#                                                                                         #
+###########################################################################################
+
+import os
+import sys
+import time
+import json
+import socketserver
+import threading
+import argparse
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)),'..','Monitoring'))
+
+from class_ffGeoIndex import ffGeoData    # compiled Geo Data (GeoIndex.bin) of ffs-Monitoring
+
+
+#----- Global Constants -----
+GeoLookupSocket = '/var/run/ffs-GeoLookup.sock'
+GeoCheckInterval = 60      # Seconds between Checks of Geo Data for Changes
+ClientTimeout    = 10      # Seconds until idle Connection of Client is closed
+
+GitPath      = None
+DatabasePath = None
+GeoData      = None
+GeoLock      = threading.Lock()    # Lookups of ffGeoData are not thread-safe (Caches set up on first Use)
+
+
+
+#-----------------------------------------------------------------------
+# function "UpdateGeoData"
+#
+#   Load Geo Data (rebuilt on Changes) and replace current Geo Data
+#   if it has been changed.
+#-----------------------------------------------------------------------
+def UpdateGeoData():
+
+    global GeoData
+
+    NewGeoData = ffGeoData(GitPath,DatabasePath)
+
+    if NewGeoData.isOK:
+        if GeoData is None or not GeoData.isOK or NewGeoData.IndexKey != GeoData.IndexKey:
+            print('... Geo Data loaded:',NewGeoData.IndexKey)
+            sys.stdout.flush()
+            GeoData = NewGeoData
+    elif GeoData is None or not GeoData.isOK:
+        print('!! Geo Data not available!')
+        sys.stdout.flush()
+        GeoData = NewGeoData
+
+    return
+
+
+
+#-----------------------------------------------------------------------
+# function "CheckGeoData"
+#
+#   Background Thread: Check of Geo Data every GeoCheckInterval, so
+#   Requests are never waiting for Rebuild of GeoIndex.bin
+#-----------------------------------------------------------------------
+def CheckGeoData():
+
+    while True:
+        time.sleep(GeoCheckInterval)
+
+        try:
+            UpdateGeoData()
+        except:
+            print('!! Error on Check of Geo Data!')
+            sys.stdout.flush()
+
+    return
+
+
+
+class GeoLookupServer(socketserver.ThreadingMixIn,socketserver.UnixStreamServer):
+
+    daemon_threads = True    # one Thread per Client, stalled Clients are not blocking others
+
+
+
+class GeoLookupHandler(socketserver.StreamRequestHandler):
+
+    timeout = ClientTimeout
+
+    #==========================================================================
+    # Method "handle"
+    #
+    #   Answer Requests of Client until Connection is closed or idle
+    #==========================================================================
+    def handle(self):
+
+        try:
+            for RequestLine in self.rfile:
+                Response = { 'isOK':False, 'GpsSegment':None, 'ZipSegment':None }
+
+                try:
+                    Request = json.loads(RequestLine.decode('utf-8'))
+                    CurrentGeoData = GeoData
+
+                    if CurrentGeoData.isOK:
+                        with GeoLock:
+                            (Response['GpsSegment'],Response['ZipSegment']) = CurrentGeoData.GetLocationSegments(Request['lon'],Request['lat'],Request['zip'])
+                        Response['isOK'] = True
+                except:
+                    print('!! Invalid Request:',RequestLine)
+                    sys.stdout.flush()
+
+                self.wfile.write((json.dumps(Response)+'\n').encode('utf-8'))
+                self.wfile.flush()
+
+        except OSError:
+            pass    # Timeout or Connection closed by Client
+
+        return
+
+
+
+#=======================================================================
+#
+#  M a i n   P r o g r a m
+#
+#=======================================================================
+parser = argparse.ArgumentParser(description='Resident Lookup of Segments from Locations')
+parser.add_argument('--gitrepo', dest='GITREPO', action='store', required=True, help='Git Repository with Regions and ZIP-Areas')
+parser.add_argument('--data', dest='DATAPATH', action='store', required=True, help='Path to Databases')
+parser.add_argument('--socket', dest='SOCKET', action='store', default=GeoLookupSocket, help='Unix Socket of Service')
+args = parser.parse_args()
+
+GitPath      = args.GITREPO
+DatabasePath = args.DATAPATH
+
+print('Starting Geo Lookup Service on',args.SOCKET,'...')
+UpdateGeoData()
+threading.Thread(target=CheckGeoData,daemon=True).start()
+
+if os.path.exists(args.SOCKET):
+    os.remove(args.SOCKET)    # left over from last Run
+
+LookupServer = GeoLookupServer(args.SOCKET,GeoLookupHandler)
+
+try:
+    LookupServer.serve_forever()
+except KeyboardInterrupt:
+    print('... Geo Lookup Service stopped.')
+finally:
+    LookupServer.server_close()
+    os.remove(args.SOCKET)
+
+exit(0)
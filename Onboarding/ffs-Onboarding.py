@@ -44,6 +44,7 @@
 ###########################################################################################
 
 import os
+import sys
 import subprocess
 import psutil
 import signal
@@ -72,15 +73,18 @@ import hashlib
 import fcntl
 import argparse
 
-from shapely.geometry import Point
-from shapely.geometry.polygon import Polygon
 from glob import glob
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)),'..','Monitoring'))
+
 
 #----- Needed Data-Files -----
 AccountFileName = '.Accounts.json'
 ZipGridName     = 'ZipGrid.json'       # Grid of ZIP Codes from Baden-Wuerttemberg
 
+GeoLookupSocket = '/var/run/ffs-GeoLookup.sock'    # Socket of ffs-GeoLookup.py
+GeoLookupTimeout = 2.0
+
 #----- Global Constants -----
 DEFAULT_SEGMENT          = 3
 INVALID_SEGMENT          = 999
@@ -762,6 +766,45 @@ def __SetupZipGridData(DatabasePath):
 
 
 
+#-------------------------------------------------------------
+# function "__GetZipGridCell"
+#
+#     Cell of ZIP-Grid containing the Location:
+#
+#       [ ZipCode, ... ]    -> Candidates for Test of Polygons
+#       { 'Zip':ZipCode }   -> direct Hit without Test of Polygons
+#
+#-------------------------------------------------------------
+def __GetZipGridCell(lon,lat,ZipGridDict):
+
+    ZipCell = None
+
+    x = (lon - float(ZipGridDict['Meta']['lon_min'])) * ZipGridDict['Meta']['lon_scale']
+    y = (lat - float(ZipGridDict['Meta']['lat_min'])) * ZipGridDict['Meta']['lat_scale']
+
+    if ((x >= 0 and int(x) < ZipGridDict['Meta']['lon_fields']) and
+        (y >= 0 and int(y) < ZipGridDict['Meta']['lat_fields'])):
+
+        FieldIndex = str(int(y)*ZipGridDict['Meta']['lon_fields'] + int(x))
+        ZipCell = ZipGridDict['Fields'][FieldIndex]
+
+        if 'Cells' in ZipGridDict and FieldIndex in ZipGridDict['Cells']:    # direct Hit or Quadtree
+            ZipCell = ZipGridDict['Cells'][FieldIndex]
+            x -= int(x)
+            y -= int(y)
+
+            while isinstance(ZipCell,dict) and 'Quad' in ZipCell:    # Quarters are SW,SE,NW,NE
+                x *= 2.0
+                y *= 2.0
+                Quarter = min(int(x),1) + 2*min(int(y),1)
+                ZipCell = ZipCell['Quad'][Quarter]
+                x -= min(int(x),1)
+                y -= min(int(y),1)
+
+    return ZipCell
+
+
+
 #-------------------------------------------------------------
 # function "__GetZipSegmentFromGPS"
 #
@@ -773,16 +816,19 @@ def __GetZipSegmentFromGPS(lon,lat,ZipAreaDict,ZipGridDict):
     ZipSegment = None
 
     if lat is not None and lon is not None:
-        x = int((lon - float(ZipGridDict['Meta']['lon_min'])) * ZipGridDict['Meta']['lon_scale'])
-        y = int((lat - float(ZipGridDict['Meta']['lat_min'])) * ZipGridDict['Meta']['lat_scale'])
+        ZipCell = __GetZipGridCell(lon,lat,ZipGridDict)
+
+        if isinstance(ZipCell,dict):
+            if ZipCell['Zip'] in ZipAreaDict:
+                ZipSegment = ZipAreaDict[ZipCell['Zip']]['Segment']
 
-        if ((x >= 0 and x < ZipGridDict['Meta']['lon_fields']) and
-            (y >= 0 and y < ZipGridDict['Meta']['lat_fields'])):
+        elif ZipCell is not None:
+            from shapely.geometry import Point
+            from shapely.geometry.polygon import Polygon
 
             NodeLocation = Point(lon,lat)
-            FieldIndex = str(y*ZipGridDict['Meta']['lon_fields'] + x)
 
-            for ZipCode in ZipGridDict['Fields'][FieldIndex]:
+            for ZipCode in ZipCell:
                 ZipFileName = ZipAreaDict[ZipCode]['FileName']
                 ZipAreaJson = None
 
@@ -792,7 +838,7 @@ def __GetZipSegmentFromGPS(lon,lat,ZipAreaDict,ZipGridDict):
                 if "geometries" in ZipAreaJson:
                     TrackBase = ZipAreaJson["geometries"][0]["coordinates"]
                 elif "coordinates" in ZipAreaJson:
-                    TrackBase = ZipJson["coordinates"]
+                    TrackBase = ZipAreaJson["coordinates"]
                 else:
                     TrackBase = None
                     print('Problem parsing %s' % ZipFileName)
@@ -820,64 +866,141 @@ def __GetZipSegmentFromGPS(lon,lat,ZipAreaDict,ZipGridDict):
 
 
 #-----------------------------------------------------------------------
-# function "GetGeoSegment"
+# function "__QueryGeoLookup"
 #
-#   Get Segment from Regions
+#   Get Segments from Service ffs-GeoLookup.py -> ( GpsSegment,ZipSegment )
+#
+#   Result is None if Service is not available.
 #-----------------------------------------------------------------------
-def GetGeoSegment(Location,GitPath,DatabasePath):
+def __QueryGeoLookup(lon,lat,ZipCode):
+
+    GeoSegments = None
+
+    try:
+        LookupSocket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        LookupSocket.settimeout(GeoLookupTimeout)
+        LookupSocket.connect(GeoLookupSocket)
+        LookupSocket.sendall((json.dumps({ 'lon':lon, 'lat':lat, 'zip':ZipCode })+'\n').encode('utf-8'))
+
+        with LookupSocket.makefile(mode='r') as LookupFile:
+            Response = json.loads(LookupFile.readline())
+
+        LookupSocket.close()
+    except:
+        print('... Geo Lookup Service not available.')
+    else:
+        if Response['isOK']:
+            GeoSegments = (Response['GpsSegment'],Response['ZipSegment'])
+        else:
+            print('++ Geo Lookup Service has no Data.')
+
+    return GeoSegments
 
-    print('Get Segment from Position ...',Location)
+
+
+#-----------------------------------------------------------------------
+# function "__GetLocalGeoSegments"
+#
+#   Get Segments from Regions in this Process -> ( GpsSegment,ZipSegment )
+#
+#   Result is None if Data is not available.
+#-----------------------------------------------------------------------
+def __GetLocalGeoSegments(lon,lat,ZipCode,GitPath,DatabasePath):
+
+    GeoData = None
+
+    try:
+        from class_ffGeoIndex import ffGeoData    # compiled Geo Data (GeoIndex.bin) of ffs-Monitoring
+        GeoData = ffGeoData(GitPath,DatabasePath)
+    except:
+        GeoData = None
+
+    if GeoData is not None and GeoData.isOK:
+        return GeoData.GetLocationSegments(lon,lat,ZipCode)
 
     ZipAreaDict = __SetupZipAreaData(GitPath)
     ZipGridDict = __SetupZipGridData(DatabasePath)
 
+    if ZipAreaDict is None or ZipGridDict is None:
+        print('!! No Region Data available !!!')
+        return None
+
     GpsSegment = None
     ZipSegment = None
 
-    if ZipAreaDict is None or ZipGridDict is None:
-        print('!! No Region Data available !!!')
-    else:
-        if 'longitude' in Location and 'latitude' in Location:
-            lon = Location['longitude']
-            lat = Location['latitude']
+    if lon is not None and lat is not None:
+        GpsSegment = __GetZipSegmentFromGPS(lon,lat,ZipAreaDict,ZipGridDict)
 
-            if LocationTemplate.match(str(lat)) and LocationTemplate.match(str(lon)):
-                if lat < lon:
-                    lon = Location['latitude']
-                    lat = Location['longitude']
+    if ZipCode in ZipAreaDict:
+        ZipSegment = ZipAreaDict[ZipCode]['Segment']
 
-                while lat > 90.0:    # missing decimal separator
-                    lat /= 10.0
+    return (GpsSegment,ZipSegment)
 
-                while lon > 70.0:    # missing decimal separator
-                    lon /= 10.0
 
-                GpsSegment = __GetZipSegmentFromGPS(lon,lat,ZipAreaDict,ZipGridDict)
 
-            else:
-                print('** Bad GPS Data:',str(lat),'|',str(lon))
+#-----------------------------------------------------------------------
+# function "GetGeoSegment"
+#
+#   Get Segment from Regions
+#-----------------------------------------------------------------------
+def GetGeoSegment(Location,GitPath,DatabasePath):
 
-        if 'zip' in Location:
-            ZipCode = str(Location['zip'])[:5]
-            print('... Checking ZIP-Code',ZipCode)
+    print('Get Segment from Position ...',Location)
 
-            if ZipTemplate.match(ZipCode):
-                if ZipCode in ZipAreaDict:
-                    ZipSegment = ZipAreaDict[ZipCode]['Segment']
+    lon = None
+    lat = None
+    ZipCode = None
 
-                print('>>> GpsSegment / ZipSegment =',GpsSegment,'/',ZipSegment)
+    if 'longitude' in Location and 'latitude' in Location:
+        lon = Location['longitude']
+        lat = Location['latitude']
 
-                if GpsSegment is not None:
-                    if ZipSegment is not None and ZipSegment != GpsSegment:
-                        print('!! Segment Mismatch GPS <> ZIP:',GpsSegment,'<>',ZipSegment)
-                elif ZipSegment is not None:
-                    GpsSegment = ZipSegment
-                    print('++ Segment set by ZIP-Code:',ZipSegment)
-            else:
-                print('... invalid ZIP-Code Format:',ZipCode)
+        if LocationTemplate.match(str(lat)) and LocationTemplate.match(str(lon)):
+            if lat < lon:
+                lon = Location['latitude']
+                lat = Location['longitude']
+
+            while lat > 90.0:    # missing decimal separator
+                lat /= 10.0
+
+            while lon > 70.0:    # missing decimal separator
+                lon /= 10.0
+
+        else:
+            print('** Bad GPS Data:',str(lat),'|',str(lon))
+            lon = None
+            lat = None
+
+    if 'zip' in Location:
+        ZipCode = str(Location['zip'])[:5]
+        print('... Checking ZIP-Code',ZipCode)
+
+        if not ZipTemplate.match(ZipCode):
+            print('... invalid ZIP-Code Format:',ZipCode)
+            ZipCode = None
+
+    GeoSegments = __QueryGeoLookup(lon,lat,ZipCode)
+
+    if GeoSegments is None:
+        GeoSegments = __GetLocalGeoSegments(lon,lat,ZipCode,GitPath,DatabasePath)
+
+    if GeoSegments is None:
+        return None
+
+    (GpsSegment,ZipSegment) = GeoSegments
+
+    if ZipCode is not None:
+        print('>>> GpsSegment / ZipSegment =',GpsSegment,'/',ZipSegment)
+
+        if GpsSegment is not None:
+            if ZipSegment is not None and ZipSegment != GpsSegment:
+                print('!! Segment Mismatch GPS <> ZIP:',GpsSegment,'<>',ZipSegment)
+        elif ZipSegment is not None:
+            GpsSegment = ZipSegment
+            print('++ Segment set by ZIP-Code:',ZipSegment)
 
-        if ZipSegment is None:
-            print('>>> GpsSegment =',GpsSegment)
+    if ZipSegment is None:
+        print('>>> GpsSegment =',GpsSegment)
 
     return GpsSegment
 